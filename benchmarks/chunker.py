@@ -0,0 +1,41 @@
+"""
+Compares nltk's RegexpParser with the CompiledChunker on the GRAMMAR, chunking the gold tags of the labeled
+ingredient corpus. Reports sentences/sec of each.
+
+    python -m benchmarks.chunker [--corpus benchmarks/data/ingredients.conll] [--repeat 500]
+"""
+import argparse
+import json
+import time
+from nltk import RegexpParser
+from recipe_parser import GRAMMAR
+from recipe_parser.chunker import CompiledChunker
+from benchmarks.compare_backends import DEFAULT_CORPUS, read_corpus
+
+
+def time_chunker(parse, sentences, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sentence in sentences:
+            parse(sentence)
+    return len(sentences) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args(argv)
+    sentences = [[(token, tag) for token, tag, _ in sentence] for sentence in read_corpus(args.corpus)]
+    results = dict(
+        regexp_parser=dict(sentences_per_second=time_chunker(RegexpParser(GRAMMAR).parse, sentences, args.repeat)),
+        compiled_chunker=dict(
+            sentences_per_second=time_chunker(CompiledChunker(GRAMMAR).parse, sentences, args.repeat)),
+    )
+    results['speedup'] = results['compiled_chunker']['sentences_per_second'] / \
+        results['regexp_parser']['sentences_per_second']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures the latency/throughput trade-off of the CoalescingParser knobs. Client threads send single line requests
+of a seeded synthetic corpus (see benchmarks.corpus) back to back, first to a shared IngredientParser (under a
+lock, as one parser per process would be) and then to a CoalescingParser for each max_batch_lines and max_wait_ms.
+Reports lines/sec, the p50 and p99 request latency in milliseconds and the mean batch size of each.
+
+    python -m benchmarks.coalescer [--lines 4000] [--clients 16] [--batch-lines 16 64 256] [--wait-ms 1 5]
+"""
+import argparse
+import json
+import threading
+import time
+from recipe_parser import GRAMMAR
+from recipe_parser.coalescer import CoalescingParser
+from recipe_parser.ingredient_parser import IngredientParser
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import percentile
+
+
+def run_clients(parse, lines, clients):
+    """
+    :return: the lines/sec and the request latencies of clients threads that parse the lines
+    """
+    latencies = []
+    shares = [lines[i::clients] for i in range(clients)]
+
+    def client(share):
+        for line in share:
+            start = time.perf_counter()
+            parse(line)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(share,)) for share in shares]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(lines) / (time.perf_counter() - start), latencies
+
+
+def summary(lines_per_second, latencies, **extra):
+    return dict(lines_per_second=lines_per_second, p50_milliseconds=percentile(latencies, 50) * 1000,
+                p99_milliseconds=percentile(latencies, 99) * 1000, **extra)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=4000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--batch-lines', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--wait-ms', type=float, nargs='+', default=[1, 5])
+    args = parser.parse_args(argv)
+    lines = generate_corpus(args.lines, args.seed)
+    results = {}
+    try:
+        ingredient_parser = IngredientParser(GRAMMAR.strip())
+        ingredient_parser.parse(lines[0])  # loads the models outside of the timing
+        lock = threading.Lock()
+
+        def parse(line):
+            with lock:
+                return ingredient_parser.parse(line)
+
+        results['direct'] = summary(*run_clients(parse, lines, args.clients))
+        for max_batch_lines in args.batch_lines:
+            for max_wait_ms in args.wait_ms:
+                with CoalescingParser(max_batch_lines, max_wait_ms, GRAMMAR.strip()) as coalescing_parser:
+                    lines_per_second, latencies = run_clients(coalescing_parser.parse, lines, args.clients)
+                results['batch_{0}_wait_{1}ms'.format(max_batch_lines, max_wait_ms)] = summary(
+                    lines_per_second, latencies, mean_batch_lines=coalescing_parser.stats().mean_batch_lines)
+    except LookupError as e:
+        # nltk reports missing models in a banner of asterisks
+        results = dict(error=next(line.strip() for line in str(e).splitlines() if line.strip('* ')))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
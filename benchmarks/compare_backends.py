@@ -0,0 +1,101 @@
+"""
+Compares the statistical POS backends behind the Tagger cascade (see recipe_parser.ingredient_tagger.POS_BACKENDS)
+on a labeled ingredient corpus. Reports tagging throughput (tokens/sec) next to the tag accuracy and the chunk
+precision, recall and F1 of the GRAMMAR chunks, so a backend can be chosen on data.
+
+The corpus is in CoNLL format: one 'token TAG IOB-chunk' line per token and a blank line between ingredient lines.
+
+    python -m benchmarks.compare_backends [--corpus benchmarks/data/ingredients.conll] [--backends maxent perceptron]
+"""
+import argparse
+import json
+import os
+import time
+from nltk import RegexpParser
+from nltk.tree import Tree
+from recipe_parser import GRAMMAR, get_tagger
+from recipe_parser.ingredient_tagger import POS_BACKENDS
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'ingredients.conll')
+
+
+def read_corpus(path):
+    """
+    :return: a list of sentences, each a list of (token, tag, chunk tag) tuples
+    """
+    with open(path) as f:
+        blocks = f.read().strip().split('\n\n')
+    return [[tuple(line.split()) for line in block.strip().splitlines()] for block in blocks]
+
+
+def gold_chunks(sentence):
+    chunks = set()
+    chunk = None  # the (label, start) of the open chunk
+    for i, (_, _, iob) in enumerate(sentence + [('', '', 'O')]):
+        if chunk is not None and not iob.startswith('I-'):
+            chunks.add(chunk + (i,))
+            chunk = None
+        if iob.startswith('B-'):
+            chunk = (iob[2:], i)
+    return chunks
+
+
+def tree_chunks(tree):
+    chunks = set()
+    position = 0
+    for child in tree:
+        if isinstance(child, Tree):
+            chunks.add((child.label(), position, position + len(child.leaves())))
+            position += len(child.leaves())
+        else:
+            position += 1
+    return chunks
+
+
+def evaluate_backend(backend, corpus, chunker, repeat):
+    tagger = get_tagger(backend)
+    sentences = [[token for token, _, _ in sentence] for sentence in corpus]
+    tagger.tag_sents(sentences[:1])  # loads the model outside of the timing
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tagged_sentences = tagger.tag_sents(sentences)
+    elapsed = time.perf_counter() - start
+    correct_tags = correct_chunks = guessed_chunks = expected_chunks = 0
+    for sentence, tagged in zip(corpus, tagged_sentences):
+        correct_tags += sum(gold == tag for (_, gold, _), (_, tag) in zip(sentence, tagged))
+        expected, guessed = gold_chunks(sentence), tree_chunks(chunker.parse(tagged))
+        correct_chunks += len(expected & guessed)
+        expected_chunks += len(expected)
+        guessed_chunks += len(guessed)
+    token_count = sum(len(s) for s in sentences)
+    precision = correct_chunks / guessed_chunks if guessed_chunks else 0
+    recall = correct_chunks / expected_chunks if expected_chunks else 0
+    return dict(
+        tokens_per_second=token_count * repeat / elapsed,
+        tag_accuracy=correct_tags / token_count,
+        chunk_precision=precision,
+        chunk_recall=recall,
+        chunk_f1=2 * precision * recall / (precision + recall) if precision + recall else 0,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--backends', nargs='+', default=sorted(POS_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+    corpus = read_corpus(args.corpus)
+    chunker = RegexpParser(GRAMMAR)
+    results = {}
+    for backend in args.backends:
+        try:
+            results[backend] = evaluate_backend(backend, corpus, chunker, args.repeat)
+        except LookupError as e:
+            # nltk reports missing models in a banner of asterisks
+            results[backend] = dict(error=next(line.strip() for line in str(e).splitlines() if line.strip('* ')))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Seeded generator of synthetic ingredient lines, built from the random vocabularies of benchmarks.vocabulary. A corpus
+is a mix of line shapes, each with a weight:
+
+    simple          1/2 cup chopped onions
+    parenthetical   2 (14.5 ounce) can diced tomatoes
+    word_numbers    one and a half cups finely beef
+    multi_word_unit 3 fluid ounce skinless chicken
+    range           2-3 tablespoon large red peppers
+    no_amount       chopped flank steak
+
+    python -m benchmarks.corpus [--lines 20] [--seed 42] [--shape simple=1 parenthetical=1]
+"""
+import argparse
+from bisect import bisect
+from itertools import accumulate
+from random import Random
+from recipe_parser.ingredient_tagger import MEASUREMENTS
+from benchmarks.vocabulary import RANDOM_AMOUNTS, RANDOM_UNITS, RANDOM_MODIFIERS, RANDOM_INGREDIENTS
+
+DEFAULT_SEED = 42
+DEFAULT_SHAPE = dict(simple=4, parenthetical=1, word_numbers=1, multi_word_unit=1, range=1, no_amount=1)
+WORD_AMOUNTS = ['one', 'two', 'three', 'twelve', 'twenty five', 'one half', 'one and a half', 'three quarters', 'a',
+                'an']
+NUMBER_AMOUNTS = ['1', '2', '3', '4', '10', '1 1/2', '0.5', '2.25']
+# sorted, so that the lines of a seed do not depend on the iteration order of the vocabularies
+AMOUNTS = sorted(RANDOM_AMOUNTS)
+UNITS = sorted(RANDOM_UNITS)
+MULTI_WORD_UNITS = sorted(unit for key, units in MEASUREMENTS.items() for unit in [key] + list(units) if ' ' in unit)
+CONTAINERS = ['can', 'package', 'jar', 'box']
+
+
+def parse_shape(items):
+    """
+    :param items: 'name=weight' strings, i.e. ['simple=4', 'parenthetical=1']
+    :return: a shape dict of the weight of each line shape
+    """
+    shape = {}
+    for item in items:
+        name, _, weight = item.partition('=')
+        if name not in LINE_SHAPES:
+            raise ValueError('Unknown line shape {0}, expected one of {1}'.format(name, sorted(LINE_SHAPES)))
+        shape[name] = float(weight or 1)
+    return shape
+
+
+def generate_corpus(size, seed=DEFAULT_SEED, shape=None):
+    """
+    :param size: the number of lines
+    :param seed: the seed of the generator, the same seed and shape always give the same lines
+    :param shape: a dict of the weight of each line shape, defaults to DEFAULT_SHAPE
+    :return: a list of ingredient lines
+    """
+    rand = Random(seed)
+    shape = sorted((shape or DEFAULT_SHAPE).items())
+    names = [name for name, _ in shape]
+    cumulative_weights = list(accumulate(weight for _, weight in shape))
+    return [LINE_SHAPES[names[bisect(cumulative_weights, rand.random() * cumulative_weights[-1])]](rand)
+            for _ in range(size)]
+
+
+def _ingredient(rand):
+    return '{0} {1}'.format(rand.choice(RANDOM_MODIFIERS), rand.choice(RANDOM_INGREDIENTS))
+
+
+def _simple(rand):
+    return '{0} {1} {2}'.format(rand.choice(AMOUNTS), rand.choice(UNITS), _ingredient(rand))
+
+
+def _parenthetical(rand):
+    return '{0} ({1} {2}) {3} {4}'.format(rand.choice(NUMBER_AMOUNTS), rand.choice(NUMBER_AMOUNTS),
+                                          rand.choice(UNITS), rand.choice(CONTAINERS), _ingredient(rand))
+
+
+def _word_numbers(rand):
+    return '{0} {1} {2}'.format(rand.choice(WORD_AMOUNTS), rand.choice(UNITS), _ingredient(rand))
+
+
+def _multi_word_unit(rand):
+    return '{0} {1} {2}'.format(rand.choice(NUMBER_AMOUNTS), rand.choice(MULTI_WORD_UNITS), _ingredient(rand))
+
+
+def _range(rand):
+    low = rand.randint(1, 5)
+    return '{0}{1}{2} {3} {4}'.format(low, rand.choice(['-', ' to ', ' or ']), low + rand.randint(1, 3),
+                                      rand.choice(UNITS), _ingredient(rand))
+
+
+def _no_amount(rand):
+    return _ingredient(rand)
+
+
+LINE_SHAPES = dict(
+    simple=_simple,
+    parenthetical=_parenthetical,
+    word_numbers=_word_numbers,
+    multi_word_unit=_multi_word_unit,
+    range=_range,
+    no_amount=_no_amount,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--shape', nargs='+', help='name=weight of the line shapes, defaults to {0}'.format(
+        ' '.join('{0}={1}'.format(name, weight) for name, weight in sorted(DEFAULT_SHAPE.items()))))
+    args = parser.parse_args(argv)
+    for line in generate_corpus(args.lines, args.seed, parse_shape(args.shape) if args.shape else None):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
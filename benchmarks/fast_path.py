@@ -0,0 +1,51 @@
+"""
+Measures the fast path of the IngredientParser on the lines of the labeled ingredient corpus: the share of lines it
+parses (coverage), its disagreements with the NLTK path (every fast path line is shadowed), and the lines/sec of
+parsing with and without it.
+
+    python -m benchmarks.fast_path [--corpus benchmarks/data/ingredients.conll] [--repeat 20]
+"""
+import argparse
+import json
+import time
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_parser import IngredientParser
+from benchmarks.compare_backends import DEFAULT_CORPUS, read_corpus
+
+
+def time_parser(parser, lines, repeat):
+    parser.parse(lines[0])  # loads the models outside of the timing
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            parser.parse(line)
+    return len(lines) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+    lines = [' '.join(token for token, _, _ in sentence) for sentence in read_corpus(args.corpus)]
+    try:
+        shadowed = IngredientParser(GRAMMAR.strip(), fast_path=True, shadow_rate=1.0)
+        for line in lines:
+            shadowed.parse(line)
+        info = shadowed.fast_path_info()
+        results = dict(
+            coverage=info.hits / len(lines),
+            disagreements=info.disagreements,
+            nltk_lines_per_second=time_parser(IngredientParser(GRAMMAR.strip()), lines, args.repeat),
+            fast_path_lines_per_second=time_parser(IngredientParser(GRAMMAR.strip(), fast_path=True), lines,
+                                                   args.repeat),
+        )
+        results['speedup'] = results['fast_path_lines_per_second'] / results['nltk_lines_per_second']
+    except LookupError as e:
+        # nltk reports missing models in a banner of asterisks
+        results = dict(error=next(line.strip() for line in str(e).splitlines() if line.strip('* ')))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
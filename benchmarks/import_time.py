@@ -0,0 +1,44 @@
+"""
+Measures the start up cost of the package in fresh interpreters: importing recipe_parser, importing the parser
+module, and calling warmup() (which builds the tagger cascade and loads the NLTK models).
+
+    python -m benchmarks.import_time [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    'import recipe_parser': 'import recipe_parser',
+    'import recipe_parser.amount_conversions': 'import recipe_parser.amount_conversions',
+    'import recipe_parser.ingredient_parser': 'import recipe_parser.ingredient_parser',
+    'warmup()': 'import recipe_parser; recipe_parser.warmup()',
+}
+TIMER = 'import time; _start = time.perf_counter(); {0}; print(time.perf_counter() - _start)'
+
+
+def time_statement(statement, repeat):
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', TIMER.format(statement)])
+        timings.append(float(output.decode().strip().splitlines()[-1]))
+    return dict(median_seconds=statistics.median(timings), min_seconds=min(timings))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    results = {}
+    for name, statement in STATEMENTS.items():
+        try:
+            results[name] = time_statement(statement, args.repeat)
+        except subprocess.CalledProcessError as e:
+            results[name] = dict(error='exit status {0}'.format(e.returncode))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
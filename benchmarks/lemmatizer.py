@@ -0,0 +1,47 @@
+"""
+Compares the WordNetLemmatizer with the CachedLemmatizer (vocabulary lemma table and LRU cache) on the words of a
+seeded synthetic corpus (see benchmarks.corpus). Reports words/sec of each, the table and cache hits, and checks
+that the lemmas are equal.
+
+    python -m benchmarks.lemmatizer [--lines 20000] [--seed 42]
+"""
+import argparse
+import json
+import time
+from nltk.stem import WordNetLemmatizer
+from recipe_parser.lemmatizer import CachedLemmatizer
+from benchmarks.corpus import generate_corpus
+
+
+def time_lemmatizer(lemmatizer, words):
+    start = time.perf_counter()
+    lemmas = [lemmatizer.lemmatize(word) for word in words]
+    return len(words) / (time.perf_counter() - start), lemmas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    words = [word for line in generate_corpus(args.lines, args.seed) for word in line.split() if word.isalpha()]
+    try:
+        wordnet = WordNetLemmatizer()
+        wordnet.lemmatize(words[0])  # loads WordNet outside of the timing
+        cached = CachedLemmatizer(wordnet)
+        wordnet_words_per_second, expected = time_lemmatizer(wordnet, words)
+        cached_words_per_second, lemmas = time_lemmatizer(cached, words)
+        results = dict(
+            wordnet=dict(words_per_second=wordnet_words_per_second),
+            cached=dict(words_per_second=cached_words_per_second, **cached.info()._asdict()),
+            speedup=cached_words_per_second / wordnet_words_per_second,
+            equal=lemmas == expected,
+        )
+    except LookupError as e:
+        # nltk reports missing models in a banner of asterisks
+        results = dict(error=next(line.strip() for line in str(e).splitlines() if line.strip('* ')))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Measures the memory held by parse results: parses distinct ingredient lines (without a parse cache, so every result
+is a separate object graph), keeps the results, and reports the traced bytes per parsed line, both for results
+used in process and for results unpickled from the parse cache or a worker process. The results are also copied
+into __slots__ types and into the per instance __dict__ types the results had before (sharing the field values), to
+measure the bytes the __slots__ save per line.
+
+    python -m benchmarks.memory [--lines 20000] [parser options, i.e. --no-keep-amounts]
+"""
+import argparse
+import gc
+import json
+import pickle
+import tracemalloc
+from recipe_parser.ingredient_parser import IngredientParser, ParsedValue, Ingredient, Amount, ParsedIngredient
+
+TEMPLATES = [
+    '{0} cups chopped chicken',
+    '{0} pounds beef (about {0} ounces)',
+    '{0} tablespoons salt',
+    '{0} 1/2 teaspoons ground pepper',
+    '{0} large potatoes, peeled',
+]
+
+
+def lines(count):
+    return [TEMPLATES[i % len(TEMPLATES)].format(i // len(TEMPLATES) + 1) for i in range(count)]
+
+
+class DictValue:
+    """
+    Baseline of the ParsedValue types without __slots__: the same fields, held in a per instance __dict__.
+    """
+    fields = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+
+
+DICT_TYPES = {cls: type('Dict' + cls.__name__, (DictValue,), dict(fields=cls.__slots__))
+              for cls in (Ingredient, Amount, ParsedIngredient)}
+
+
+def slots_value(cls, *values):
+    value = cls.__new__(cls)
+    value._set_fields(*values)
+    return value
+
+
+def dict_value(cls, *values):
+    return DICT_TYPES[cls](*values)
+
+
+def copy_result(result, make_value):
+    """
+    :param result: a parse result
+    :param make_value: called with a ParsedValue type and its (copied) field values to create the copy
+    :return: a copy of the result's ParsedValue objects and tuples, sharing the other field values
+    """
+    if isinstance(result, ParsedValue):
+        return make_value(type(result), *[copy_result(value, make_value) for value in result.__getstate__()])
+    if isinstance(result, tuple):
+        return tuple(copy_result(value, make_value) for value in result)
+    return result
+
+
+def traced_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    results = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, results
+
+
+def copied_bytes(results, make_value):
+    """
+    :return: the traced bytes of copies of the results made by copy_result
+    """
+    return traced_bytes(lambda: [copy_result(result, make_value) for result in results])[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--no-keep-amounts', dest='keep_amounts', action='store_false')
+    args = parser.parse_args(argv)
+    options = {} if args.keep_amounts else dict(keep_amounts=False)
+    parse_many = IngredientParser.get_batch_parser(**options)
+    texts = lines(args.lines)
+    list(parse_many(texts))  # loads the models and fills the module level caches outside of the measurement
+    size, results = traced_bytes(lambda: list(parse_many(texts)))
+    slots_size = copied_bytes(results, slots_value)
+    dict_size = copied_bytes(results, dict_value)
+    pickled = [pickle.dumps(result, pickle.HIGHEST_PROTOCOL) for result in results]
+    del results
+    unpickled_size, _ = traced_bytes(lambda: [pickle.loads(data) for data in pickled])
+    print(json.dumps(dict(
+        lines=args.lines,
+        bytes_per_line=size / args.lines,
+        unpickled_bytes_per_line=unpickled_size / args.lines,
+        slots_result_bytes_per_line=slots_size / args.lines,
+        dict_result_bytes_per_line=dict_size / args.lines,
+        slots_saving=1 - slots_size / dict_size if dict_size else 0.0,
+    ), indent=2))
+
+
+if __name__ == '__main__':
+    main()
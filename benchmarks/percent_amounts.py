@@ -0,0 +1,60 @@
+"""
+Compares AmountPercentConverter.calculate_percent_amounts, called once per recipe, with the columnar
+calculate_percent_amounts_batch over a seeded random corpus of recipes. Reports recipes/sec of each and checks that
+the percent amounts are equal within floating point rounding. Requires numpy.
+
+    python -m benchmarks.percent_amounts [--recipes 100000] [--seed 42]
+"""
+import argparse
+import json
+import time
+from random import Random
+from recipe_parser.amount_conversions import AmountPercentConverter, CONVERSION_LOOKUP, encode_units, numpy
+
+AMOUNTS = [None, 0, 1, 2, 3, 0.5, 0.25, 1.5, 12, 250]
+
+
+class Row:
+    percent_amount = None
+
+    def __init__(self, ingredient_amount, amount_units):
+        self.ingredient_amount = ingredient_amount
+        self.amount_units = amount_units
+
+
+def random_recipes(count, seed):
+    rand = Random(seed)
+    units = sorted(CONVERSION_LOOKUP) + [None] * 4
+    return [[Row(rand.choice(AMOUNTS), rand.choice(units)) for _ in range(rand.randint(3, 15))]
+            for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    converter = AmountPercentConverter()
+    recipes = random_recipes(args.recipes, args.seed)
+    start = time.perf_counter()
+    for recipe in recipes:
+        converter.calculate_percent_amounts(recipe)
+    loop_seconds = time.perf_counter() - start
+    # columnar inputs, as read from a column store
+    recipe_ids = numpy.array([recipe_id for recipe_id, recipe in enumerate(recipes) for _ in recipe])
+    amounts = numpy.array([row.ingredient_amount for recipe in recipes for row in recipe], dtype=float)
+    unit_codes = numpy.array(encode_units(row.amount_units for recipe in recipes for row in recipe))
+    start = time.perf_counter()
+    percent_amounts = converter.calculate_percent_amounts_batch(recipe_ids, amounts, unit_codes)
+    batch_seconds = time.perf_counter() - start
+    results = dict(
+        loop=dict(recipes_per_second=args.recipes / loop_seconds),
+        batch=dict(recipes_per_second=args.recipes / batch_seconds),
+        speedup=loop_seconds / batch_seconds,
+        equal=bool(numpy.array_equal(percent_amounts, [row.percent_amount for recipe in recipes for row in recipe])),
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares the QuantityRecognizer with the conversion chain it replaced (Fraction, Text2Fraction, text2num and the
+a/an check, tried in order with an exception per failed attempt) on the CD tokens of typical Amount chunks.
+Reports conversions/sec of each, for the recognizer both with its cache of recognized texts and without
+(cache_size=0).
+
+    python -m benchmarks.quantity [--repeat 2000]
+"""
+import argparse
+import json
+import time
+from fractions import Fraction
+from recipe_parser import QUANTITY_RECOGNIZER
+from recipe_parser.quantity import QuantityRecognizer
+from recipe_parser.text_to_fraction import Text2Fraction
+from recipe_parser.text_to_num import text2num, NumberException
+
+LEGACY_CONVERSION_FUNCTIONS = [
+    lambda x: Fraction(x[0]),
+    lambda x: Text2Fraction.text_to_fraction(x[0]),
+    lambda x: text2num(x[0]),
+    lambda x: any(w[0] in ['a', 'an', 'single'] for w in x)
+]
+TOKENS = ['1', '2', '1/2', '3', '1/4', '12', 'half', 'one', 'a', 'quarter', 'twenty', '0.5', 'an', 'single']
+
+
+def legacy_convert(token):
+    for func in LEGACY_CONVERSION_FUNCTIONS:
+        try:
+            value = func((token, 'CD'))
+            if not value:
+                raise ValueError()
+            return value
+        except (ValueError, NumberException):
+            pass
+    return 0
+
+
+def time_conversion(convert, tokens, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for token in tokens:
+            convert(token)
+    return len(tokens) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+    results = dict(
+        legacy_chain=dict(conversions_per_second=time_conversion(legacy_convert, TOKENS, args.repeat)),
+        uncached_quantity_recognizer=dict(
+            conversions_per_second=time_conversion(QuantityRecognizer(cache_size=0).recognize, TOKENS, args.repeat)),
+        quantity_recognizer=dict(conversions_per_second=time_conversion(QUANTITY_RECOGNIZER, TOKENS, args.repeat)),
+    )
+    results['uncached_speedup'] = results['uncached_quantity_recognizer']['conversions_per_second'] / \
+        results['legacy_chain']['conversions_per_second']
+    results['speedup'] = results['quantity_recognizer']['conversions_per_second'] / \
+        results['legacy_chain']['conversions_per_second']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
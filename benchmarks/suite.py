@@ -0,0 +1,211 @@
+"""
+Benchmark suite of the parsing stages on a seeded synthetic corpus (see benchmarks.corpus):
+
+    parse    IngredientParser.parse of each line (without a parse cache)
+    tagger   the tagger cascade alone, on the tokens of each line
+    convert  an uncached quantity recognizer, on the CD tagged tokens of each line
+    percent  AmountPercentConverter.calculate_percent_amounts of each recipe of parsed lines
+
+Each benchmark runs in a fresh process and reports items/sec, the p50 and p99 latency of a single item in
+microseconds and the peak RSS of the process in KiB. The results are printed as JSON (or written to --output), and
+two result files, i.e. of two commits, are compared with the compare command:
+
+    python -m benchmarks.suite run [--lines 10000] [--seed 42] [--shape simple=4 range=1] [-o results.json]
+    python -m benchmarks.suite compare before.json after.json [--threshold 0.05]
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+from random import Random
+from benchmarks.corpus import DEFAULT_SEED, generate_corpus, parse_shape
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
+DEFAULT_LINES = 10000
+DEFAULT_THRESHOLD = 0.05
+LINES_PER_RECIPE = (3, 15)
+# larger is better for the rates, smaller for the latencies and the memory
+METRICS = dict(items_per_second=1, p50_microseconds=-1, p99_microseconds=-1, peak_rss_kib=-1)
+
+
+def _parser():
+    from recipe_parser import GRAMMAR
+    from recipe_parser.ingredient_parser import IngredientParser
+    return IngredientParser(GRAMMAR.strip())
+
+
+def _timed(function, items):
+    """
+    Calls function on each item.
+    :return: the latencies of the calls in seconds
+    """
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        function(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench_parse(lines):
+    parser = _parser()
+    parser.parse(lines[0])  # loads the models outside of the timing
+    return _timed(parser.parse, lines)
+
+
+def _sentences(lines):
+    from recipe_parser import PHRASE_MATCHER, TOKENIZER
+    return [PHRASE_MATCHER.merge(TOKENIZER(line.lower())) for line in lines]
+
+
+def bench_tagger(lines):
+    from recipe_parser import TAGGER
+    sentences = [tokens for tokens in _sentences(lines) if tokens]
+    TAGGER.tag(sentences[0])
+    return _timed(TAGGER.tag, sentences)
+
+
+def bench_convert(lines):
+    from recipe_parser import TAGGER
+    from recipe_parser.quantity import QuantityRecognizer
+    amounts = [' '.join(token for token, tag in TAGGER.tag(tokens) if tag == 'CD')
+               for tokens in _sentences(lines) if tokens]
+    # without a cache, which would mostly time the lookups of the repeated amounts
+    return _timed(QuantityRecognizer(cache_size=0).recognize, [amount for amount in amounts if amount])
+
+
+def bench_percent(lines):
+    from recipe_parser.amount_conversions import AmountPercentConverter
+    from recipe_parser.ingestion import IngredientRecord
+    rand = Random(len(lines))
+    records = [IngredientRecord(0, line, parsed_ingredient)
+               for line, parsed_ingredient in zip(lines, _parser().parse_many(lines))]
+    recipes = []
+    while records:
+        size = rand.randint(*LINES_PER_RECIPE)
+        recipes.append(records[:size])
+        records = records[size:]
+    return _timed(AmountPercentConverter().calculate_percent_amounts, recipes)
+
+
+BENCHMARKS = dict(parse=bench_parse, tagger=bench_tagger, convert=bench_convert, percent=bench_percent)
+
+
+def percentile(values, percent):
+    """
+    :return: the nearest rank percentile of the values
+    """
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(round(percent / 100 * len(values))) - 1))]
+
+
+def run_benchmark(name, lines, seed, shape):
+    """
+    Runs a benchmark on a generated corpus, in the (fresh) current process.
+    :return: the result dict of the benchmark
+    """
+    try:
+        latencies = BENCHMARKS[name](generate_corpus(lines, seed, shape))
+    except LookupError as e:
+        if isinstance(e, KeyError):
+            raise
+        # nltk reports missing models in a banner of asterisks
+        return dict(error=next(line.strip() for line in str(e).splitlines() if line.strip('* ')))
+    return dict(
+        items=len(latencies),
+        items_per_second=len(latencies) / sum(latencies) if latencies and sum(latencies) else 0.0,
+        p50_microseconds=percentile(latencies, 50) * 1e6 if latencies else None,
+        p99_microseconds=percentile(latencies, 99) * 1e6 if latencies else None,
+        # kilobytes on linux, bytes on macos
+        peak_rss_kib=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1)
+        if resource else None,
+    )
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, lines, seed, shape):
+    """
+    Runs each benchmark in a fresh process, so the peak RSS is the benchmark's own.
+    :return: the results of the benchmarks, with the corpus parameters and the environment
+    """
+    context = multiprocessing.get_context('spawn')
+    benchmarks = {}
+    for name in names:
+        with context.Pool(1) as pool:
+            benchmarks[name] = pool.apply(run_benchmark, (name, lines, seed, shape))
+    return dict(
+        commit=_git_commit(),
+        python=platform.python_version(),
+        corpus=dict(lines=lines, seed=seed, shape=shape),
+        benchmarks=benchmarks,
+    )
+
+
+def compare(before, after, threshold=DEFAULT_THRESHOLD):
+    """
+    :param before: the results of run
+    :param after: the results of run, i.e. of a later commit
+    :param threshold: the relative change of a metric that is reported as a regression or an improvement
+    :return: a dict of the relative change and the verdict of each metric of the benchmarks in both results
+    """
+    changes = {}
+    for name in sorted(set(before['benchmarks']) & set(after['benchmarks'])):
+        old, new = before['benchmarks'][name], after['benchmarks'][name]
+        for metric, direction in sorted(METRICS.items()):
+            if not old.get(metric) or new.get(metric) is None:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            verdict = 'unchanged'
+            if abs(change) > threshold:
+                verdict = 'improved' if change * direction > 0 else 'regressed'
+            changes['{0}.{1}'.format(name, metric)] = dict(before=old[metric], after=new[metric], change=change,
+                                                           verdict=verdict)
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--benchmarks', nargs='+', default=sorted(BENCHMARKS), choices=sorted(BENCHMARKS))
+    run_parser.add_argument('--lines', type=int, default=DEFAULT_LINES)
+    run_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    run_parser.add_argument('--shape', nargs='+', help='name=weight of the corpus line shapes')
+    run_parser.add_argument('-o', '--output', help='path of the JSON results, printed if not given')
+    compare_parser = commands.add_parser('compare', help='compare two results, exits with 1 on regressions')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        with open(args.before) as before, open(args.after) as after:
+            changes = compare(json.load(before), json.load(after), args.threshold)
+        print(json.dumps(changes, indent=2, sort_keys=True))
+        return 1 if any(change['verdict'] == 'regressed' for change in changes.values()) else 0
+    if args.command != 'run':
+        parser.error('a command is required')
+    results = run(args.benchmarks, args.lines, args.seed, parse_shape(args.shape) if args.shape else None)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Compares the tokenizer modes of the IngredientParser: punkt sentence splitting followed by the treebank word
+tokenizer, and the single pass IngredientTokenizer. Reports lines/sec of each and the share of lines on which the
+two produce different tokens.
+
+    python -m benchmarks.tokenizer [--repeat 200]
+"""
+import argparse
+import json
+import time
+from nltk import sent_tokenize
+from recipe_parser import TOKENIZER, INGREDIENT_TOKENIZER
+
+LINES = [
+    '1 (4 ounce) can chopped green peppers',
+    '1/2 cup white sugar',
+    '2-3 cloves garlic, minced',
+    '1 1/2 teaspoons baking powder',
+    '0.5 lb. ground beef',
+    '2 tbsp. olive oil, divided',
+    '3 large eggs, beaten',
+    'salt and pepper to taste',
+    'one (8 oz.) package cream cheese, softened',
+    '4 skinless, boneless chicken breast halves - cut into cubes',
+]
+
+
+def treebank_tokenize(text):
+    return TOKENIZER(sent_tokenize(text)[0])
+
+
+def time_tokenizer(tokenize, lines, repeat):
+    tokenize(lines[0])  # loads punkt outside of the timing
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            tokenize(line)
+    return len(lines) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+    results = {}
+    for name, tokenize in (('treebank', treebank_tokenize), ('ingredient', INGREDIENT_TOKENIZER)):
+        try:
+            results[name] = dict(lines_per_second=time_tokenizer(tokenize, LINES, args.repeat))
+        except LookupError as e:
+            results[name] = dict(error=next(line for line in str(e).splitlines() if line.strip('* ')).strip())
+    if 'error' not in results['treebank']:
+        results['treebank']['disagreements'] = sum(treebank_tokenize(line) != INGREDIENT_TOKENIZER(line)
+                                                   for line in LINES)
+        results['speedup'] = results['ingredient']['lines_per_second'] / results['treebank']['lines_per_second']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
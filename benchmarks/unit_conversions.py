@@ -0,0 +1,47 @@
+"""
+Compares converting a column of amounts to grams one row at a time, with a lookup of each unit and the factor
+between them, with the gather and multiply of UnitConverter.convert over the same seeded random rows. Reports
+rows/sec of each and checks that the results are equal. Requires numpy.
+
+    python -m benchmarks.unit_conversions [--rows 1000000] [--seed 42]
+"""
+import argparse
+import json
+import time
+from random import Random
+from recipe_parser.amount_conversions import UnitConverter, CONVERSION_MATRIX, UNIT_CODES, encode_units, numpy
+
+AMOUNTS = [0.25, 0.5, 1, 1.5, 2, 3, 12, 250]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    rand = Random(args.seed)
+    units = sorted(UNIT_CODES)
+    values = [rand.choice(AMOUNTS) for _ in range(args.rows)]
+    row_units = [rand.choice(units) for _ in range(args.rows)]
+    start = time.perf_counter()
+    gram_code = UNIT_CODES['gram']
+    loop_grams = [value * CONVERSION_MATRIX[UNIT_CODES[unit], gram_code] for value, unit in zip(values, row_units)]
+    loop_seconds = time.perf_counter() - start
+    # columnar inputs, as read from a column store
+    values = numpy.array(values)
+    unit_codes = numpy.array(encode_units(row_units))
+    converter = UnitConverter()
+    start = time.perf_counter()
+    grams = converter.convert(values, unit_codes, 'gram')
+    vector_seconds = time.perf_counter() - start
+    results = dict(
+        loop=dict(rows_per_second=args.rows / loop_seconds),
+        vectorized=dict(rows_per_second=args.rows / vector_seconds),
+        speedup=loop_seconds / vector_seconds,
+        equal=bool(numpy.allclose(grams, loop_grams)),
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
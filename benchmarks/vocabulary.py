@@ -0,0 +1,38 @@
+"""
+Vocabularies of the random ingredient lines of the tagger tests and the synthetic benchmark corpus (see
+benchmarks.corpus): single word amounts and units of the tagger vocabularies, and a few modifiers and ingredients.
+"""
+from recipe_parser.ingredient_tagger import MEASUREMENTS, NUMERICAL
+
+RANDOM_AMOUNTS = []
+for item in NUMERICAL:
+    if len(item.split()) < 2:
+        RANDOM_AMOUNTS.append(item)
+
+RANDOM_UNITS = []
+for key, items in MEASUREMENTS.items():
+    RANDOM_UNITS.append(key)
+    for item in items:
+        if len(item.split()) < 2:
+            RANDOM_UNITS.append(item)
+
+RANDOM_MODIFIERS = [
+    'chopped',
+    'finely',
+    'chopped',
+    'boneless',
+    'skinless',
+    'large',
+]
+
+RANDOM_INGREDIENTS = [
+    'chicken',
+    'beef',
+    'fish',
+    'stock',
+    'steak',
+    'flank steak',
+    'bullion cubes',
+    'onions',
+    'red peppers'
+]
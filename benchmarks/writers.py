@@ -0,0 +1,53 @@
+"""
+Compares inserting ingredient rows into sqlite one row per transaction with the batched BatchWriter at several
+batch sizes. Reports rows/sec and the mean and maximum commit latency of each.
+
+    python -m benchmarks.writers [--rows 20000] [--batch-sizes 1 100 1000 10000]
+"""
+import argparse
+import json
+import os
+import time
+from tempfile import TemporaryDirectory
+from recipe_parser.ingredient_parser import Ingredient, Amount, ParsedIngredient
+from recipe_parser.writers import SqliteWriter, INGREDIENT_COLUMNS, quote_identifier
+
+PARSED_INGREDIENT = ParsedIngredient(Ingredient('beef', 'ground'), [Amount(1, 'pound')])
+
+
+def single_inserts(path, rows):
+    writer = SqliteWriter(path)
+    connection = writer._connection
+    statement = 'INSERT INTO ingredients ({0}) VALUES ({1})'.format(
+        ', '.join(quote_identifier(column) for column in INGREDIENT_COLUMNS), ', '.join('?' * len(INGREDIENT_COLUMNS)))
+    start = time.perf_counter()
+    for recipe_id in range(rows):
+        connection.execute(statement, (recipe_id, '1 pound of ground beef', 'beef', 'ground', 1.0, 'pound', 0.5))
+        connection.commit()
+    seconds = time.perf_counter() - start
+    writer.close()
+    return dict(rows_per_second=rows / seconds, mean_commit_seconds=seconds / rows)
+
+
+def batched_inserts(path, rows, batch_size):
+    with SqliteWriter(path, batch_size=batch_size) as writer:
+        for recipe_id in range(rows):
+            writer.write_parsed(recipe_id, '1 pound of ground beef', PARSED_INGREDIENT, 0.5)
+    return writer.stats()._asdict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 1000, 10000])
+    args = parser.parse_args(argv)
+    with TemporaryDirectory() as directory:
+        results = dict(single=single_inserts(os.path.join(directory, 'single.db'), args.rows))
+        for batch_size in args.batch_sizes:
+            results['batch_size_{0}'.format(batch_size)] = batched_inserts(
+                os.path.join(directory, 'batch_{0}.db'.format(batch_size)), args.rows, batch_size)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
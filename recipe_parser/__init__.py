@@ -1,21 +1,120 @@
-from recipe_parser.ingredient_tagger import Tagger, MEASUREMENT_LOOKUP
-from nltk.stem import WordNetLemmatizer
-from nltk import word_tokenize
-from fractions import Fraction
-from recipe_parser.text_to_fraction import Text2Fraction
-from recipe_parser.text_to_num import text2num
+__version__ = '0.1'
+
+from recipe_parser.tagger_data import MEASUREMENT_LOOKUP, DEFAULT_POS_BACKEND
+from recipe_parser.ingredient_tokenizer import IngredientTokenizer
+from recipe_parser.quantity import QuantityRecognizer
+from recipe_parser.phrase_matcher import PhraseMatcher
+from recipe_parser.lemmatizer import CachedLemmatizer
 import re
+import threading
+from string import punctuation
+
+
+class LazyInstance:
+    """
+    Proxy for a module level singleton that is expensive to create (i.e. the tagger cascade, which unpickles the
+    maxent treebank model). The instance is created by factory on first attribute access (or call, for functions),
+    so importing the package stays cheap for code that never tags or lemmatizes. Threads that race on the first
+    access wait for a single instance to be created.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get_instance(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get_instance(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.get_instance()(*args, **kwargs)
+
+
+def _create_cascade_tagger(backend):
+    from recipe_parser.ingredient_tagger import Tagger, DefaultTagger
+    #  iterates over all subclasses of abstract Tagger, and a cascading tagger using a backoff for the primary
+    #  (tagger of the lowest precedence), the DefaultTagger uses the selected statistical backend
+    tagger = None
+    for sub_class in sorted(Tagger.__subclasses__(), key=lambda sub_class: getattr(sub_class, 'PRECEDENCE'),
+                            reverse=True):
+        if sub_class is DefaultTagger:
+            tagger = sub_class._create_tagger(backoff=tagger, backend=backend)
+        else:
+            tagger = sub_class._create_tagger(backoff=tagger)
+    return tagger
+
 
-#  iterates over all subclasses of abstract Tagger, and a cascading tagger using a backoff for the primary (_tagger[-1])
-_taggers = sorted(Tagger.__subclasses__(), key=lambda sub_class: getattr(sub_class, 'PRECEDENCE'), reverse=True)
-for i in range(len(_taggers)):
-    _taggers[i] = _taggers[i].get_tagger(backoff=_taggers[i-1] if i > 0 else None)
-TAGGER = _taggers[-1]
+_cascade_taggers = dict()
+_fused_taggers = dict()
 
 
-LEMMATIZER = WordNetLemmatizer()
-TOKENIZER = word_tokenize  # RegexpTokenizer('(?u)\W+|\$[\d\.]+|\S+').tokenize
+def get_cascade_tagger(backend=DEFAULT_POS_BACKEND):
+    """
+    Returns the shared cascade of Tagger sub classes ending in the backend POS tagger (see POS_BACKENDS).
+    """
+    from recipe_parser.ingredient_tagger import TAGGER_LOCK
+    with TAGGER_LOCK:
+        if backend not in _cascade_taggers:
+            _cascade_taggers[backend] = _create_cascade_tagger(backend)
+        return _cascade_taggers[backend]
+
+
+def get_tagger(backend=DEFAULT_POS_BACKEND):
+    """
+    Returns the shared FusedTagger for the backend POS tagger, equivalent to get_cascade_tagger(backend) up to the
+    tag history of the backend (see FusedTagger).
+    """
+    from recipe_parser.ingredient_tagger import Tagger, FusedTagger, TAGGER_LOCK
+    with TAGGER_LOCK:
+        if backend not in _fused_taggers:
+            _fused_taggers[backend] = FusedTagger.from_taggers(Tagger.__subclasses__(), get_cascade_tagger(backend))
+        return _fused_taggers[backend]
+
+
+def _create_word_tokenizer():
+    # NLTK takes most of the import time of the package, so it is only imported once a line is tokenized
+    from nltk import word_tokenize
+    return word_tokenize
+
+
+def _create_phrase_matcher():
+    from recipe_parser.ingredient_tagger import tagger_phrases
+    return PhraseMatcher(tagger_phrases())
+
+
+CASCADE_TAGGER = LazyInstance(get_cascade_tagger)
+TAGGER = LazyInstance(get_tagger)
+LEMMATIZER = LazyInstance(CachedLemmatizer)
+TOKENIZER = LazyInstance(_create_word_tokenizer)  # RegexpTokenizer('(?u)\W+|\$[\d\.]+|\S+').tokenize
+INGREDIENT_TOKENIZER = IngredientTokenizer().tokenize
+# merges multi-token units and numbers (fluid ounce, one half) into single tokens after tokenizing
+PHRASE_MATCHER = LazyInstance(_create_phrase_matcher)
+# tokenizer modes of the IngredientParser: punkt sentence splitting followed by TOKENIZER, or INGREDIENT_TOKENIZER
+TREEBANK_TOKENIZER_MODE = 'treebank'
+INGREDIENT_TOKENIZER_MODE = 'ingredient'
+DEFAULT_TOKENIZER_MODE = TREEBANK_TOKENIZER_MODE
 AMOUNT_PATTERN = re.compile(r'\(.*?\)')
+# a line is segmented into its parentheticals, the ingredient text and a trailing note after the first comma
+NOTE_SEPARATOR = ','
+# a NOTE_SEPARATOR between digits is a thousands separator (1,000 grams) and does not start a note
+NOTE_SEPARATOR_PATTERN = re.compile(r'(?<!\d){0}(?!\d)'.format(re.escape(NOTE_SEPARATOR)))
+# phrases that carry no ingredient or amount and are dropped from a line before it is segmented
+NOTE_PHRASE_PATTERN = re.compile(r'\b(?:to taste|as needed|for garnish|for serving|optional)\b')
+# punctuation removed from the parentheticals, and from the rest of the line except for '/' and the parentheses
+AMOUNT_TRANSLATOR = str.maketrans('', '', punctuation)
+TEXT_PUNCTUATION = ''.join(c for c in punctuation if c not in '/()')
+TEXT_CLEANER = str.maketrans('', '', TEXT_PUNCTUATION)
+# the cache key keeps the NOTE_SEPARATOR, since it splits the line into segments
+KEY_CLEANER = str.maketrans('', '', TEXT_PUNCTUATION.replace(NOTE_SEPARATOR, ''))
+# '.', '-' and '/' between digits are part of a quantity (0.5, 2-3, 1-1/2) and are kept by the cleaning
+QUANTITY_PUNCTUATION = re.compile(r'(?<=\d)([./-])(?=\d)')
 GRAMMAR = r"""
     Amount: {<CD.*>+<.*>*?<MM>?}
             {<CD.*>+.*?<CD>+?}
@@ -23,10 +122,13 @@ GRAMMAR = r"""
             {<DT|PP\$>?<JJ.*|VBN.*|MOD>*<NN>+}
             {<NNP>+}
 """
-# functions to try to convert text to numbers. Note that the conversion ends on the first function
-TEXT_TO_NUM_CONVERSION_FUNCTIONS = [
-    lambda x: Fraction(x[0]),
-    lambda x: Text2Fraction.text_to_fraction(x[0]),
-    lambda x: text2num(x[0]),
-    lambda x: any(w[0] in ['a', 'an', 'single'] for w in x)
-]
+QUANTITY_RECOGNIZER = QuantityRecognizer().recognize
+
+
+def warmup():
+    """
+    Builds the tagger cascade and the default parser and loads the NLTK models (maxent tagger, punkt and WordNet)
+    up front, for services that prefer paying the start up cost before the first parse instead of on it.
+    """
+    from recipe_parser.ingredient_parser import IngredientParser
+    IngredientParser.get_parser()('1 cup warm water')
@@ -0,0 +1,84 @@
+import argparse
+import sys
+from recipe_parser import DEFAULT_TOKENIZER_MODE, TREEBANK_TOKENIZER_MODE, INGREDIENT_TOKENIZER_MODE
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.ingredient_tagger import POS_BACKENDS, DEFAULT_POS_BACKEND
+from recipe_parser.ingestion import RecipeIngestor, DEFAULT_INGREDIENTS_KEY, DEFAULT_ID_KEY, \
+    DEFAULT_RECIPES_PER_BATCH, DEFAULT_CHECKPOINT_INTERVAL
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m recipe_parser',
+        description='Parses the ingredient lists of scraped recipe JSON/JSONL files into JSONL ingredient records '
+                    '(primary, modifier, value, unit, percent_amount).'
+    )
+    parser.add_argument('inputs', nargs='+', help='recipe JSON or JSONL files')
+    parser.add_argument('-o', '--output', required=True, help='path of the JSONL output')
+    parser.add_argument('--checkpoint', help='checkpoint file, defaults to <output>.checkpoint')
+    parser.add_argument('--resume', action='store_true', help='resume from the checkpoint of an interrupted run')
+    parser.add_argument('--ingredients-key', default=DEFAULT_INGREDIENTS_KEY,
+                        help='recipe key holding the list of ingredient lines')
+    parser.add_argument('--id-key', default=DEFAULT_ID_KEY, help='recipe key written as the record recipe id')
+    parser.add_argument('--recipes-per-batch', type=int, default=DEFAULT_RECIPES_PER_BATCH,
+                        help='number of recipes parsed together')
+    parser.add_argument('--checkpoint-interval', type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help='number of recipes between checkpoints')
+    parser.add_argument('--processes', type=int, default=1, help='number of parser worker processes')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='number of parser threads sharing a single parser, used instead of --processes')
+    parser.add_argument('--cache-size', type=int, help='number of parse results cached in memory')
+    parser.add_argument('--cache-path', help='sqlite parse cache shared across runs and worker processes')
+    parser.add_argument('--backend', default=DEFAULT_POS_BACKEND, choices=sorted(POS_BACKENDS),
+                        help='statistical POS tagger used for the words outside of the tagger vocabularies')
+    parser.add_argument('--tokenizer', default=DEFAULT_TOKENIZER_MODE,
+                        choices=[TREEBANK_TOKENIZER_MODE, INGREDIENT_TOKENIZER_MODE],
+                        help='punkt and treebank tokenizers, or the single pass ingredient tokenizer')
+    parser.add_argument('--fast-path', action='store_true',
+                        help="parse '<amount> <unit> <ingredient>' lines without the NLTK pipeline")
+    parser.add_argument('--shadow-rate', type=float, default=0.0,
+                        help='fraction of fast path lines that are also parsed by the NLTK pipeline to compare')
+    return parser
+
+
+def main(argv=None):
+    args = build_argument_parser().parse_args(argv)
+    parallel_parser = None
+    # the ingredient records only use the selected amount
+    parser_options = dict(cache_size=args.cache_size, cache_path=args.cache_path, backend=args.backend,
+                          tokenizer=args.tokenizer, fast_path=args.fast_path, shadow_rate=args.shadow_rate,
+                          keep_amounts=False)
+    if args.threads > 1:
+        from recipe_parser.parallel_parser import ThreadPoolIngredientParser
+        parallel_parser = ThreadPoolIngredientParser(threads=args.threads, **parser_options)
+        parse_many = parallel_parser.parse_many
+    elif args.processes > 1:
+        from recipe_parser.parallel_parser import ParallelIngredientParser
+        parallel_parser = ParallelIngredientParser(processes=args.processes, **parser_options)
+        parse_many = parallel_parser.parse_many
+    else:
+        parse_many = IngredientParser.get_batch_parser(**parser_options)
+    ingestor = RecipeIngestor(
+        parse_many=parse_many,
+        ingredients_key=args.ingredients_key,
+        id_key=args.id_key,
+        recipes_per_batch=args.recipes_per_batch,
+        checkpoint_interval=args.checkpoint_interval,
+    )
+    try:
+        ingestor.run(args.inputs, args.output, checkpoint_path=args.checkpoint or args.output + '.checkpoint',
+                     resume=args.resume)
+    except ValueError as e:
+        print('error: {0}'.format(e), file=sys.stderr)
+        return 1
+    finally:
+        if parallel_parser is not None:
+            parallel_parser.close()
+    if args.fast_path and (parallel_parser is None or args.threads > 1):
+        print('fast path: {0}'.format(IngredientParser.get_instance(**parser_options).fast_path_info()),
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
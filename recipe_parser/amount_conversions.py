@@ -1,3 +1,11 @@
+from functools import reduce
+from operator import add
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from recipe_parser.tagger_data import MEASUREMENT_LOOKUP
+
 DEFAULT_UNKNOWN_AMOUNT = 0.2
 DEFAULT_UNITLESS = 0.2
 MAXIMUM_UNKNOWN_PERCENT_AMOUNT = 0.1
@@ -11,14 +19,27 @@ class AmountPercentConverter:
         :param recipe_ingredients: a list of RecipeIngredient to be modified
         :return
         """
-        amounts = [ri.ingredient_amount for ri in recipe_ingredients]
-        units = [ri.amount_units for ri in recipe_ingredients]
+        percent_amounts = self.percent_amounts([ri.ingredient_amount for ri in recipe_ingredients],
+                                               [ri.amount_units for ri in recipe_ingredients])
+        for ri, percent_amount in zip(recipe_ingredients, percent_amounts):
+            ri.percent_amount = percent_amount
+        return
+
+    def percent_amounts(self, amounts, units):
+        """
+        The percent amounts of a recipe from the columns of its ingredient amounts and units.
+        :param amounts: the ingredient amount of each ingredient, None or 0 if unknown
+        :param units: the unit of each ingredient (a key of CONVERSION_LOOKUP), None or '' if there is none
+        :return: a list of the percent amount of each ingredient
+        """
+        amounts = list(amounts)
         is_unknown = [False] * len(amounts)
-        for i, amount in enumerate(amounts):
-            amounts[i], is_unknown[i] = self._convert_units(amount, units[i])
-        total_amounts = sum(amounts)
+        for i, (amount, unit) in enumerate(zip(amounts, units)):
+            amounts[i], is_unknown[i] = self._convert_units(amount, unit)
+        # added up in order, without the rounding compensation of sum() (since Python 3.12), as the batch does
+        total_amounts = reduce(add, amounts, 0.0)
         redis_amount = 0
-        for i, (ri, a) in enumerate(zip(recipe_ingredients, amounts)):
+        for i, a in enumerate(amounts):
             amount = a / total_amounts
             if amount > MAXIMUM_UNKNOWN_PERCENT_AMOUNT and is_unknown[i]:
                 amounts[i] = MAXIMUM_UNKNOWN_PERCENT_AMOUNT
@@ -26,9 +47,45 @@ class AmountPercentConverter:
             else:
                 amounts[i] = amount
         redis_amount = redis_amount / sum(is_unknown) if sum(is_unknown) > 0 else 0
-        for i, _ in enumerate(recipe_ingredients):
-            recipe_ingredients[i].percent_amount = amounts[i] + redis_amount if not is_unknown[i] else amounts[i]
-        return
+        return [amount + redis_amount if not unknown else amount for amount, unknown in zip(amounts, is_unknown)]
+
+    @staticmethod
+    def calculate_percent_amounts_batch(recipe_ids, amounts, unit_codes):
+        """
+        Columnar variant of calculate_percent_amounts for many recipes at once, with numpy group-wise operations.
+        Gives exactly the percent amounts of calculate_percent_amounts applied to each recipe (with the rows of a
+        recipe in the same order), since both accumulate the per recipe sums in row order. Requires numpy.
+        :param recipe_ids: the recipe of each ingredient row, rows of a recipe do not need to be contiguous
+        :param amounts: the ingredient amount of each row, None, NaN or 0 if unknown
+        :param unit_codes: the UNIT_CODES code of each row's unit, UNITLESS_CODE if there is none (see encode_units)
+        :return: a numpy array of the percent amount of each row
+        """
+        if numpy is None:
+            raise ImportError('calculate_percent_amounts_batch requires numpy')
+        _, groups = numpy.unique(numpy.asarray(recipe_ids), return_inverse=True)
+        groups = groups.ravel()
+        group_count = groups.max() + 1 if len(groups) else 0
+        amounts = numpy.array(amounts, dtype=float)
+        unit_codes = numpy.asarray(unit_codes, dtype=numpy.intp)
+        known_amount = ~numpy.isnan(amounts) & (amounts != 0)
+        has_unit = unit_codes != UNITLESS_CODE
+        is_unknown = ~(known_amount & has_unit)
+        converted = numpy.full(len(amounts), DEFAULT_UNKNOWN_AMOUNT)
+        with_unit = known_amount & has_unit
+        converted[with_unit] = amounts[with_unit] / UNIT_FACTORS[unit_codes[with_unit]]
+        unitless = known_amount & ~has_unit
+        converted[unitless] = amounts[unitless] * DEFAULT_UNITLESS
+        # bincount accumulates the weights of each group in row order, like percent_amounts
+        totals = numpy.bincount(groups, weights=converted, minlength=group_count)
+        percents = converted / totals[groups]
+        clamped = is_unknown & (percents > MAXIMUM_UNKNOWN_PERCENT_AMOUNT)
+        excess = numpy.where(clamped, percents - MAXIMUM_UNKNOWN_PERCENT_AMOUNT, 0.0)
+        redistributed = numpy.bincount(groups, weights=excess, minlength=group_count)
+        unknown_counts = numpy.bincount(groups, weights=is_unknown, minlength=group_count)
+        redistributed = numpy.divide(redistributed, unknown_counts, out=numpy.zeros(group_count),
+                                     where=unknown_counts > 0)
+        percents[clamped] = MAXIMUM_UNKNOWN_PERCENT_AMOUNT
+        return numpy.where(is_unknown, percents, percents + redistributed[groups])
 
     @staticmethod
     def _convert_units(amount, unit):
@@ -68,3 +125,112 @@ CONVERSIONS = {
 }
 
 CONVERSION_LOOKUP = {k: v for k, v in CONVERSIONS['cup'].items()}
+# integer codes of the units for the columnar calculate_percent_amounts_batch
+UNIT_CODES = {unit: code for code, unit in enumerate(sorted(CONVERSION_LOOKUP))}
+UNITLESS_CODE = -1
+UNIT_FACTORS = numpy.array([CONVERSION_LOOKUP[unit] for unit in sorted(CONVERSION_LOOKUP)]) if numpy else None
+
+
+def encode_units(units):
+    """
+    :param units: an iterable of unit names (keys of CONVERSION_LOOKUP or their MEASUREMENT_LOOKUP spellings), or
+    None/'' for unitless amounts
+    :return: a list of UNIT_CODES codes
+    """
+    return [UNIT_CODES[MEASUREMENT_LOOKUP.get(unit, unit)] if unit else UNITLESS_CODE for unit in units]
+
+
+# the mass units, by their exact weight; every other unit is a volume given by CONVERSION_LOOKUP
+GRAMS_PER_UNIT = {
+    'milligram': 0.001,
+    'gram': 1,
+    'kilogram': 1000,
+    'pound': 453.59237,
+}
+MILLILITRES_PER_CUP = CONVERSION_LOOKUP['millilitre']
+# the density (grams per millilitre) that bridges the volume and mass units without an override: a cup weighs
+# CONVERSION_LOOKUP['gram'] grams
+DEFAULT_DENSITY = CONVERSION_LOOKUP['gram'] / MILLILITRES_PER_CUP
+VOLUME = 0
+MASS = 1
+
+
+def _cups_per_unit(unit):
+    if unit in GRAMS_PER_UNIT:
+        return GRAMS_PER_UNIT[unit] / CONVERSION_LOOKUP['gram']
+    return 1 / CONVERSION_LOOKUP[unit]
+
+
+if numpy:
+    _CUPS_PER_UNIT = numpy.array([_cups_per_unit(unit) for unit in sorted(CONVERSION_LOOKUP)])
+    # CONVERSION_MATRIX[from_code, to_code] converts an amount in the UNIT_CODES unit from_code to to_code
+    CONVERSION_MATRIX = _CUPS_PER_UNIT[:, numpy.newaxis] / _CUPS_PER_UNIT[numpy.newaxis, :]
+    UNIT_DIMENSIONS = numpy.array([MASS if unit in GRAMS_PER_UNIT else VOLUME for unit in sorted(CONVERSION_LOOKUP)])
+else:
+    CONVERSION_MATRIX = UNIT_DIMENSIONS = None
+
+
+class UnitConverter:
+    """
+    Converts amounts between any two units with the precomputed CONVERSION_MATRIX, so converting a column of
+    amounts is a gather of the factors and a multiply. Volumes (including the informal units like pinch or can)
+    convert through the cup table CONVERSION_LOOKUP, masses by their exact weight, and volumes and masses through
+    DEFAULT_DENSITY, unless the density of the ingredient is overridden. Requires numpy.
+
+    The percent amounts of AmountPercentConverter keep to CONVERSION_LOOKUP, where a pound is the weight of a cup of
+    water rather than 453.59 grams.
+
+        converter = UnitConverter(densities={'flour': 0.53, 'sugar': 0.85})
+        grams = converter.convert([2, 1, 100], ['cup', 'tbsp', 'gram'], 'gram', ingredients=['flour', 'sugar', 'salt'])
+    """
+
+    def __init__(self, densities=None):
+        """
+        :param densities: a dict of the density in grams per millilitre of ingredients (i.e. the primary of their
+        ParsedIngredient), to convert them between volume and mass
+        """
+        if numpy is None:
+            raise ImportError('UnitConverter requires numpy')
+        self._densities = dict(densities or {})
+
+    @staticmethod
+    def unit_code(unit):
+        """
+        :param unit: a unit name (or spelling in MEASUREMENT_LOOKUP) or UNIT_CODES code
+        :return: its UNIT_CODES code
+        """
+        if isinstance(unit, str):
+            return UNIT_CODES[MEASUREMENT_LOOKUP.get(unit, unit)]
+        return int(unit)
+
+    def convert(self, values, from_units, to_unit, ingredients=None):
+        """
+        :param values: an array (or iterable) of amounts, None or NaN if unknown
+        :param from_units: the unit of each amount, as an array of UNIT_CODES codes (see encode_units) or an iterable
+        of unit names; unitless amounts (None/'' or UNITLESS_CODE) convert to NaN
+        :param to_unit: the unit name or code to convert to
+        :param ingredients: the ingredient of each amount, to look up the density overrides
+        :return: a float numpy array of the amounts in to_unit
+        """
+        values = numpy.array(values, dtype=float)
+        from_codes = numpy.asarray(from_units)
+        if from_codes.dtype.kind not in 'iu':
+            from_codes = numpy.array(encode_units(from_units), dtype=numpy.intp)
+        to_code = self.unit_code(to_unit)
+        has_unit = from_codes != UNITLESS_CODE
+        factors = CONVERSION_MATRIX[numpy.where(has_unit, from_codes, 0), to_code]
+        if ingredients is not None and self._densities:
+            factors = factors * self._density_corrections(from_codes, to_code, ingredients)
+        return numpy.where(has_unit, values * factors, numpy.nan)
+
+    def _density_corrections(self, from_codes, to_code, ingredients):
+        # CONVERSION_MATRIX converts between volumes and masses at DEFAULT_DENSITY
+        ratios = numpy.array([self._densities.get(ingredient, DEFAULT_DENSITY) / DEFAULT_DENSITY
+                              for ingredient in ingredients])
+        from_dimensions = UNIT_DIMENSIONS[numpy.where(from_codes != UNITLESS_CODE, from_codes, 0)]
+        exponents = numpy.zeros(len(ratios))
+        if UNIT_DIMENSIONS[to_code] == MASS:
+            exponents[from_dimensions == VOLUME] = 1
+        else:
+            exponents[from_dimensions == MASS] = -1
+        return ratios ** exponents
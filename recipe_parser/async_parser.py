@@ -0,0 +1,131 @@
+import asyncio
+import multiprocessing
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.parallel_parser import DEFAULT_CHUNK_SIZE
+
+THREAD_EXECUTOR = 'thread'
+PROCESS_EXECUTOR = 'process'
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _parse_lines(grammar, parser_options, lines):
+    # runs in the executor, on the shared parser instance of its thread or process
+    return list(IngredientParser.get_batch_parser(grammar, **parser_options)(lines))
+
+
+def _call_soon(loop, callback):
+    # done callbacks of executor jobs run on the executor's threads
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(callback)
+
+
+class AsyncIngredientParser:
+    """
+    Parses ingredient lines from asyncio code without blocking the event loop. The parsing runs on a thread or
+    process executor, and a semaphore bounds the number of parse jobs (a line, or a chunk of chunk_size lines) in
+    flight across all callers, so a long recipe queues its chunks behind the jobs of other requests instead of
+    taking over the executor. A cancelled coroutine cancels its jobs that have not started yet; the jobs that are
+    already running keep counting against max_concurrency until they finish.
+
+    The thread executor defaults to a single worker: it keeps the loop responsive, while the GIL would serialize
+    more threads anyway. The process executor forks (max_workers) processes that each load their own parser.
+
+        parser = AsyncIngredientParser(executor='process', max_concurrency=16)
+        parsed_ingredient = await parser.parse_async('2 cups of flour')
+        parsed_ingredients = await parser.parse_many_async(recipe['ingredients'])
+    """
+
+    def __init__(self, executor=THREAD_EXECUTOR, max_workers=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 chunk_size=DEFAULT_CHUNK_SIZE, grammar=GRAMMAR, **parser_options):
+        """
+        :param executor: THREAD_EXECUTOR, PROCESS_EXECUTOR or a concurrent.futures.Executor, which is not shut down
+        by close()
+        :param max_workers: the number of threads (default 1) or processes (default the number of cpus)
+        :param max_concurrency: the maximum number of parse jobs submitted to the executor at a time
+        :param chunk_size: the number of lines parsed by a single job of parse_many_async
+        :param grammar: the chunking grammar
+        :param parser_options: options of the parser, see IngredientParser.get_instance
+        """
+        if isinstance(executor, Executor):
+            self._executor = executor
+            self._owns_executor = False
+        elif executor == THREAD_EXECUTOR:
+            self._executor = ThreadPoolExecutor(max_workers or 1)
+            self._owns_executor = True
+        elif executor == PROCESS_EXECUTOR:
+            self._executor = ProcessPoolExecutor(max_workers or multiprocessing.cpu_count())
+            self._owns_executor = True
+        else:
+            raise ValueError('Unknown executor {0}, expected {1}, {2} or an Executor'.format(
+                executor, THREAD_EXECUTOR, PROCESS_EXECUTOR))
+        if max_concurrency < 1:
+            raise ValueError('The maximum concurrency must be positive, got {0}'.format(max_concurrency))
+        self._max_concurrency = max_concurrency
+        self._chunk_size = chunk_size
+        self._grammar = grammar
+        self._parser_options = parser_options
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    def _semaphore(self, loop):
+        # asyncio primitives belong to a single event loop
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphores[loop]
+
+    async def _run(self, lines):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        await semaphore.acquire()
+        try:
+            job = self._executor.submit(_parse_lines, self._grammar, self._parser_options, lines)
+        except BaseException:
+            semaphore.release()
+            raise
+        # the slot is held until the job is done, not until the awaiting coroutine stops waiting for it
+        job.add_done_callback(lambda _: _call_soon(loop, semaphore.release))
+        try:
+            return await asyncio.shield(asyncio.wrap_future(job, loop=loop))
+        except asyncio.CancelledError:
+            # only cancels a job that has not started yet, a running job keeps its slot until it finishes
+            job.cancel()
+            raise
+
+    async def parse_async(self, text):
+        """
+        :param text: an ingredient line
+        :return: the ParsedIngredient, or None
+        """
+        return (await self._run([text]))[0]
+
+    async def parse_many_async(self, lines):
+        """
+        Parses the lines in chunks of chunk_size, which run concurrently up to the max_concurrency of the parser.
+        If one of them fails or the coroutine is cancelled, the chunks that are still pending are cancelled.
+        :param lines: an iterable of ingredient lines
+        :return: a list of ParsedIngredient (or None) in input order
+        """
+        lines = list(lines)
+        tasks = [asyncio.ensure_future(self._run(lines[i:i + self._chunk_size]))
+                 for i in range(0, len(lines), self._chunk_size)]
+        try:
+            parsed_chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # waits for the cancelled tasks to finish, so none is left pending on the loop
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [parsed_ingredient for parsed_chunk in parsed_chunks for parsed_ingredient in parsed_chunk]
@@ -0,0 +1,96 @@
+import re
+from nltk import RegexpParser
+from nltk.chunk.regexp import ChunkRule, ChunkString, tag_pattern2re_pattern
+from nltk.tree import Tree
+
+ROOT_LABEL = 'S'
+CHUNK_REPLACEMENT = r'{\g<chunk>}'
+EMPTY_CHUNK = '{}'
+CHUNK_BRACES = re.compile(r'[{}]')
+
+
+class Chunk(list):
+    """
+    A labeled list of tagged tokens (and nested chunks), the subset of nltk.Tree that the parser uses: label(),
+    iteration, indexing and slicing.
+    """
+    __slots__ = ('_label',)
+
+    def __init__(self, label, children=()):
+        super().__init__(children)
+        self._label = label
+
+    def label(self):
+        return self._label
+
+    def __repr__(self):
+        return 'Chunk({0!r}, {1})'.format(self._label, list.__repr__(self))
+
+    @classmethod
+    def from_tree(cls, tree):
+        return cls(tree.label(), [cls.from_tree(child) if isinstance(child, Tree) else child for child in tree])
+
+
+class CompiledChunker:
+    """
+    Chunks tagged tokens with the rules of a RegexpParser grammar. The tag pattern of every chunk rule is compiled
+    once into a plain regular expression, and each stage rewrites a single '<tag><tag>...' string and then builds
+    its chunks in one pass over the tokens, without the intermediate ChunkString and Tree objects (and their
+    validation) of RegexpParser.parse. The chunks are the same as RegexpParser's: the rules of a stage are applied
+    in grammar order and only chunk tags that are not already chunked.
+    Grammars with rules other than chunk rules (chinks, splits, merges, context) are parsed by RegexpParser and
+    converted to Chunks.
+    """
+
+    def __init__(self, grammar):
+        """
+        :param grammar: a RegexpParser grammar
+        """
+        parser = RegexpParser(grammar, root_label=ROOT_LABEL)
+        self._loop = parser._loop
+        self._stages = []
+        self._fallback = None
+        for stage in parser._stages:
+            if not all(type(rule) is ChunkRule for rule in stage.rules()):
+                self._fallback = parser
+                break
+            self._stages.append((stage._chunk_label, [self._compile_rule(rule) for rule in stage.rules()]))
+
+    @staticmethod
+    def _compile_rule(rule):
+        return re.compile('(?P<chunk>{0}){1}'.format(tag_pattern2re_pattern(rule._pattern),
+                                                     ChunkString.IN_STRIP_PATTERN))
+
+    def parse(self, tagged_tokens):
+        """
+        :param tagged_tokens: a list of (token, tag) tuples
+        :return: a Chunk labeled 'S' of tagged tokens and chunks
+        """
+        if self._fallback is not None:
+            return Chunk.from_tree(self._fallback.parse(Tree(ROOT_LABEL, list(tagged_tokens))))
+        pieces = list(tagged_tokens)
+        if pieces:
+            for _ in range(self._loop):
+                for label, rules in self._stages:
+                    pieces = self._apply_stage(label, rules, pieces)
+        return Chunk(ROOT_LABEL, pieces)
+
+    @staticmethod
+    def _apply_stage(label, rules, pieces):
+        tags = '<' + '><'.join(piece[1] if isinstance(piece, tuple) else piece.label() for piece in pieces) + '>'
+        for rule in rules:
+            tags = rule.sub(CHUNK_REPLACEMENT, tags).replace(EMPTY_CHUNK, '')
+        if '{' not in tags:
+            return pieces
+        chunked = []
+        index = 0
+        in_chunk = False
+        for part in CHUNK_BRACES.split(tags):
+            length = part.count('<')
+            if in_chunk:
+                chunked.append(Chunk(label, pieces[index:index + length]))
+            else:
+                chunked.extend(pieces[index:index + length])
+            index += length
+            in_chunk = not in_chunk
+        return chunked
@@ -0,0 +1,160 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_parser import IngredientParser
+
+DEFAULT_MAX_BATCH_LINES = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+CoalescerStats = namedtuple('CoalescerStats', ['requests', 'lines', 'batches', 'mean_batch_lines',
+                                               'mean_wait_seconds', 'max_wait_seconds'])
+# put on the queue by close()
+_CLOSED = object()
+
+
+class _Request:
+    __slots__ = ('lines', 'future', 'submitted')
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class CoalescingParser:
+    """
+    Coalesces the lines of concurrent parse requests into batches for the batched tokenize/tag/chunk pass of
+    IngredientParser.parse_many. A worker thread takes the first waiting request and keeps adding requests until
+    the batch holds max_batch_lines lines or max_wait_ms have passed since that first request, then parses the
+    batch and resolves the future of each request with its own results. Requests are never split, so a batch can
+    exceed max_batch_lines by the lines of its last request. Larger values trade request latency for throughput;
+    stats() reports the batch sizes and the time requests waited for their batch to start.
+
+    The parser is only used by the worker thread, so any number of threads (or event loops, through
+    asyncio.wrap_future(parser.submit(lines))) can share a CoalescingParser.
+
+        with CoalescingParser(max_batch_lines=128, max_wait_ms=2) as parser:
+            parsed_ingredient = parser.parse(text)
+    """
+
+    def __init__(self, max_batch_lines=DEFAULT_MAX_BATCH_LINES, max_wait_ms=DEFAULT_MAX_WAIT_MS, grammar=GRAMMAR,
+                 **parser_options):
+        """
+        :param max_batch_lines: the number of lines that closes a batch
+        :param max_wait_ms: the time after the first request of a batch that closes it
+        :param grammar: the chunking grammar
+        :param parser_options: options of the parser, see IngredientParser.get_instance
+        """
+        if max_batch_lines < 1:
+            raise ValueError('The maximum batch size must be positive, got {0}'.format(max_batch_lines))
+        self._max_batch_lines = max_batch_lines
+        self._max_wait_seconds = max_wait_ms / 1000
+        self._parse_many = IngredientParser.get_instance(grammar, **parser_options).parse_many
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._request_count = self._line_count = self._batch_count = 0
+        self._wait_seconds = self._max_wait = 0.0
+        self._worker = threading.Thread(target=self._run, name='CoalescingParser', daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Parses the requests that were already submitted and stops the worker thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSED)
+        self._worker.join()
+
+    def submit(self, lines):
+        """
+        :param lines: a list of ingredient lines
+        :return: a concurrent.futures.Future of the list of their ParsedIngredient (or None), which is cancelled
+        without parsing if it is cancelled before its batch starts
+        """
+        request = _Request(list(lines))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('The CoalescingParser is closed')
+            self._queue.put(request)
+        return request.future
+
+    def parse_lines(self, lines):
+        """
+        Blocks until the batch of the lines is parsed.
+        :return: a list of ParsedIngredient (or None) in input order
+        """
+        return self.submit(lines).result()
+
+    def parse(self, text):
+        return self.parse_lines([text])[0]
+
+    def stats(self):
+        """
+        :return: a CoalescerStats of the requests, lines and batches parsed so far, the mean number of lines per
+        batch, and the mean and maximum time from submitting a request to the start of its batch
+        """
+        with self._lock:
+            return CoalescerStats(
+                requests=self._request_count,
+                lines=self._line_count,
+                batches=self._batch_count,
+                mean_batch_lines=self._line_count / self._batch_count if self._batch_count else 0.0,
+                mean_wait_seconds=self._wait_seconds / self._request_count if self._request_count else 0.0,
+                max_wait_seconds=self._max_wait,
+            )
+
+    def _run(self):
+        closed = False
+        while not closed:
+            request = self._queue.get()
+            if request is _CLOSED:
+                break
+            batch = [request]
+            line_count = len(request.lines)
+            deadline = request.submitted + self._max_wait_seconds
+            while line_count < self._max_batch_lines:
+                try:
+                    request = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if request is _CLOSED:
+                    closed = True
+                    break
+                batch.append(request)
+                line_count += len(request.lines)
+            self._parse_batch(batch)
+
+    def _parse_batch(self, batch):
+        start = time.perf_counter()
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        lines = [line for request in batch for line in request.lines]
+        try:
+            parsed_ingredients = list(self._parse_many(lines, batch_size=max(len(lines), 1)))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+        else:
+            offset = 0
+            for request in batch:
+                request.future.set_result(parsed_ingredients[offset:offset + len(request.lines)])
+                offset += len(request.lines)
+        with self._lock:
+            self._request_count += len(batch)
+            self._line_count += len(lines)
+            self._batch_count += 1 if batch else 0
+            for request in batch:
+                wait = start - request.submitted
+                self._wait_seconds += wait
+                self._max_wait = max(self._max_wait, wait)
@@ -0,0 +1,196 @@
+import codecs
+import json
+import os
+from recipe_parser.amount_conversions import AmountPercentConverter
+from recipe_parser.ingredient_parser import IngredientParser
+
+READ_SIZE = 1 << 16
+MAXIMUM_VALUE_SIZE = 1 << 26
+# characters skipped between top level values, so that a JSON array of recipes, JSONL and concatenated JSON
+# objects are all read as the same stream of recipes
+VALUE_SEPARATORS = ' \t\r\n,[]'
+DEFAULT_INGREDIENTS_KEY = 'ingredients'
+DEFAULT_ID_KEY = 'id'
+DEFAULT_RECIPES_PER_BATCH = 64
+DEFAULT_CHECKPOINT_INTERVAL = 1024
+
+
+def iter_json_values(stream, offset=0):
+    """
+    Streams the recipes of a JSON/JSONL file opened in binary mode, holding at most one recipe (plus a read buffer)
+    in memory. The file may contain a single recipe object, a top level array of recipe objects, or one recipe
+    object per line.
+    :param stream: a binary file object
+    :param offset: the byte offset to start reading from, i.e. an offset previously yielded by this function
+    :return: a generator of (value, byte offset after the value) tuples
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+    stream.seek(offset)
+    buffer = ''
+    eof = False
+    while True:
+        stripped = buffer.lstrip(VALUE_SEPARATORS)
+        offset += len(buffer) - len(stripped)  # separators are ascii, one byte each
+        buffer = stripped
+        if buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof or len(buffer) > MAXIMUM_VALUE_SIZE:
+                    raise
+                end = None
+            # a value ending exactly at the end of the buffer may have been cut off by the read
+            if end is not None and (end < len(buffer) or eof):
+                offset += len(buffer[:end].encode('utf-8'))
+                buffer = buffer[end:]
+                yield value, offset
+                continue
+        elif eof:
+            return
+        data = stream.read(READ_SIZE)
+        eof = not data
+        buffer += utf8_decoder.decode(data, final=eof)
+
+
+class IngredientRecord:
+    """
+    A single parsed ingredient line of a recipe. Exposes ingredient_amount and amount_units for
+    AmountPercentConverter, which fills in percent_amount.
+    """
+    ingredient_amount = None
+    amount_units = None
+    percent_amount = None
+
+    def __init__(self, recipe_id, text, parsed_ingredient):
+        self.recipe_id = recipe_id
+        self.text = text
+        self.parsed_ingredient = parsed_ingredient
+        if parsed_ingredient is not None and parsed_ingredient.amount is not None:
+            self.ingredient_amount = parsed_ingredient.amount.value
+            self.amount_units = parsed_ingredient.amount.unit
+
+    def to_dict(self):
+        ingredient = self.parsed_ingredient.ingredient if self.parsed_ingredient else None
+        return dict(
+            recipe=self.recipe_id,
+            text=self.text,
+            primary=ingredient.primary if ingredient else None,
+            modifier=ingredient.modifier if ingredient else None,
+            value=float(self.ingredient_amount) if self.ingredient_amount is not None else None,
+            unit=self.amount_units or None,
+            percent_amount=float(self.percent_amount) if self.percent_amount is not None else None,
+        )
+
+
+class Checkpoint:
+    """
+    Position of an ingestion run: the input file being read, the byte offset after the last written recipe, and
+    the length of the output at that point. Saved atomically so a crash never leaves a partial checkpoint.
+    """
+
+    def __init__(self, inputs, file_index=0, input_offset=0, output_offset=0):
+        self.inputs = list(inputs)
+        self.file_index = file_index
+        self.input_offset = input_offset
+        self.output_offset = output_offset
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.__dict__, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+
+class RecipeIngestor:
+    """
+    Streams recipes from JSON/JSONL files, parses the ingredient lines of each recipe (batched across
+    recipes_per_batch recipes), calculates the percent amounts per recipe and writes one JSON record per ingredient
+    line. Every checkpoint_interval recipes the output is flushed and a Checkpoint is saved, so an interrupted run
+    can be resumed from the last checkpoint.
+    """
+
+    def __init__(self, parse_many=None, ingredients_key=DEFAULT_INGREDIENTS_KEY, id_key=DEFAULT_ID_KEY,
+                 recipes_per_batch=DEFAULT_RECIPES_PER_BATCH, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self._parse_many = parse_many or IngredientParser.get_batch_parser()
+        self._ingredients_key = ingredients_key
+        self._id_key = id_key
+        self._recipes_per_batch = recipes_per_batch
+        self._checkpoint_interval = checkpoint_interval
+        self._converter = AmountPercentConverter()
+
+    def run(self, inputs, output_path, checkpoint_path=None, resume=False):
+        """
+        :param inputs: a list of input file paths
+        :param output_path: path of the JSONL output
+        :param checkpoint_path: path of the checkpoint file, no checkpoints are saved if None
+        :param resume: continue from the checkpoint at checkpoint_path instead of starting over
+        :return: the number of recipes ingested by this call
+        """
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            checkpoint = Checkpoint.load(checkpoint_path)
+            if checkpoint.inputs != list(inputs):
+                raise ValueError('The checkpoint {0} was created for different input files'.format(checkpoint_path))
+            output = open(output_path, 'r+b')
+            output.truncate(checkpoint.output_offset)
+            output.seek(checkpoint.output_offset)
+        else:
+            checkpoint = Checkpoint(inputs)
+            output = open(output_path, 'wb')
+        recipe_count = 0
+        with output:
+            while checkpoint.file_index < len(checkpoint.inputs):
+                with open(checkpoint.inputs[checkpoint.file_index], 'rb') as stream:
+                    recipes = iter_json_values(stream, checkpoint.input_offset)
+                    for batch in self._batches(recipes):
+                        self._write_batch(batch, output)
+                        recipe_count += len(batch)
+                        checkpoint.input_offset = batch[-1][1]
+                        if checkpoint_path and recipe_count % self._checkpoint_interval < len(batch):
+                            self._save_checkpoint(checkpoint, checkpoint_path, output)
+                checkpoint.file_index += 1
+                checkpoint.input_offset = 0
+            if checkpoint_path:
+                self._save_checkpoint(checkpoint, checkpoint_path, output)
+        return recipe_count
+
+    def _batches(self, recipes):
+        batch = []
+        for recipe, offset in recipes:
+            batch.append((recipe, offset))
+            if len(batch) >= self._recipes_per_batch:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _write_batch(self, batch, output):
+        recipe_lines = [self._ingredient_lines(recipe) for recipe, _ in batch]
+        parsed = self._parse_many(line for lines in recipe_lines for line in lines)
+        for (recipe, _), lines in zip(batch, recipe_lines):
+            recipe_id = recipe.get(self._id_key) if isinstance(recipe, dict) else None
+            records = [IngredientRecord(recipe_id, line, parsed_ingredient)
+                       for line, parsed_ingredient in zip(lines, parsed)]
+            parsed_records = [r for r in records if r.parsed_ingredient is not None]
+            if parsed_records:
+                self._converter.calculate_percent_amounts(parsed_records)
+            for record in records:
+                output.write(json.dumps(record.to_dict()).encode('utf-8') + b'\n')
+
+    def _ingredient_lines(self, recipe):
+        lines = recipe.get(self._ingredients_key) if isinstance(recipe, dict) else None
+        return [line for line in lines or [] if isinstance(line, str)]
+
+    @staticmethod
+    def _save_checkpoint(checkpoint, checkpoint_path, output):
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint.output_offset = output.tell()
+        checkpoint.save(checkpoint_path)
@@ -1,45 +1,103 @@
+import logging
 import re
-from nltk import sent_tokenize, RegexpParser
-from nltk.tree import Tree
-from string import punctuation
-from recipe_parser import TAGGER, LEMMATIZER, TOKENIZER, AMOUNT_PATTERN, GRAMMAR, TEXT_TO_NUM_CONVERSION_FUNCTIONS, \
-    MEASUREMENT_LOOKUP
-from recipe_parser.text_to_num import NumberException
+import sys
+import threading
+import time
+from collections import namedtuple
+from functools import partial
+from inspect import signature
+from random import Random
+from nltk import sent_tokenize
+from recipe_parser import TAGGER, LEMMATIZER, TOKENIZER, AMOUNT_PATTERN, NOTE_SEPARATOR_PATTERN, NOTE_PHRASE_PATTERN, \
+    AMOUNT_TRANSLATOR, TEXT_CLEANER, KEY_CLEANER, QUANTITY_PUNCTUATION, GRAMMAR, QUANTITY_RECOGNIZER, \
+    MEASUREMENT_LOOKUP, DEFAULT_POS_BACKEND, LazyInstance, get_tagger, INGREDIENT_TOKENIZER, DEFAULT_TOKENIZER_MODE, \
+    TREEBANK_TOKENIZER_MODE, INGREDIENT_TOKENIZER_MODE, PHRASE_MATCHER
+from recipe_parser.ingredient_tagger import MAIN_INGREDIENT_TAG
+from recipe_parser.chunker import CompiledChunker, Chunk
+from recipe_parser.amount_conversions import AmountPercentConverter
+from recipe_parser.parse_cache import LRUParseCache, SqliteParseCache, MISSING, parse_cache_fingerprint
+from recipe_parser.instrumentation import get_instrumentation, TOKENIZE_STAGE, TAG_STAGE, CHUNK_STAGE, \
+    CONVERT_STAGE, LEMMATIZE_STAGE, LINES_COUNTER, FAILURES_COUNTER, QUANTITY_JOINED_COUNTER, \
+    QUANTITY_TOKENS_COUNTER, QUANTITY_UNRECOGNIZED_COUNTER
 
-AMOUNT_TRANSLATOR = str.maketrans('', '', punctuation)
-punctuation = ''.join(c for c in punctuation if c not in '/()')
-TEXT_CLEANER = str.maketrans('', '', punctuation)
-DEBUG_PRINT = False
+logger = logging.getLogger(__name__)
+DEFAULT_BATCH_SIZE = 256
+# tokens of a cleaned line that every tokenizer mode leaves whole: words, numbers and fractions
+FAST_PATH_TOKEN = re.compile(r'[a-z]+|[0-9]+(?:[./-][0-9]+)*')
+FAST_PATH_INGREDIENT_TAGS = frozenset(['NN', 'NNS', 'JJ', 'MOD'])
+# tags of the NPI tokens that make up the primary ingredient, the others are its modifiers
+PRIMARY_TAGS = frozenset(['NN', 'NNS', 'VBN'])
+NOUN_TAGS = frozenset(['NN', 'NNS'])
+PERCENT_CONVERTER = AmountPercentConverter()
+FastPathInfo = namedtuple('FastPathInfo', ['hits', 'fallbacks', 'shadowed', 'disagreements'])
+# the cleaned texts of a line that are tagged and chunked individually (see IngredientParser._split_line)
+LineSegments = namedtuple('LineSegments', ['amounts', 'ingredient', 'note'])
 
 
-class ParsedValuesMixin:
+class ParsedValue:
     """
-    Mixin to allow the instatiating Ingredient and Amount classes with a dict type
+    Base of the immutable parse result types. The fields are __slots__, so instances have no per instance __dict__,
+    are set once by __init__ and can not be changed after that, which also makes results safe to share through the
+    parse cache. Results compare and hash by their fields, and pickle through __getstate__/__setstate__.
     """
-    def __init__(self, **kwargs):
-        self.__dict__.update(**kwargs)
+    __slots__ = ()
 
+    def __setattr__(self, name, value):
+        raise AttributeError('Can not set {0} of an immutable {1}'.format(name, type(self).__name__))
 
-class Ingredient(ParsedValuesMixin):
-    primary = None
-    modifier = None
+    def __delattr__(self, name):
+        raise AttributeError('Can not delete {0} of an immutable {1}'.format(name, type(self).__name__))
 
+    def _set_fields(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
 
-class Amount(ParsedValuesMixin):
-    value = None
-    unit = None
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
 
+    def __setstate__(self, state):
+        self.__init__(*state)
 
-class ParsedIngredient:
+    def __eq__(self, other):
+        return type(self) is type(other) and self.__getstate__() == other.__getstate__()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.__getstate__())
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+
+class Ingredient(ParsedValue):
+    __slots__ = ('primary', 'modifier')
+
+    def __init__(self, primary=None, modifier=None):
+        self._set_fields(primary, modifier)
+
+
+class Amount(ParsedValue):
+    """
+    The unit is interned, so all amounts (including unpickled ones) share a single string per unit.
+    """
+    __slots__ = ('value', 'unit')
+
+    def __init__(self, value=None, unit=None):
+        self._set_fields(value, sys.intern(unit) if unit else unit)
+
+
+class ParsedIngredient(ParsedValue):
     """
     Class to hold the structure of a parsed ingredient.
     ingredient: An instance of an ingredient
-    amount: An instance of an amount
-    amounts: A list of Amount type if more than one amount was parsed from the result
+    amount: An instance of an amount, the selected one of amounts
+    amounts: A tuple of Amount type if more than one amount was parsed from the result, None for parsers that only
+    keep the selected amount
     """
-    ingredient = None
-    amount = None
-    amounts = None
+    __slots__ = ('ingredient', 'amount', 'amounts')
 
     def __init__(self, *args):
         """
@@ -47,87 +105,460 @@ class ParsedIngredient:
         or a variable number of Amount type
         :param args: a single an ingredient and an Amount (or list of Amounts)
         """
+        ingredient = amount = amounts = None
         for arg in args:
             if isinstance(arg, Ingredient):
-                self.ingredient = arg
+                ingredient = arg
             elif isinstance(arg, Amount):
-                self.amount = arg
-            elif isinstance(arg, list) and len(arg) > 0 and isinstance(arg[0], Amount):
-                self.amounts = arg
+                amount = arg
+            elif isinstance(arg, (list, tuple)) and len(arg) > 0 and isinstance(arg[0], Amount):
+                amounts = tuple(arg)
+        self._set_fields(ingredient, amount or self.select_amount(amounts), amounts)
 
-    def _determine_best_amount(self):
+    def __setstate__(self, state):
+        self._set_fields(*state)
+
+    @staticmethod
+    def select_amount(amounts):
         """
-        Function to choose the most appropriate parsed amount. Sets the internal amount member to this selected value.
-        :return:
+        Function to choose the most appropriate parsed amount.
+        :return: an Amount, or None
         """
         # TODO determine better way to select amount, based on unit parser
-        self.amount = self.amounts[0] if self.amounts else self.amount
+        return amounts[0] if amounts else None
 
     @property
     def parsed_ingredient(self):
         """
-        Returns an instance of itself but ensures an amount and ingredient exists (if possible)
+        Returns an instance of itself, the amount is selected when the instance is created
         :return:
         """
-        if self.amounts and not self.amount:
-            self._determine_best_amount()
         return self
 
 
+class ParsedRecipe(ParsedValue):
+    """
+    The parsed ingredient lines of a recipe, in line order.
+    ingredients: A tuple of ParsedIngredient, None for the lines that could not be parsed
+    percent_amounts: A tuple of the share of each ingredient in the recipe (from its selected amount), None for the
+    lines that could not be parsed
+    """
+    __slots__ = ('ingredients', 'percent_amounts')
+
+    def __init__(self, ingredients=(), percent_amounts=()):
+        self._set_fields(tuple(ingredients), tuple(percent_amounts))
+
+    def __len__(self):
+        return len(self.ingredients)
+
+    def __iter__(self):
+        """
+        :return: an iterator of (ParsedIngredient, percent amount) tuples
+        """
+        return zip(self.ingredients, self.percent_amounts)
+
+
 class IngredientParser:
     """
     A class to parse text into the desired in gredient format. Uses NLTK principles to tag an ingredient and
     extract an ingredient, its modifiers, and the amount. Utilizes the ingredient_tagger (__init__ TAGGER) for
     POS tagging, and creates partitions into the amount and ingredient using a Regexp of POS tags. Returns a
     ParsedIngredient type
+
+    Parsers are thread-safe: the shared instances, taggers, lemmatizer and caches can be used from any number of
+    threads (see ThreadPoolIngredientParser).
     """
     __instances = dict()
+    __instances_lock = threading.Lock()
 
-    def __init__(self, grammar):
-        self._sentence_parser = RegexpParser(grammar)
-        self._pos_tagger = TAGGER
+    def __init__(self, grammar, cache_size=None, cache_path=None, backend=DEFAULT_POS_BACKEND,
+                 tokenizer=DEFAULT_TOKENIZER_MODE, fast_path=False, shadow_rate=0.0, keep_amounts=True):
+        """
+        :param grammar: the chunking grammar
+        :param cache_size: the maximum number of parse results cached in memory, disabled if None
+        :param cache_path: path of a persistent sqlite parse cache, disabled if None
+        :param backend: name of the statistical POS tagger behind the Tagger cascade (see POS_BACKENDS)
+        :param tokenizer: TREEBANK_TOKENIZER_MODE for punkt sentence splitting and TOKENIZER, or
+        INGREDIENT_TOKENIZER_MODE for the single pass INGREDIENT_TOKENIZER
+        :param fast_path: parse lines of the '<amount> <unit> <ingredient>' shape without tokenizing, tagging and
+        chunking them with NLTK (see _fast_parse), only available with the default GRAMMAR
+        :param shadow_rate: the fraction of fast path lines that are also parsed by the NLTK path, counting the
+        disagreements in fast_path_info()
+        :param keep_amounts: keep all parsed amounts in ParsedIngredient.amounts, or only the selected amount
+        """
+        if tokenizer not in (TREEBANK_TOKENIZER_MODE, INGREDIENT_TOKENIZER_MODE):
+            raise ValueError('Unknown tokenizer mode {0}'.format(tokenizer))
+        if fast_path and grammar != self._clean_grammar(GRAMMAR):
+            raise ValueError('The fast path is only available with the default GRAMMAR')
+        self._sentence_parser = CompiledChunker(grammar)
+        self._pos_tagger = TAGGER if backend == DEFAULT_POS_BACKEND else LazyInstance(partial(get_tagger, backend))
+        self._split_sentences = tokenizer == TREEBANK_TOKENIZER_MODE
+        self._fast_path = fast_path
+        self._shadow_rate = shadow_rate
+        self._keep_amounts = keep_amounts
+        self._random = Random()
+        self._fast_path_lock = threading.Lock()
+        self._fast_path_hits = self._fast_path_fallbacks = 0
+        self._fast_path_shadowed = self._fast_path_disagreements = 0
+        fingerprint = parse_cache_fingerprint(grammar, backend, tokenizer, fast_path, keep_amounts)
+        self._cache = self._create_cache(fingerprint, cache_size, cache_path)
+
+    @staticmethod
+    def _create_cache(fingerprint, cache_size, cache_path):
+        cache = SqliteParseCache(cache_path, fingerprint) if cache_path else None
+        if cache_size:
+            cache = LRUParseCache(cache_size, backend=cache)
+        return cache
 
     @classmethod
-    def _create_grammar(cls, clean_grammar):
-        if clean_grammar not in cls.__instances:
-            cls.__instances[clean_grammar] = cls(grammar=clean_grammar)
+    def _create_grammar(cls, clean_grammar, **options):
+        arguments = signature(cls).bind(clean_grammar, **options)
+        arguments.apply_defaults()
+        key = tuple(arguments.arguments.items())
+        with cls.__instances_lock:
+            if key not in cls.__instances:
+                cls.__instances[key] = cls(clean_grammar, **options)
+            return cls.__instances[key]
 
     @classmethod
-    def get_parser(cls, grammar=GRAMMAR):
-        clean_grammar = cls._clean_grammar(grammar)
-        cls._create_grammar(clean_grammar)
-        return cls.__instances[clean_grammar].parse
+    def get_instance(cls, grammar=GRAMMAR, **options):
+        """
+        Returns the shared parser instance for the grammar and options.
+        :param grammar: the chunking grammar
+        :param options: keyword arguments of IngredientParser.__init__, i.e. cache_size, cache_path, backend,
+        tokenizer, fast_path, shadow_rate or keep_amounts
+        :return: an IngredientParser
+        """
+        return cls._create_grammar(cls._clean_grammar(grammar), **options)
 
-    def _parse_sentence_tree(self, text):
-        tagged_sentences = [self._pos_tagger.tag(s) for s in [TOKENIZER(ss) for ss in sent_tokenize(text)]]
-        try:
-            return self._sentence_parser.parse(tagged_sentences[0])
-        except IndexError:
+    @classmethod
+    def get_parser(cls, grammar=GRAMMAR, **options):
+        """
+        Returns the parse function of the shared parser instance (see get_instance for the options). If a
+        cache_size and/or cache_path is given, results are memoized keyed on the normalized text (in memory and/or
+        in a sqlite database that is shared across runs and processes). Results are immutable, so they are safe to
+        share between callers.
+        """
+        return cls.get_instance(grammar, **options).parse
+
+    @classmethod
+    def get_batch_parser(cls, grammar=GRAMMAR, **options):
+        """
+        Batch variant of get_parser. The returned function accepts an iterable of ingredient lines and yields
+        a ParsedIngredient (or None) for each line in input order.
+        """
+        return cls.get_instance(grammar, **options).parse_many
+
+    @classmethod
+    def get_recipe_parser(cls, grammar=GRAMMAR, **options):
+        """
+        Returns the parse_recipe function of the shared parser instance (see get_instance for the options).
+        """
+        return cls.get_instance(grammar, **options).parse_recipe
+
+    def cache_info(self):
+        """
+        :return: a CacheInfo of the hits, misses and evictions of the parse cache, or None if caching is disabled
+        """
+        return self._cache.info() if self._cache is not None else None
+
+    def fast_path_info(self):
+        """
+        :return: a FastPathInfo of the lines parsed by the fast path (hits), the lines it left to the NLTK path
+        (fallbacks), and the hits that were also parsed by the NLTK path (shadowed) with a different result
+        (disagreements)
+        """
+        with self._fast_path_lock:
+            return FastPathInfo(self._fast_path_hits, self._fast_path_fallbacks, self._fast_path_shadowed,
+                                self._fast_path_disagreements)
+
+    def _tokenize(self, text):
+        if self._split_sentences:
+            sentences = sent_tokenize(text)
+            tokens = TOKENIZER(sentences[0]) if sentences else None
+        else:
+            tokens = INGREDIENT_TOKENIZER(text)
+        if not tokens:
             raise BadIngredientException("Could not parse a sentence using the grammar rules for the ingredient: {0}"
                                          .format(text))
+        return PHRASE_MATCHER.merge(tokens)
+
+    def _parse_sentence_tree(self, text):
+        instrumentation = get_instrumentation()
+        if not instrumentation.enabled:
+            return self._sentence_parser.parse(self._pos_tagger.tag(self._tokenize(text)))
+        start = time.perf_counter()
+        tokens = self._tokenize(text)
+        tokenized = time.perf_counter()
+        tagged_tokens = self._pos_tagger.tag(tokens)
+        tagged = time.perf_counter()
+        sentence_tree = self._sentence_parser.parse(tagged_tokens)
+        instrumentation.observe(TOKENIZE_STAGE, tokenized - start)
+        instrumentation.observe(TAG_STAGE, tagged - tokenized)
+        instrumentation.observe(CHUNK_STAGE, time.perf_counter() - tagged)
+        return sentence_tree
 
     @staticmethod
     def _clean_grammar(grammar):
         return grammar.strip()
 
+    @staticmethod
+    def _normalize(text):
+        """
+        The text that is actually parsed (and the parse cache key): lowercased, without the punctuation removed by
+        KEY_CLEANER. Parsing the normalized text gives the same result as parsing the original text.
+        """
+        return IngredientParser._clean(text.lower(), KEY_CLEANER)
+
+    @staticmethod
+    def _clean(text, translator):
+        """
+        Translates the text (i.e. removes punctuation) except for the QUANTITY_PUNCTUATION between digits.
+        """
+        parts = QUANTITY_PUNCTUATION.split(text)
+        parts[::2] = [part.translate(translator) for part in parts[::2]]
+        return ''.join(parts)
+
+    @staticmethod
+    def _split_line(text):
+        """
+        Splits a line once into the segments that are tagged and chunked individually, after dropping the
+        NOTE_PHRASE_PATTERN phrases: the parentheticals, which only give amounts, the ingredient text without them,
+        and the trailing note after the first NOTE_SEPARATOR_PATTERN (i.e. ', chopped'), if any. Without any text
+        outside of the parentheticals, their text is the ingredient text instead.
+        :return: a LineSegments of the cleaned texts, the note is None for lines without one
+        """
+        text = NOTE_PHRASE_PATTERN.sub(' ', text.lower())
+        amounts = [IngredientParser._clean(i, AMOUNT_TRANSLATOR) for i in AMOUNT_PATTERN.findall(text)]
+        ingredient, note = (NOTE_SEPARATOR_PATTERN.split(AMOUNT_PATTERN.sub(' ', text), 1) + [''])[:2]
+        note = IngredientParser._clean(note, TEXT_CLEANER).strip()
+        ingredient = IngredientParser._clean(ingredient, TEXT_CLEANER)
+        amounts = [amount for amount in amounts if amount.strip()]
+        if not ingredient.strip():
+            ingredient, note = note, ''
+        if not ingredient.strip():
+            # a line of only parentheticals (i.e. '(1 cup)') is parsed from their text
+            ingredient, amounts = ' '.join(amounts), []
+        return LineSegments(amounts, ingredient, note or None)
+
+    @staticmethod
+    def _segment_texts(segments):
+        """
+        :return: the texts of the LineSegments in tagging order: amounts, ingredient and note
+        """
+        return segments.amounts + [segments.ingredient] + ([segments.note] if segments.note else [])
+
     def parse(self, text):
-        text = text.lower()
-        amount_data = [tree[0] if tree.label() == 'S' else tree for tree in
-                       [self._parse_sentence_tree(i.translate(AMOUNT_TRANSLATOR)) for i in AMOUNT_PATTERN.findall(text)]
-                       ]
-        re.sub(AMOUNT_PATTERN, '', text)
+        if self._cache is None:
+            parsed_ingredient = self._parse(text)
+        else:
+            key = self._normalize(text)
+            parsed_ingredient = self._cache.get(key)
+            if parsed_ingredient is MISSING:
+                parsed_ingredient = self._parse(key)
+                self._cache.put(key, parsed_ingredient)
+        instrumentation = get_instrumentation()
+        if instrumentation.enabled:
+            instrumentation.increment(LINES_COUNTER)
+            if parsed_ingredient is None:
+                instrumentation.increment(FAILURES_COUNTER)
+        return parsed_ingredient
+
+    def _parse(self, text):
+        if self._fast_path:
+            parsed_ingredient = self._fast_parse(text)
+            if parsed_ingredient is not MISSING:
+                return parsed_ingredient
+        return self._parse_segments(text)
+
+    def _parse_segments(self, text):
+        segments = self._split_line(text)
         try:
-            sentence_tree = self._parse_sentence_tree(text.translate(TEXT_CLEANER))
+            trees = [self._parse_sentence_tree(segment) for segment in self._segment_texts(segments)]
         except BadIngredientException:
-            # TODO logger here?!
+            logger.debug('Could not parse %r', text)
             return None
-        if DEBUG_PRINT:
-            print(sentence_tree)
-        amount_data.extend([i for i in sentence_tree if isinstance(i, Tree) and i.label() == 'Amount'])
-        return ParsedIngredient(
-            self._find_ingredient(sentence_tree),
-            self._find_amounts(amount_data)
-        ).parsed_ingredient
+        return self._build_from_trees(segments, trees)
+
+    def parse_many(self, lines, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Parses an iterable of ingredient lines. Lines are tokenized in batches of batch_size and each batch is
+        tagged with a single tag_sents call before chunking. Lines that can not be parsed are yielded as None.
+        :param lines: an iterable of ingredient text
+        :param batch_size: the number of lines tagged together
+        :return: a generator of ParsedIngredient (or None) in input order
+        """
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield from self._parse_batch(batch)
+                batch = []
+        if batch:
+            yield from self._parse_batch(batch)
+
+    def parse_recipe(self, lines):
+        """
+        Parses the ingredient lines of a recipe in a single batch and calculates the percent amounts of the parsed
+        lines from their selected amounts, as AmountPercentConverter.calculate_percent_amounts does.
+        :param lines: an iterable of the ingredient lines of a recipe
+        :return: a ParsedRecipe
+        """
+        lines = list(lines)
+        parsed_ingredients = list(self._parse_batch(lines)) if lines else []
+        amounts = [parsed_ingredient.amount for parsed_ingredient in parsed_ingredients
+                   if parsed_ingredient is not None]
+        percent_amounts = iter(PERCENT_CONVERTER.percent_amounts(
+            [amount.value if amount else None for amount in amounts],
+            [amount.unit if amount else None for amount in amounts]) if amounts else [])
+        return ParsedRecipe(parsed_ingredients, [next(percent_amounts) if parsed_ingredient is not None else None
+                                                 for parsed_ingredient in parsed_ingredients])
+
+    def _parse_batch(self, lines):
+        parsed_ingredients = self._parse_cached_batch(lines)
+        instrumentation = get_instrumentation()
+        if instrumentation.enabled:
+            parsed_ingredients = list(parsed_ingredients)
+            instrumentation.increment(LINES_COUNTER, len(parsed_ingredients))
+            instrumentation.increment(FAILURES_COUNTER, parsed_ingredients.count(None))
+        return parsed_ingredients
+
+    def _parse_cached_batch(self, lines):
+        if self._cache is None:
+            return self._parse_uncached_batch(lines)
+        keys = [self._normalize(line) for line in lines]
+        parsed = {}
+        misses = []
+        for key in keys:
+            if key not in parsed:
+                parsed[key] = self._cache.get(key)
+                if parsed[key] is MISSING:
+                    misses.append(key)
+        for key, parsed_ingredient in zip(misses, self._parse_uncached_batch(misses)):
+            parsed[key] = parsed_ingredient
+        self._cache.put_many((key, parsed[key]) for key in misses)
+        return [parsed[key] for key in keys]
+
+    def _parse_uncached_batch(self, lines):
+        instrumentation = get_instrumentation()
+        clock = time.perf_counter if instrumentation.enabled else _no_clock
+        tokenized_lines = []
+        sentences = []
+        tokenize_seconds = 0.0
+        tokenize_count = tag_count = 0
+        for line in lines:
+            parsed_ingredient = self._fast_parse(line) if self._fast_path else MISSING
+            if parsed_ingredient is not MISSING:
+                tokenized_lines.append(parsed_ingredient)
+                continue
+            start = clock()
+            segments = self._split_line(line)
+            try:
+                tokens = [self._tokenize(segment) for segment in self._segment_texts(segments)]
+            except BadIngredientException:
+                tokens = None
+            else:
+                sentences.extend(tokens)
+                tag_count += 1
+            tokenized_lines.append((segments, tokens) if tokens is not None else None)
+            tokenize_seconds += clock() - start
+            tokenize_count += 1
+        start = clock()
+        tagged_sentences = iter(self._pos_tagger.tag_sents(sentences))
+        if instrumentation.enabled:
+            # the batch is tokenized and tagged as a whole, so each stage is observed once for its lines
+            if tokenize_count:
+                instrumentation.observe(TOKENIZE_STAGE, tokenize_seconds, tokenize_count)
+            if tag_count:
+                instrumentation.observe(TAG_STAGE, clock() - start, tag_count)
+        for tokenized_line in tokenized_lines:
+            if not isinstance(tokenized_line, tuple):
+                yield tokenized_line  # parsed by the fast path, or None
+                continue
+            segments, tokens = tokenized_line
+            start = clock()
+            trees = [self._sentence_parser.parse(next(tagged_sentences)) for _ in tokens]
+            if instrumentation.enabled:
+                instrumentation.observe(CHUNK_STAGE, clock() - start)
+            yield self._build_from_trees(segments, trees)
+
+    def _fast_parse(self, text):
+        """
+        Parses a line of the '<CD>+ <MM> <ingredient tokens>' shape directly, where every token is tagged by the
+        vocabularies and regexps of the fused tagger, except for a final word that is tagged as the main ingredient
+        noun instead of by the statistical tagger, and every ingredient token has a tag of the first NPI rule. For
+        those lines GRAMMAR always chunks the numbers and unit as the Amount and the remaining tokens as a single
+        NPI, so the chunks are built here and the amount and ingredient are extracted as on the NLTK path. Lines
+        with parentheticals or any other token shape are left to the NLTK path.
+        :return: a ParsedIngredient, or MISSING if the line does not have the fast path shape
+        """
+        segments = self._split_line(text)
+        tokens = segments.ingredient.split() if not segments.amounts and segments.note is None else None
+        if not tokens or not all(FAST_PATH_TOKEN.fullmatch(token) for token in tokens):
+            return self._fast_path_fallback()
+        tokens = PHRASE_MATCHER.merge(tokens)
+        tags = []
+        for index in range(len(tokens)):
+            tag = self._pos_tagger.static_tag(tokens, index)
+            if tag is None:
+                # the ingredient noun that ends the line is the one token left to the statistical tagger
+                if index < len(tokens) - 1 or not tokens[index].isalpha():
+                    return self._fast_path_fallback()
+                tag = MAIN_INGREDIENT_TAG
+            tags.append(tag)
+        unit_index = next((i for i, tag in enumerate(tags) if tag != 'CD'), len(tags))
+        if unit_index == 0 or unit_index >= len(tags) - 1 or tags[unit_index] != 'MM' or \
+                not all(tag in FAST_PATH_INGREDIENT_TAGS or tag.startswith('VB') for tag in tags[unit_index + 1:]):
+            return self._fast_path_fallback()
+        tagged = list(zip(tokens, tags))
+        sentence_tree = Chunk('S', [Chunk('Amount', tagged[:unit_index + 1]), Chunk('NPI', tagged[unit_index + 1:])])
+        parsed_ingredient = self._build_parsed_ingredient([], sentence_tree)
+        shadowed = bool(self._shadow_rate) and self._random.random() < self._shadow_rate
+        expected = self._parse_segments(text) if shadowed else parsed_ingredient
+        disagrees = shadowed and expected != parsed_ingredient
+        with self._fast_path_lock:
+            self._fast_path_hits += 1
+            self._fast_path_shadowed += shadowed
+            self._fast_path_disagreements += disagrees
+        if disagrees:
+            logger.debug('Fast path disagreement on %r: %r, expected %r', text, parsed_ingredient, expected)
+        return expected
+
+    def _fast_path_fallback(self):
+        with self._fast_path_lock:
+            self._fast_path_fallbacks += 1
+        return MISSING
+
+    def _build_from_trees(self, segments, trees):
+        """
+        :param segments: the LineSegments of a line
+        :param trees: the chunked trees of its _segment_texts
+        """
+        amount_count = len(segments.amounts)
+        note_tree = trees[amount_count + 1] if segments.note else None
+        return self._build_parsed_ingredient(trees[:amount_count], trees[amount_count], note_tree)
+
+    def _build_parsed_ingredient(self, amount_trees, sentence_tree, note_tree=None):
+        """
+        The amounts are those of the parentheticals, the ingredient text and the note, in that order. The
+        ingredient is made of the last NPI chunk of the ingredient text and the NPI chunks of the note.
+        """
+        logger.debug('%s %s', sentence_tree, note_tree)
+        instrumentation = get_instrumentation()
+        clock = time.perf_counter if instrumentation.enabled else _no_clock
+        start = clock()
+        amount_data = [i for tree in amount_trees + [sentence_tree] + ([note_tree] if note_tree else [])
+                       for i in tree if isinstance(i, Chunk) and i.label() == 'Amount']
+        amounts = self._find_amounts(amount_data)
+        converted = clock()
+        ingredient = self._find_ingredient(sentence_tree, note_tree)
+        if instrumentation.enabled:
+            instrumentation.observe(CONVERT_STAGE, converted - start)
+            instrumentation.observe(LEMMATIZE_STAGE, clock() - converted)
+        if not self._keep_amounts:
+            # only the selected amount, so that the result does not hold the other amounts
+            return ParsedIngredient(ingredient, ParsedIngredient.select_amount(amounts))
+        return ParsedIngredient(ingredient, amounts)
 
     def _find_amounts(self, sentence_tree):
         amounts = []  # find list of CD tags to evaluate
@@ -145,37 +576,51 @@ class IngredientParser:
 
     @staticmethod
     def _convert_from_text(amount_tree):
-        values = []
-        for a in amount_tree:
-            if len(a) < 2:
-                continue
-            if a[1] == 'CD':
-                for func in TEXT_TO_NUM_CONVERSION_FUNCTIONS:
-                    try:
-                        value = func(a)
-                        if not value:
-                            raise ValueError()
-                        values.append(value)
-                        break
-                    except (ValueError, NumberException):
-                        pass
-        return sum(values)
+        """
+        The value of an Amount chunk: the quantity of its CD tokens read together (i.e. '1 1/2', 'one half', or the
+        low end of '2-3'), else the sum of the quantities of the CD tokens read one by one.
+        """
+        numbers = [a[0] for a in amount_tree if len(a) == 2 and a[1] == 'CD']
+        instrumentation = get_instrumentation()
+        quantity = QUANTITY_RECOGNIZER(' '.join(numbers))
+        if quantity is not None:
+            if instrumentation.enabled:
+                instrumentation.increment(QUANTITY_JOINED_COUNTER)
+            return quantity.low
+        quantities = [quantity for quantity in map(QUANTITY_RECOGNIZER, numbers) if quantity is not None]
+        if instrumentation.enabled:
+            instrumentation.increment(QUANTITY_TOKENS_COUNTER if quantities else QUANTITY_UNRECOGNIZED_COUNTER)
+        return sum(quantity.low for quantity in quantities)
 
     @staticmethod
-    def _find_ingredient(sentence_tree):
-        for item in sentence_tree[::-1]:
-            if isinstance(item, Tree) and item.label() == 'NPI':
-                primary = ' '.join(LEMMATIZER.lemmatize(i[0]) for i in item
-                                   if len(i) == 2 and i[1] in ['NN', 'NNS', 'VBN'] and i[0] != ' ')
-                modifiers = ' '.join(LEMMATIZER.lemmatize(i[0]) for i in item
-                                     if len(i) == 2 and i[1] not in ['NN', 'NNS', 'VBN'] and i[0] != ' ')
-                return Ingredient(
-                    **dict(
-                        primary=primary,
-                        modifier=modifiers,
-                    )
-                )
-        return None
+    def _find_ingredient(sentence_tree, note_tree=None):
+        """
+        The ingredient is the last NPI chunk of the ingredient text, unless it has no noun and one of the NPI chunks
+        of the note does (i.e. 'skinless, boneless chicken breasts'). The other chunks only add modifiers, and those
+        with a noun are left out since they name other ingredients (i.e. 'salt, pepper and garlic powder').
+        """
+        chunks = [item for item in sentence_tree if isinstance(item, Chunk) and item.label() == 'NPI'][-1:]
+        if note_tree is not None:
+            chunks.extend(item for item in note_tree if isinstance(item, Chunk) and item.label() == 'NPI')
+        if not chunks:
+            return None
+        has_noun = [any(len(i) == 2 and i[1] in NOUN_TAGS for i in item) for item in chunks]
+        ingredient_index = has_noun.index(True) if True in has_noun else 0
+        # a single pass over the chunks, each token is lemmatized once
+        primary = []
+        modifiers = []
+        for index, item in enumerate(chunks):
+            if index != ingredient_index and has_noun[index]:
+                continue
+            for i in item:
+                if len(i) == 2 and i[0] != ' ':
+                    is_primary = index == ingredient_index and i[1] in PRIMARY_TAGS
+                    (primary if is_primary else modifiers).append(LEMMATIZER.lemmatize(i[0]))
+        return Ingredient(primary=' '.join(primary), modifier=' '.join(modifiers))
+
+
+def _no_clock():
+    return 0.0
 
 
 class BadIngredientException(Exception):
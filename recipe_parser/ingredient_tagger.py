@@ -1,11 +1,22 @@
 import nltk
+import re
+import threading
 from abc import ABCMeta, abstractclassmethod
-from nltk.tag import SequentialBackoffTagger
+from nltk.tag import SequentialBackoffTagger, TaggerI
+from recipe_parser.instrumentation import get_instrumentation, FALLBACK_TOKENS_COUNTER
+from recipe_parser.tagger_data import MEASUREMENTS, MEASUREMENT_LOOKUP, NUMERICAL, MAIN_INGREDIENTS, \
+    BIGRAM_INGREDIENTS, DEFAULT_POS_BACKEND
 
 MEASUREMENT_TAG = 'MM'
 FRACTION_TAG = 'CD'
 KEY_MODIFIERS = ['.', 's']
 MAIN_INGREDIENT_TAG = 'NN'
+# guards the creation of the shared taggers, so concurrent first uses create (and load the models of) each only once
+TAGGER_LOCK = threading.RLock()
+# kinds of taggers that the FusedTagger can merge, set on Tagger subclasses as FUSED_LAYER
+UNIGRAM_LAYER = 'unigram'
+REGEXP_LAYER = 'regexp'
+LOOKAHEAD_LAYER = 'lookahead'
 
 
 class Tagger:
@@ -13,10 +24,12 @@ class Tagger:
     General abstract class allowing for class wrappers around taggers. The __tagger attribute is used to create and
     initialize the tagger to ensure setup only occurs once on package import. _create_tagger initializes the tagger,
     and get_tagger returns an instance of the tagger. Note that the precedence value allows for the sub classes taggers
-    to be applied in the precedence order in __init__ via __subclasses__() ordered by PRECEDENCE.
+    to be applied in the precedence order in __init__ via __subclasses__() ordered by PRECEDENCE. Taggers with a
+    FUSED_LAYER also provide their model through _create_model so that the FusedTagger can merge them.
     """
     __metaclass__ = ABCMeta
     PRECEDENCE = None
+    FUSED_LAYER = None
     __tagger = None
 
     @abstractclassmethod
@@ -30,27 +43,57 @@ class Tagger:
         raise NotImplementedError()
 
     @abstractclassmethod
-    def _create_tagger(cls):
+    def _create_tagger(cls, backoff=None):
+        """
+        Creates a new instance of the tagger, with the given backoff tagger.
+        """
         raise NotImplementedError()
 
 
 class DefaultTagger(Tagger):
     """
     Default tagger defaults to nltk treebank tagger for all other tags. Loads from pickle that (I think) comes from
-    NLTK download. Need to add this to the documentation.
+    NLTK download. Need to add this to the documentation. The statistical tagger is selected by name from
+    POS_BACKENDS (see register_pos_backend), the maxent treebank tagger by default.
     """
     __tagger = None
     PRECEDENCE = 6
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
-    def _create_tagger(cls, backoff=None):
-        cls.__tagger = nltk.data.load('taggers/maxent_treebank_pos_tagger/english.pickle')
+    def _create_tagger(cls, backoff=None, backend=DEFAULT_POS_BACKEND):
+        try:
+            tagger = POS_BACKENDS[backend]()
+        except KeyError:
+            raise ValueError('Unknown POS backend {0}, expected one of {1}'.format(backend, sorted(POS_BACKENDS)))
+        if not isinstance(tagger, SequentialBackoffTagger):
+            tagger = cls.SentenceTagger(tagger)
+        return tagger
+
+    class SentenceTagger(SequentialBackoffTagger):
+        """
+        Adapts a tagger that tags whole sentences (i.e. the averaged perceptron tagger) to the backoff chain. The
+        sentence is tagged once, when its first token reaches this tagger, and the tags are reused for its other
+        tokens. The last sentence is remembered per thread, since the tagger is shared by all threads.
+        """
+
+        def __init__(self, tagger):
+            self._tagger = tagger
+            self._sentence = threading.local()
+            SequentialBackoffTagger.__init__(self, None)
+
+        def choose_tag(self, tokens, index, history):
+            sentence = self._sentence
+            if getattr(sentence, 'tokens', None) is not tokens:
+                sentence.tags = [tag for _, tag in self._tagger.tag(tokens)]
+                sentence.tokens = tokens
+            return sentence.tags[index]
 
 
 class NumericalTagger(Tagger):
@@ -60,19 +103,25 @@ class NumericalTagger(Tagger):
     """
     __tagger = None
     PRECEDENCE = 5
+    FUSED_LAYER = UNIGRAM_LAYER
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
     def _create_tagger(cls, backoff=None):
+        return nltk.tag.UnigramTagger(model=cls._create_model(), backoff=backoff)
+
+    @classmethod
+    def _create_model(cls):
         model = {}
         for fraction in NUMERICAL:
             model[fraction] = FRACTION_TAG
-        cls.__tagger = nltk.tag.UnigramTagger(model=model, backoff=backoff)
+        return model
 
 
 class IngredientRegexpTagger(Tagger):
@@ -83,6 +132,7 @@ class IngredientRegexpTagger(Tagger):
     """
     __tagger = None
     PRECEDENCE = 4
+    FUSED_LAYER = REGEXP_LAYER
     patterns = [
         (r'.*ing$', 'VB'),
         (r'.*ed', 'MOD'),
@@ -92,13 +142,18 @@ class IngredientRegexpTagger(Tagger):
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
     def _create_tagger(cls, backoff=None):
-        cls.__tagger = nltk.tag.RegexpTagger(cls.patterns, backoff=backoff)
+        return nltk.tag.RegexpTagger(cls._create_model(), backoff=backoff)
+
+    @classmethod
+    def _create_model(cls):
+        return list(cls.patterns)
 
 
 class MainIngredientTagger(Tagger):
@@ -107,19 +162,25 @@ class MainIngredientTagger(Tagger):
     """
     __tagger = None
     PRECEDENCE = 3
+    FUSED_LAYER = UNIGRAM_LAYER
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
     def _create_tagger(cls, backoff=None):
+        return nltk.tag.UnigramTagger(model=cls._create_model(), backoff=backoff)
+
+    @classmethod
+    def _create_model(cls):
         model = {}
         for ingredient in MAIN_INGREDIENTS:
             model[ingredient] = MAIN_INGREDIENT_TAG
-        cls.__tagger = nltk.tag.UnigramTagger(model=model, backoff=backoff)
+        return model
 
 
 class BigramIngredientTagger(Tagger):
@@ -130,19 +191,25 @@ class BigramIngredientTagger(Tagger):
     """
     __tagger = None
     PRECEDENCE = 2
+    FUSED_LAYER = LOOKAHEAD_LAYER
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
     def _create_tagger(cls, backoff=None):
+        return cls.BigramTagger(cls._create_model(), backoff=backoff)
+
+    @classmethod
+    def _create_model(cls):
         model = set()
         for word in BIGRAM_INGREDIENTS:
             model.add(word)
-        cls.__tagger = cls.BigramTagger(model, backoff=backoff)
+        return model
 
     class BigramTagger(SequentialBackoffTagger):
         """
@@ -170,19 +237,25 @@ class MeasurementTagger(Tagger):
     """
     __tagger = None
     PRECEDENCE = 1
+    FUSED_LAYER = UNIGRAM_LAYER
 
     @classmethod
     def get_tagger(cls, backoff=None):
-        if not cls.__tagger:
-            cls._create_tagger(backoff=backoff)
+        with TAGGER_LOCK:
+            if not cls.__tagger:
+                cls.__tagger = cls._create_tagger(backoff=backoff)
         return cls.__tagger
 
     @classmethod
     def _create_tagger(cls, backoff=None):
+        return nltk.tag.UnigramTagger(model=cls._create_model(), backoff=backoff)
+
+    @classmethod
+    def _create_model(cls):
         model = {}
         for key, item_list in MEASUREMENTS.items():
             cls._add_modified_key_to_dict(model, item_list + [key])
-        cls.__tagger = nltk.tag.UnigramTagger(model=model, backoff=backoff)
+        return model
 
     @staticmethod
     def _add_modified_key_to_dict(model, item_list, key_modifiers=KEY_MODIFIERS):
@@ -192,153 +265,120 @@ class MeasurementTagger(Tagger):
                 model[item+m] = MEASUREMENT_TAG
 
 
-MEASUREMENTS = {
-    'gill': [
-        'gill',
-    ],
-    'ounce': [
-        'fluid ounce',
-        'ounce',
-        'oz',
-    ],
-    'tablespoon': [
-        'T',
-        'tbl',
-        'tb',
-        'tbs',
-        'tbsp',
-    ],
-    'teaspoon': [
-        't',
-        'tsp',
-    ],
-    'cup': [
-        'c',
-    ],
-    'pint': [
-        'p',
-        'pt',
-        'fl pt',
-        'fluid pint',
-    ],
-    'quart': [
-        'q',
-        'qt',
-        'fl qt',
-        'fluid quart',
-    ],
-    'gallon': [
-        'g',
-        'gal'
-    ],
-    'millilitre': [
-        'milliliter',
-        'ml',
-        'cc',
-    ],
-    'litre': [
-        'liter',
-        'l'
-    ],
-    'decilitre': [
-        'dl',
-        'deciliter',
-    ],
-    'pound': [
-        'lb',
-        '#',
-    ],
-    'milligram': [
-        'milligramme',
-        'mg',
-    ],
-    'gram': [
-        'g',
-        'gramme',
-    ],
-    'kilogram': [
-        'kilogramme',
-        'kg',
-    ],
-    'pinch': [
-        'pinches',
-    ],
-    'dash': [
-        'dashes',
-        'dash'
-    ],
-    'touch': [
-        'touches',
-        'touche'
-    ],
-    'handful': [
-    ],
-    'taste': [
-    ],
-    'can': [
-    ],
-    'stick': [
-    ],
-    'a': [
-        'an',
-        'single',
-        'couple',
-    ]
-}
+class FusedTagger(TaggerI):
+    """
+    Tagger equivalent to the cascade of Tagger sub classes, built from the same PRECEDENCE ordering. The unigram
+    models and regexp rules of the fusable taggers are merged into a single lexicon and a single combined regexp
+    (one named group per rule), so a token costs a dict lookup and at most one regexp match instead of a Python
+    call per tagger. Lexicon entries and regexp groups hold the tag decided before the (single) bigram lookahead
+    layer and the tag decided after it, so that its precedence is kept. Only tokens that none of the fused layers
+    recognize take their tag from the fallback tagger (the remainder of the cascade, i.e. the maxent tagger), which
+    tags the sentence in a single call if any token needs it. The fallback decides with its own tag history, so a
+    history dependent fallback (the maxent features use the previous tags) can tag those tokens differently than the
+    cascade, where the history holds the tags of the fused layers; whole sentence backends tag them the same.
+    """
+
+    def __init__(self, layers, fallback):
+        """
+        :param layers: a list of (FUSED_LAYER, model) tuples in precedence order, with at most one lookahead layer
+        :param fallback: a SequentialBackoffTagger for the tokens that are not recognized by any layer
+        """
+        lookahead = [i for i, (kind, _) in enumerate(layers) if kind == LOOKAHEAD_LAYER]
+        if len(lookahead) > 1:
+            raise ValueError('The FusedTagger supports a single lookahead layer, got {0}'.format(len(lookahead)))
+        split = lookahead[0] if lookahead else len(layers)
+        pre_layers, post_layers = layers[:split], layers[split + 1:]
+        self._lookahead = layers[split][1] if lookahead else frozenset()
+        self._fallback = fallback
+        self._lexicon = {}
+        for kind, model in layers:
+            if kind == UNIGRAM_LAYER:
+                for token in model:
+                    self._lexicon[token] = (self._resolve(pre_layers, token), self._resolve(post_layers, token))
+        patterns = []
+        self._group_tags = {}
+        for is_pre, phase_layers in [(True, pre_layers), (False, post_layers)]:
+            for kind, model in phase_layers:
+                if kind == REGEXP_LAYER:
+                    for pattern, tag in model:
+                        group = 'rule{0}'.format(len(patterns))
+                        patterns.append('(?P<{0}>{1})'.format(group, pattern))
+                        self._group_tags[group] = (tag, None) if is_pre else (None, tag)
+        self._regexp = re.compile('|'.join(patterns)) if patterns else None
+
+    @classmethod
+    def from_taggers(cls, taggers, cascade):
+        """
+        Fuses Tagger sub classes, in precedence order, up to the first one without a FUSED_LAYER. The tagger at
+        that position of the cascade (created from the same sub classes) and its backoff chain become the fallback.
+        """
+        layers = []
+        for i, tagger in enumerate(sorted(taggers, key=lambda sub_class: getattr(sub_class, 'PRECEDENCE'))):
+            if tagger.FUSED_LAYER is None:
+                return cls(layers, cascade._taggers[i])
+            layers.append((tagger.FUSED_LAYER, tagger._create_model()))
+        raise ValueError('The FusedTagger requires a fallback tagger')
+
+    @staticmethod
+    def _resolve(layers, token):
+        for kind, model in layers:
+            if kind == UNIGRAM_LAYER:
+                tag = model.get(token)
+            else:
+                tag = next((t for pattern, t in model if re.match(pattern, token)), None)
+            if tag is not None:
+                return tag
+        return None
+
+    def static_tag(self, tokens, index):
+        """
+        :return: the tag of tokens[index] decided by the fused layers, or None if it requires the fallback tagger
+        """
+        token = tokens[index]
+        entry = self._lexicon.get(token)
+        if entry is None:
+            match = self._regexp.match(token) if self._regexp is not None else None
+            entry = self._group_tags[match.lastgroup] if match else (None, None)
+        if entry[0] is not None:
+            return entry[0]
+        if index < len(tokens) - 1 and tokens[index + 1] in self._lookahead:
+            return MAIN_INGREDIENT_TAG
+        return entry[1]
+
+    def tag(self, tokens):
+        tags = [self.static_tag(tokens, index) for index in range(len(tokens))]
+        missed = [index for index, tag in enumerate(tags) if tag is None]
+        if missed:
+            fallback_tags = self._fallback.tag(tokens)
+            for index in missed:
+                tags[index] = fallback_tags[index][1]
+            instrumentation = get_instrumentation()
+            if instrumentation.enabled:
+                instrumentation.increment(FALLBACK_TOKENS_COUNTER, len(missed))
+        return list(zip(tokens, tags))
+
+
+def tagger_phrases():
+    """
+    :return: the vocabulary entries of the unigram taggers, including the multi-token ones that have to be merged
+    into a single token (see PhraseMatcher) before tagging
+    """
+    return list(MeasurementTagger._create_model()) + list(NumericalTagger._create_model()) + \
+        list(MainIngredientTagger._create_model())
+
+
+def register_pos_backend(name, factory):
+    """
+    Registers a statistical POS tagger that can be selected by name at IngredientParser.get_parser time. Taggers
+    that are not a SequentialBackoffTagger only need a tag(tokens) method, i.e. an nltk PerceptronTagger trained on
+    ingredient lines.
+    :param name: the backend name
+    :param factory: a callable without arguments that creates the tagger
+    """
+    POS_BACKENDS[name] = factory
+
 
-MEASUREMENT_LOOKUP = {value: standard for standard in MEASUREMENTS.keys()
-                      for value in MEASUREMENTS[standard]}
-MEASUREMENT_LOOKUP.update({standard: standard for standard in MEASUREMENTS.keys()})
-MEASUREMENT_LOOKUP.update({k+'s': v for k, v in MEASUREMENT_LOOKUP.items()})
-
-NUMERICAL = [
-    '1/2',
-    '1/4',
-    '1/5',
-    '1/6',
-    '1/7',
-    '1/8',
-    '1/9',
-    '1/10',
-    'half',
-    'halfs',
-    'halve',
-    'halves',
-    'quarter',
-    'quarters',
-    'fifth',
-    'fifths',
-    'sixth',
-    'sixths',
-    'eighth',
-    'eigths',
-    'one half',
-    'one quarter',
-]
-
-MAIN_INGREDIENTS = [
-    'chicken',
-    'beef',
-    'shrimp',
-    'veal',
-    'quail',
-    'poultry',
-    'scallops',
-    'prawns',
-    'fish',
-    'salmon',
-    'halibut',
-    'tuna',
-    'steak',
-    'potatoes',
-    'potato',
-]
-
-BIGRAM_INGREDIENTS = [
-    'pepper',
-    'onions',
-]
-
-# TODO implement a conversion utility here?
-CONVERSIONS = {
+POS_BACKENDS = {
+    'maxent': lambda: nltk.data.load('taggers/maxent_treebank_pos_tagger/english.pickle'),
+    'perceptron': lambda: nltk.tag.PerceptronTagger(),
 }
@@ -0,0 +1,32 @@
+import re
+from recipe_parser.tagger_data import MEASUREMENT_LOOKUP
+
+
+class IngredientTokenizer:
+    """
+    Single pass tokenizer for ingredient lines, an alternative to sent_tokenize (punkt) followed by word_tokenize
+    (treebank regexps). Ingredient lines are a single short sentence, so no sentence splitting is done. Produces
+    the treebank tokens for ingredient text: numbers, fractions (1/2) and ranges (2-3) stay whole, as do hyphenated
+    words, parentheses and other punctuation are split off, and unit abbreviations keep their period (tbsp.), as
+    in the MeasurementTagger model.
+    """
+    TOKEN_PATTERN = r"""
+        \b(?:{abbreviations})\.(?!\w)   # unit abbreviations with a period
+        | \d+(?:,\d{{3}})+(?:\.\d+)?    # thousands separators
+        | \w+(?:[-/.]\w+)*              # words and numbers, including fractions, ranges and decimals
+        | '\w+                          # clitics ('s)
+        | \S                            # parentheses and any other punctuation
+    """
+
+    def __init__(self, abbreviations=None):
+        """
+        :param abbreviations: words that keep a trailing period, defaults to the units of MEASUREMENT_LOOKUP
+        """
+        if abbreviations is None:
+            abbreviations = [unit for unit in MEASUREMENT_LOOKUP if unit.isalpha()]
+        abbreviations = sorted(abbreviations, key=len, reverse=True)
+        self._pattern = re.compile(
+            self.TOKEN_PATTERN.format(abbreviations='|'.join(re.escape(a) for a in abbreviations)), re.X)
+
+    def tokenize(self, text):
+        return self._pattern.findall(text)
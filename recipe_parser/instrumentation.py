@@ -0,0 +1,144 @@
+import threading
+from collections import namedtuple
+
+# the stages of parsing a line that are timed
+TOKENIZE_STAGE = 'tokenize'
+TAG_STAGE = 'tag'
+CHUNK_STAGE = 'chunk'
+CONVERT_STAGE = 'convert'  # the values and units of the Amount chunks
+LEMMATIZE_STAGE = 'lemmatize'  # the primary and modifier of the ingredient chunk
+STAGES = (TOKENIZE_STAGE, TAG_STAGE, CHUNK_STAGE, CONVERT_STAGE, LEMMATIZE_STAGE)
+# counters
+LINES_COUNTER = 'lines'
+FAILURES_COUNTER = 'failures'  # lines parsed to None
+FALLBACK_TOKENS_COUNTER = 'fallback_tokens'  # tokens tagged by the statistical POS tagger
+QUANTITY_JOINED_COUNTER = 'quantity_joined'  # amounts read from all of their numbers together
+QUANTITY_TOKENS_COUNTER = 'quantity_tokens'  # amounts summed from their numbers read one by one
+QUANTITY_UNRECOGNIZED_COUNTER = 'quantity_unrecognized'  # amounts without any recognized number
+COUNTER_DESCRIPTIONS = {
+    LINES_COUNTER: 'Ingredient lines parsed.',
+    FAILURES_COUNTER: 'Ingredient lines that could not be parsed.',
+    FALLBACK_TOKENS_COUNTER: 'Tokens tagged by the statistical POS tagger.',
+    QUANTITY_JOINED_COUNTER: 'Amounts read from all of their numbers together.',
+    QUANTITY_TOKENS_COUNTER: 'Amounts summed from their numbers read one by one.',
+    QUANTITY_UNRECOGNIZED_COUNTER: 'Amounts without a recognized number.',
+}
+DEFAULT_NAMESPACE = 'recipe_parser'
+StageTimings = namedtuple('StageTimings', ['count', 'total_seconds', 'max_seconds'])
+
+
+class Instrumentation:
+    """
+    Receives the stage durations and counters of the IngredientParser. This base class discards them, and since
+    enabled is False the parser does not even read the clock, so the default instrumentation costs an attribute
+    lookup per call. Sub classes set enabled and override observe and increment.
+    """
+    enabled = False
+
+    def observe(self, stage, seconds, count=1):
+        """
+        :param stage: one of STAGES
+        :param seconds: the duration of a single run of the stage
+        :param count: the number of lines the run covered, for a batch of lines that ran the stage together (i.e.
+        tagged with a single tag_sents call)
+        """
+        pass
+
+    def increment(self, counter, amount=1):
+        """
+        :param counter: the counter name, i.e. LINES_COUNTER
+        :param amount: the increment
+        """
+        pass
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    Aggregates the line count, total and maximum run duration of each stage and the counter totals in memory.
+    """
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds, count=1):
+        with self._lock:
+            total_count, total_seconds, max_seconds = self._timings.get(stage, (0, 0.0, 0.0))
+            self._timings[stage] = StageTimings(total_count + count, total_seconds + seconds,
+                                                max(max_seconds, seconds))
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def timings(self):
+        """
+        :return: a dict of the StageTimings of each observed stage
+        """
+        with self._lock:
+            return dict(self._timings)
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+
+class PrometheusExporter:
+    """
+    Renders the aggregates of an InMemoryInstrumentation in the Prometheus text exposition format: the stage
+    durations as a summary (<namespace>_stage_seconds_sum/_count, labeled by stage) next to a
+    <namespace>_stage_seconds_max gauge, and each counter as <namespace>_<counter>_total.
+    """
+
+    def __init__(self, instrumentation, namespace=DEFAULT_NAMESPACE):
+        self._instrumentation = instrumentation
+        self._namespace = namespace
+
+    def render(self):
+        lines = []
+        timings = self._instrumentation.timings()
+        if timings:
+            name = '{0}_stage_seconds'.format(self._namespace)
+            lines.append('# HELP {0} Time spent in each stage of parsing an ingredient line.'.format(name))
+            lines.append('# TYPE {0} summary'.format(name))
+            for stage, stage_timings in sorted(timings.items()):
+                lines.append('{0}_sum{{stage="{1}"}} {2!r}'.format(name, stage, stage_timings.total_seconds))
+                lines.append('{0}_count{{stage="{1}"}} {2}'.format(name, stage, stage_timings.count))
+            lines.append('# HELP {0}_max Longest run of each stage of parsing an ingredient line.'.format(name))
+            lines.append('# TYPE {0}_max gauge'.format(name))
+            for stage, stage_timings in sorted(timings.items()):
+                lines.append('{0}_max{{stage="{1}"}} {2!r}'.format(name, stage, stage_timings.max_seconds))
+        for counter, value in sorted(self._instrumentation.counters().items()):
+            name = '{0}_{1}_total'.format(self._namespace, counter)
+            lines.append('# HELP {0} {1}'.format(name, COUNTER_DESCRIPTIONS.get(counter, counter)))
+            lines.append('# TYPE {0} counter'.format(name))
+            lines.append('{0} {1}'.format(name, value))
+        return ''.join(line + '\n' for line in lines)
+
+
+NO_INSTRUMENTATION = Instrumentation()
+_instrumentation = NO_INSTRUMENTATION
+
+
+def get_instrumentation():
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation=None):
+    """
+    Sets the instrumentation of all IngredientParsers of the process (worker processes of the
+    ParallelIngredientParser have their own).
+    :param instrumentation: an Instrumentation, or None for NO_INSTRUMENTATION
+    :return: the previous instrumentation
+    """
+    global _instrumentation
+    previous = _instrumentation
+    _instrumentation = instrumentation or NO_INSTRUMENTATION
+    return previous
@@ -0,0 +1,150 @@
+"""
+The WordNet noun lemmas of the lemma_vocabulary() words, generated ahead of time with python -m
+recipe_parser.lemmatizer so that the vocabulary words never reach WordNet. Regenerate it when the tagger vocabularies
+change.
+"""
+LEMMA_TABLE = {
+    '#': '#',
+    '#s': '#s',
+    'T': 'T',
+    'Ts': 'Ts',
+    'a': 'a',
+    'an': 'an',
+    'ans': 'an',
+    'as': 'a',
+    'beef': 'beef',
+    'c': 'c',
+    'can': 'can',
+    'cans': 'can',
+    'cc': 'cc',
+    'ccs': 'cc',
+    'chicken': 'chicken',
+    'couple': 'couple',
+    'couples': 'couple',
+    'cs': 'c',
+    'cup': 'cup',
+    'cups': 'cup',
+    'dash': 'dash',
+    'dashes': 'dash',
+    'dashess': 'dashess',
+    'dashs': 'dash',
+    'deciliter': 'deciliter',
+    'deciliters': 'deciliter',
+    'decilitre': 'decilitre',
+    'decilitres': 'decilitre',
+    'dl': 'dl',
+    'dls': 'dl',
+    'fish': 'fish',
+    'fl pt': 'fl pt',
+    'fl pts': 'fl pts',
+    'fl qt': 'fl qt',
+    'fl qts': 'fl qts',
+    'fluid ounce': 'fluid ounce',
+    'fluid ounces': 'fluid ounces',
+    'fluid pint': 'fluid pint',
+    'fluid pints': 'fluid pints',
+    'fluid quart': 'fluid quart',
+    'fluid quarts': 'fluid quarts',
+    'g': 'g',
+    'gal': 'gal',
+    'gallon': 'gallon',
+    'gallons': 'gallon',
+    'gals': 'gal',
+    'gill': 'gill',
+    'gills': 'gill',
+    'gram': 'gram',
+    'gramme': 'gramme',
+    'grammes': 'gramme',
+    'grams': 'gram',
+    'gs': 'g',
+    'halibut': 'halibut',
+    'handful': 'handful',
+    'handfuls': 'handful',
+    'kg': 'kg',
+    'kgs': 'kg',
+    'kilogram': 'kilogram',
+    'kilogramme': 'kilogramme',
+    'kilogrammes': 'kilogrammes',
+    'kilograms': 'kilogram',
+    'l': 'l',
+    'lb': 'lb',
+    'lbs': 'lb',
+    'liter': 'liter',
+    'liters': 'liter',
+    'litre': 'litre',
+    'litres': 'litre',
+    'ls': 'l',
+    'mg': 'mg',
+    'mgs': 'mg',
+    'milligram': 'milligram',
+    'milligramme': 'milligramme',
+    'milligrammes': 'milligrammes',
+    'milligrams': 'milligram',
+    'milliliter': 'milliliter',
+    'milliliters': 'milliliter',
+    'millilitre': 'millilitre',
+    'millilitres': 'millilitre',
+    'ml': 'ml',
+    'mls': 'ml',
+    'onions': 'onion',
+    'ounce': 'ounce',
+    'ounces': 'ounce',
+    'oz': 'oz',
+    'ozs': 'ozs',
+    'p': 'p',
+    'pepper': 'pepper',
+    'pinch': 'pinch',
+    'pinches': 'pinch',
+    'pinchess': 'pinchess',
+    'pinchs': 'pinch',
+    'pint': 'pint',
+    'pints': 'pint',
+    'potato': 'potato',
+    'potatoes': 'potato',
+    'poultry': 'poultry',
+    'pound': 'pound',
+    'pounds': 'pound',
+    'prawns': 'prawn',
+    'ps': 'p',
+    'pt': 'pt',
+    'pts': 'pt',
+    'q': 'q',
+    'qs': 'q',
+    'qt': 'qt',
+    'qts': 'qts',
+    'quail': 'quail',
+    'quart': 'quart',
+    'quarts': 'quart',
+    'salmon': 'salmon',
+    'scallops': 'scallop',
+    'shrimp': 'shrimp',
+    'single': 'single',
+    'singles': 'single',
+    'steak': 'steak',
+    'stick': 'stick',
+    'sticks': 'stick',
+    't': 't',
+    'tablespoon': 'tablespoon',
+    'tablespoons': 'tablespoon',
+    'taste': 'taste',
+    'tastes': 'taste',
+    'tb': 'tb',
+    'tbl': 'tbl',
+    'tbls': 'tbls',
+    'tbs': 'tb',
+    'tbsp': 'tbsp',
+    'tbsps': 'tbsps',
+    'tbss': 'tbss',
+    'teaspoon': 'teaspoon',
+    'teaspoons': 'teaspoon',
+    'touch': 'touch',
+    'touche': 'touche',
+    'touches': 'touch',
+    'touchess': 'touchess',
+    'touchs': 'touch',
+    'ts': 't',
+    'tsp': 'tsp',
+    'tsps': 'tsps',
+    'tuna': 'tuna',
+    'veal': 'veal',
+}
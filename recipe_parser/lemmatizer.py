@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from recipe_parser.tagger_data import MEASUREMENT_LOOKUP, MAIN_INGREDIENTS, BIGRAM_INGREDIENTS
+from recipe_parser.lemma_table import LEMMA_TABLE
+
+DEFAULT_LEMMA_CACHE_SIZE = 4096
+NOUN = 'n'
+LemmaCacheInfo = namedtuple('LemmaCacheInfo', ['table_hits', 'hits', 'misses', 'maxsize', 'currsize'])
+LEMMA_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lemma_table.py')
+LEMMA_TABLE_HEADER = '''"""
+The WordNet noun lemmas of the lemma_vocabulary() words, generated ahead of time with python -m
+recipe_parser.lemmatizer so that the vocabulary words never reach WordNet. Regenerate it when the tagger vocabularies
+change.
+"""
+'''
+
+
+def lemma_vocabulary():
+    """
+    :return: the words of the tagger vocabularies that the parser lemmatizes: the units and the main ingredients
+    """
+    return sorted(set(MEASUREMENT_LOOKUP) | set(MAIN_INGREDIENTS) | set(BIGRAM_INGREDIENTS))
+
+
+def generate_lemma_table(lemmatizer=None):
+    """
+    :param lemmatizer: the lemmatizer of the table, a WordNetLemmatizer by default
+    :return: a dict of the noun lemma of each lemma_vocabulary() word
+    """
+    if lemmatizer is None:
+        from nltk.stem import WordNetLemmatizer
+        lemmatizer = WordNetLemmatizer()
+    return {word: lemmatizer.lemmatize(word, NOUN) for word in lemma_vocabulary()}
+
+
+def write_lemma_table(path=LEMMA_TABLE_PATH):
+    """
+    Writes the LEMMA_TABLE module of the WordNet lemmas of the vocabulary (requires the WordNet corpus).
+    """
+    table = generate_lemma_table()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(LEMMA_TABLE_HEADER)
+        f.write('LEMMA_TABLE = {\n')
+        for word in sorted(table):
+            f.write('    {0!r}: {1!r},\n'.format(word, table[word]))
+        f.write('}\n')
+
+
+class CachedLemmatizer:
+    """
+    Memoizing front of a lemmatizer (WordNetLemmatizer by default). The noun lemmas of the vocabulary words are
+    read from a table, LEMMA_TABLE (generated ahead of time) for the WordNetLemmatizer, and the lemmas of other words
+    are kept in a least recently used cache of cache_size words, so the vocabulary never reaches WordNet's morphy
+    lookup and other repeated words reach it once. info() counts the table hits next to the hits and misses of the
+    cache.
+    The table is read only, lru_cache is thread-safe and the table hits are counted under a lock, so threads can
+    share a CachedLemmatizer.
+    """
+
+    def __init__(self, lemmatizer=None, cache_size=DEFAULT_LEMMA_CACHE_SIZE, vocabulary=None):
+        """
+        :param lemmatizer: the lemmatizer behind the cache, an object with a lemmatize(word, pos) method
+        :param cache_size: the number of cached lemmas, None for an unbounded cache and 0 to disable it
+        :param vocabulary: the words of the lemma table, which are lemmatized by the lemmatizer when it is created;
+        by default LEMMA_TABLE for the WordNetLemmatizer, and lemma_vocabulary() for other lemmatizers
+        """
+        table = LEMMA_TABLE if lemmatizer is None and vocabulary is None else None
+        if lemmatizer is None:
+            from nltk.stem import WordNetLemmatizer
+            lemmatizer = WordNetLemmatizer()
+        self._lemmatizer = lemmatizer
+        if table is None:
+            table = {word: self._lemmatizer.lemmatize(word, NOUN)
+                     for word in (lemma_vocabulary() if vocabulary is None else vocabulary)}
+        self._table = table
+        self._table_hits = 0
+        self._lock = threading.Lock()
+        self._cached_lemmatize = lru_cache(maxsize=cache_size)(self._lemmatizer.lemmatize)
+
+    def lemmatize(self, word, pos=NOUN):
+        if pos == NOUN:
+            lemma = self._table.get(word)
+            if lemma is not None:
+                with self._lock:
+                    self._table_hits += 1
+                return lemma
+        return self._cached_lemmatize(word, pos)
+
+    def info(self):
+        cache_info = self._cached_lemmatize.cache_info()
+        return LemmaCacheInfo(self._table_hits, cache_info.hits, cache_info.misses, cache_info.maxsize,
+                              cache_info.currsize)
+
+    def clear(self):
+        self._cached_lemmatize.cache_clear()
+        with self._lock:
+            self._table_hits = 0
+
+
+if __name__ == '__main__':
+    write_lemma_table()
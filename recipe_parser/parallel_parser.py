@@ -0,0 +1,183 @@
+import gc
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_parser import IngredientParser
+
+DEFAULT_CHUNK_SIZE = 512
+WARMUP_LINES = [
+    '1 (4 ounce) can chopped green peppers',
+    '2 cups vegetable oil',
+]
+
+# the parser of a worker process, set by _init_worker
+_worker_parse_many = None
+
+
+def _init_worker(parse_many):
+    # the forked worker inherits the parent's already warm parser, it is not pickled
+    global _worker_parse_many
+    _worker_parse_many = parse_many
+
+
+def _parse_chunk(lines):
+    return list(_worker_parse_many(lines))
+
+
+def _parse_chunk_with(parse_many, lines):
+    return list(parse_many(lines))
+
+
+def _chunks(lines, chunk_size):
+    lines = iter(lines)
+    chunk = list(islice(lines, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(lines, chunk_size))
+
+
+class ParallelIngredientParser:
+    """
+    Parses ingredient lines on a pool of forked worker processes. The tagger cascade, lemmatizer and grammar are
+    loaded once in the parent (by parsing WARMUP_LINES) and the workers share that state copy-on-write. The heap is
+    moved into the permanent gc generation (gc.freeze) before forking so that collections in the workers do not
+    touch, and therefore copy, the shared pages. A cache_path parser option lets the workers share a persistent
+    parse cache. At most twice the number of processes chunks are queued at a time, so lines are read from the
+    iterable as the results are consumed.
+    Requires the 'fork' start method (i.e. not available on Windows).
+
+        with ParallelIngredientParser(processes=8) as parser:
+            for parsed in parser.parse_many(lines):
+                ...
+    """
+
+    def __init__(self, processes=None, grammar=GRAMMAR, chunk_size=DEFAULT_CHUNK_SIZE, **parser_options):
+        """
+        :param processes: the number of worker processes, defaults to the number of cpus
+        :param grammar: the chunking grammar
+        :param chunk_size: the number of lines sent to a worker at once
+        :param parser_options: options of the workers' parser, see IngredientParser.get_instance
+        """
+        self._processes = processes or multiprocessing.cpu_count()
+        self._grammar = grammar
+        self._parser_options = parser_options
+        self._chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """
+        Warms up the parser in this process and forks the workers. Called implicitly by parse_many.
+        :return: self
+        """
+        if self._pool is not None:
+            return self
+        parse_many = IngredientParser.get_batch_parser(self._grammar, **self._parser_options)
+        list(parse_many(WARMUP_LINES))
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+        try:
+            self._pool = multiprocessing.get_context('fork').Pool(self._processes, _init_worker, (parse_many,))
+        finally:
+            if hasattr(gc, 'unfreeze'):
+                gc.unfreeze()
+        return self
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def parse_many(self, lines):
+        """
+        Splits lines into chunks of chunk_size that are parsed by the workers.
+        :param lines: an iterable of ingredient text
+        :return: a generator of ParsedIngredient (or None) in input order
+        """
+        self.start()
+        pending = deque()
+        for chunk in _chunks(lines, self._chunk_size):
+            pending.append(self._pool.apply_async(_parse_chunk, (chunk,)))
+            if len(pending) >= 2 * self._processes:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+class ThreadPoolIngredientParser:
+    """
+    Parses ingredient lines on a pool of threads that share a single (warm) parser instance, so the tagger models,
+    lemmatizer and parse cache are loaded once per process instead of once per worker. The threads only run in
+    parallel on free-threaded CPython builds; with the GIL the pool keeps a single parse_many call from monopolizing
+    a service, but does not parse faster than one thread. At most twice the number of threads chunks are queued
+    at a time, so lines are read from the iterable as the results are consumed.
+
+        with ThreadPoolIngredientParser(threads=8) as parser:
+            for parsed in parser.parse_many(lines):
+                ...
+    """
+
+    def __init__(self, threads=None, grammar=GRAMMAR, chunk_size=DEFAULT_CHUNK_SIZE, **parser_options):
+        """
+        :param threads: the number of worker threads, defaults to the number of cpus
+        :param grammar: the chunking grammar
+        :param chunk_size: the number of lines parsed by a thread at once
+        :param parser_options: options of the shared parser, see IngredientParser.get_instance
+        """
+        self._threads = threads or multiprocessing.cpu_count()
+        self._grammar = grammar
+        self._parser_options = parser_options
+        self._chunk_size = chunk_size
+        self._parse_many = None
+        self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """
+        Warms up the shared parser and starts the threads. Called implicitly by parse_many.
+        :return: self
+        """
+        if self._executor is not None:
+            return self
+        self._parse_many = IngredientParser.get_batch_parser(self._grammar, **self._parser_options)
+        list(self._parse_many(WARMUP_LINES))
+        self._executor = ThreadPoolExecutor(self._threads)
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def parse_many(self, lines):
+        """
+        Splits lines into chunks of chunk_size that are parsed by the threads.
+        :param lines: an iterable of ingredient text
+        :return: a generator of ParsedIngredient (or None) in input order
+        """
+        self.start()
+        pending = deque()
+        try:
+            for chunk in _chunks(lines, self._chunk_size):
+                pending.append(self._executor.submit(_parse_chunk_with, self._parse_many, chunk))
+                if len(pending) >= 2 * self._threads:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
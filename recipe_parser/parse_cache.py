@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from recipe_parser import __version__, GRAMMAR, DEFAULT_POS_BACKEND, DEFAULT_TOKENIZER_MODE, PHRASE_MATCHER, \
+    NOTE_PHRASE_PATTERN, NOTE_SEPARATOR_PATTERN, AMOUNT_PATTERN, AMOUNT_TRANSLATOR, TEXT_CLEANER, KEY_CLEANER, \
+    QUANTITY_PUNCTUATION
+from recipe_parser.ingredient_tagger import MEASUREMENTS, NUMERICAL, MAIN_INGREDIENTS, BIGRAM_INGREDIENTS, \
+    IngredientRegexpTagger
+from recipe_parser.quantity import QuantityRecognizer
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+# returned by get() for keys that are not cached, since None is a valid (cached) parse result
+MISSING = object()
+SQLITE_TIMEOUT = 30
+# version of the cached values, bumped whenever the types or pickle format of parse results change (or parsing
+# rules change that the fingerprint does not cover): 2 - Fraction amount values, 3 - __slots__ results pickled
+# through ParsedValue.__getstate__, 4 - lines of only parentheticals are parsed from their text, 5 - magnitude words
+# without a count are not quantities
+PARSE_CACHE_SCHEMA = 5
+
+
+class LRUParseCache:
+    """
+    Size bounded least recently used cache of parse results keyed on the normalized ingredient text. Counts hits,
+    misses and evictions, reported by info() in the same shape as functools.lru_cache's cache_info(). An optional
+    backend (i.e. a SqliteParseCache) is consulted on misses and receives every put. Thread-safe; the lock is not
+    held while the backend is consulted.
+    """
+
+    def __init__(self, maxsize, backend=None):
+        if maxsize <= 0:
+            raise ValueError('The cache size must be positive, got {0}'.format(maxsize))
+        self._maxsize = maxsize
+        self._backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """
+        :param key: normalized ingredient text
+        :return: the cached parse result, or MISSING
+        """
+        with self._lock:
+            value = self._entries.get(key, MISSING)
+            if value is not MISSING:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+        if self._backend is None:
+            return MISSING
+        value = self._backend.get(key)
+        if value is not MISSING:
+            self._insert(key, value)
+        return value
+
+    def put(self, key, value):
+        self._insert(key, value)
+        if self._backend is not None:
+            self._backend.put(key, value)
+
+    def put_many(self, items):
+        items = list(items)
+        for key, value in items:
+            self._insert(key, value)
+        if self._backend is not None:
+            self._backend.put_many(items)
+
+    def _insert(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+
+def parse_cache_fingerprint(grammar=GRAMMAR, backend=DEFAULT_POS_BACKEND, tokenizer=DEFAULT_TOKENIZER_MODE,
+                            fast_path=False, keep_amounts=True):
+    """
+    Fingerprint of everything that determines a parse result: the grammar, the tagger vocabularies and regexp
+    rules, merged and dropped phrases, the segmentation, cleaning and quantity patterns, the POS backend, the
+    tokenizer mode, the fast path, whether all amounts are kept, the PARSE_CACHE_SCHEMA and the package version.
+    Cached results are stored under the fingerprint, so changing any of these invalidates them.
+    """
+    rules = json.dumps([
+        grammar, MEASUREMENTS, NUMERICAL, MAIN_INGREDIENTS, BIGRAM_INGREDIENTS, IngredientRegexpTagger.patterns,
+        PHRASE_MATCHER.phrases, NOTE_PHRASE_PATTERN.pattern, NOTE_SEPARATOR_PATTERN.pattern, AMOUNT_PATTERN.pattern,
+        [''.join(sorted(map(chr, translator))) for translator in [AMOUNT_TRANSLATOR, TEXT_CLEANER, KEY_CLEANER]],
+        QUANTITY_PUNCTUATION.pattern, QuantityRecognizer.NUMBER_PATTERN, QuantityRecognizer.WORD_PATTERN,
+        QuantityRecognizer.RANGE_SEPARATOR, QuantityRecognizer.SEPARATOR,
+        backend, tokenizer, fast_path, keep_amounts, PARSE_CACHE_SCHEMA, __version__,
+    ], sort_keys=True)
+    return hashlib.sha1(rules.encode('utf-8')).hexdigest()
+
+
+class SqliteParseCache:
+    """
+    Persistent parse cache in a sqlite database, shared across runs and processes. The database uses write ahead
+    logging so any number of processes can read while one writes. Connections are opened per process, so an
+    instance may be created before forking workers. The threads of a process share its connection, one statement
+    at a time. Values are pickled, so only open cache files you trust.
+    """
+
+    def __init__(self, path, fingerprint=None):
+        self._path = path
+        self._fingerprint = fingerprint or parse_cache_fingerprint()
+        self._connections = dict()
+        self._connections_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        with self._connection() as connection:
+            connection.commit()
+
+    @contextmanager
+    def _connection(self):
+        # a connection must not be used across fork(), the parent's connection (and its lock, which may have been
+        # held by another thread) is kept and not used in a child
+        pid = os.getpid()
+        if pid not in self._connections:
+            with self._connections_lock:
+                if pid not in self._connections:
+                    connection = sqlite3.connect(self._path, timeout=SQLITE_TIMEOUT, check_same_thread=False)
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.execute('PRAGMA synchronous=NORMAL')
+                    connection.execute('CREATE TABLE IF NOT EXISTS parse_cache '
+                                       '(fingerprint TEXT, key TEXT, value BLOB, PRIMARY KEY (fingerprint, key))')
+                    self._connections[pid] = (connection, threading.Lock())
+        connection, lock = self._connections[pid]
+        with lock:
+            yield connection
+
+    def get(self, key):
+        with self._connection() as connection:
+            row = connection.execute('SELECT value FROM parse_cache WHERE fingerprint = ? AND key = ?',
+                                     (self._fingerprint, key)).fetchone()
+            if row is None:
+                self._misses += 1
+                return MISSING
+            self._hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        """
+        Stores several results in a single transaction.
+        :param items: an iterable of (key, value) tuples
+        """
+        with self._connection() as connection, connection:
+            connection.executemany('INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?)',
+                                   [(self._fingerprint, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                                    for key, value in items])
+
+    def clear(self):
+        with self._connection() as connection, connection:
+            connection.execute('DELETE FROM parse_cache WHERE fingerprint = ?', (self._fingerprint,))
+            self._hits = self._misses = 0
+
+    def purge_stale(self):
+        """
+        Deletes the results cached under other fingerprints, i.e. by older versions of the rules.
+        """
+        with self._connection() as connection, connection:
+            connection.execute('DELETE FROM parse_cache WHERE fingerprint != ?', (self._fingerprint,))
+
+    def close(self):
+        with self._connections_lock:
+            connection, lock = self._connections.pop(os.getpid(), (None, None))
+        if connection is not None:
+            with lock:
+                connection.close()
+
+    def info(self):
+        with self._connection() as connection:
+            size = connection.execute('SELECT COUNT(*) FROM parse_cache WHERE fingerprint = ?',
+                                      (self._fingerprint,)).fetchone()[0]
+            return CacheInfo(self._hits, self._misses, 0, None, size)
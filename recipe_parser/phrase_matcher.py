@@ -0,0 +1,51 @@
+# marks the end of a phrase in the trie, tokens are always strings
+PHRASE_END = None
+
+
+class PhraseMatcher:
+    """
+    Merges the tokens of multi-token vocabulary phrases (i.e. 'fluid ounce', 'fl pt', 'one half') into a single
+    token, so that the unigram models of the Tagger cascade, which are keyed on single tokens, can tag them. The
+    phrases are compiled into a trie over their tokens, and the longest phrase at each position is merged in a
+    single left to right pass. Token lists without the first token of any phrase are returned as they are.
+    """
+
+    def __init__(self, phrases):
+        """
+        :param phrases: the vocabulary entries, entries of a single token are ignored
+        """
+        self._trie = {}
+        merged = set()
+        for phrase in phrases:
+            tokens = phrase.split()
+            if len(tokens) < 2:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[PHRASE_END] = True
+            merged.add(' '.join(tokens))
+        self.phrases = sorted(merged)
+        self._first_tokens = frozenset(self._trie)
+
+    def merge(self, tokens):
+        """
+        :param tokens: a list of tokens
+        :return: the tokens with the longest phrase at each position joined by a space
+        """
+        if self._first_tokens.isdisjoint(tokens):
+            return tokens
+        merged = []
+        start = 0
+        while start < len(tokens):
+            node = self._trie
+            end = start + 1
+            index = start
+            while index < len(tokens) and tokens[index] in node:
+                node = node[tokens[index]]
+                index += 1
+                if PHRASE_END in node:
+                    end = index
+            merged.append(' '.join(tokens[start:end]))
+            start = end
+        return merged
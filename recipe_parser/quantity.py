@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from collections import namedtuple
+from fractions import Fraction
+from recipe_parser.text_to_fraction import FRACTIONS
+from recipe_parser.text_to_num import Small, Magnitude
+
+Quantity = namedtuple('Quantity', ['low', 'high'])
+
+VULGAR_FRACTIONS = {c: Fraction(unicodedata.numeric(c)).limit_denominator(10)
+                    for c in '¼½¾' + ''.join(chr(i) for i in range(0x2150, 0x215f))}
+ARTICLES = ['a', 'an', 'single']
+DEFAULT_CACHE_SIZE = 4096
+
+
+class QuantityRecognizer:
+    """
+    Converts the text of an amount into a Quantity of Fractions: integers (2), decimals (0.5), fractions (1/2),
+    mixed numbers (1 1/2, 1-1/2, 1 and 1/2, 1½), unicode vulgar fractions (½), number words (twenty five, one
+    hundred), fraction words (half, one half, three quarters, one and a half), articles (a, an, single) and ranges
+    of any of these (2-3, 2 to 3, 1/2 or 1). A single quantity has low == high. The patterns are compiled once and
+    the conversion never raises; text that is not a quantity gives None. The results are cached, since amounts repeat
+    a lot, and the cache is cleared whenever it holds cache_size distinct texts. The cache is only changed by single
+    dict operations, so threads can share a recognizer; a race at most drops a cached result.
+    """
+    SEPARATOR = r'[\s-]+'
+    NUMBER_PATTERN = r"""
+        (?P<whole>\d+)(?:\s+and\s+|[\s-]+)(?P<mixed_numerator>\d+)/(?P<mixed_denominator>\d+)
+        | (?P<vulgar_whole>\d+)?(?:\s+and\s+|\s*)(?P<vulgar>[{vulgar}])
+        | (?P<numerator>\d+)/(?P<denominator>\d+)
+        | (?P<integer>\d+)(?:\.(?P<decimals>\d+))?
+        | \.(?P<only_decimals>\d+)
+    """
+    WORD_PATTERN = r"""
+        (?:
+            (?P<count>(?:{number_words})(?:{separator}(?:and{separator})?(?:{number_words}))*)
+            | (?P<article>{articles})
+        )
+        (?:{separator}(?P<and>and{separator}(?:a|an|one){separator})?(?P<fraction>{fraction_words})s?)?
+        | (?P<bare_fraction>{fraction_words})s?
+    """
+    RANGE_SEPARATOR = r'\s*(?:-|–|\bto\b|\bor\b)\s*'
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        :param cache_size: the number of recognized texts cached before the cache is cleared, 0 disables the cache
+        """
+        self._cache_size = cache_size
+        self._cache = {}
+        number_words = sorted(list(Small) + list(Magnitude) + ['hundred'], key=len, reverse=True)
+        fraction_words = sorted(FRACTIONS, key=len, reverse=True)
+        self._number = re.compile(self.NUMBER_PATTERN.format(vulgar=''.join(VULGAR_FRACTIONS)), re.X)
+        self._word = re.compile(self.WORD_PATTERN.format(
+            number_words='|'.join(number_words),
+            fraction_words='|'.join(re.escape(w) for w in fraction_words),
+            articles='|'.join(ARTICLES),
+            separator=self.SEPARATOR,
+        ), re.X)
+        self._range_separator = re.compile(self.RANGE_SEPARATOR)
+        self._separator = re.compile(self.SEPARATOR)
+        self._fractions = {word: Fraction(value).limit_denominator(100) for word, value in FRACTIONS.items()}
+
+    def recognize(self, text):
+        """
+        :param text: the (lowercase) text of an amount, i.e. the CD tokens of an Amount chunk joined by spaces
+        :return: a Quantity, or None if the text is not a quantity
+        """
+        quantity = self._cache.get(text, self)
+        if quantity is self:
+            quantity = self._recognize(text)
+            if self._cache_size:
+                if len(self._cache) >= self._cache_size:
+                    self._cache.clear()
+                self._cache[text] = quantity
+        return quantity
+
+    def _recognize(self, text):
+        text = text.strip()
+        value = self._value(text)
+        if value is not None:
+            return Quantity(value, value)
+        for separator in self._range_separator.finditer(text):
+            low = self._value(text[:separator.start()])
+            if low is not None:
+                high = self._value(text[separator.end():])
+                if high is not None:
+                    return Quantity(low, high)
+        return None
+
+    def _value(self, text):
+        match = self._number.fullmatch(text)
+        if match is not None:
+            return self._number_value(match)
+        match = self._word.fullmatch(text)
+        if match is not None:
+            return self._word_value(match)
+        return None
+
+    @staticmethod
+    def _number_value(match):
+        if match.group('integer') is not None:
+            decimals = match.group('decimals') or ''
+            return Fraction(int(match.group('integer') + decimals), 10 ** len(decimals))
+        if match.group('only_decimals') is not None:
+            decimals = match.group('only_decimals')
+            return Fraction(int(decimals), 10 ** len(decimals))
+        if match.group('vulgar') is not None:
+            return int(match.group('vulgar_whole') or 0) + VULGAR_FRACTIONS[match.group('vulgar')]
+        if match.group('numerator') is not None:
+            numerator, denominator = int(match.group('numerator')), int(match.group('denominator'))
+            return Fraction(numerator, denominator) if denominator else None
+        denominator = int(match.group('mixed_denominator'))
+        if not denominator:
+            return None
+        return int(match.group('whole')) + Fraction(int(match.group('mixed_numerator')), denominator)
+
+    def _word_value(self, match):
+        if match.group('bare_fraction') is not None:
+            return self._fractions[match.group('bare_fraction')]
+        if match.group('article') is not None:
+            count = 1
+        else:
+            count = self._count_value(self._separator.split(match.group('count')))
+            if count is None:
+                return None
+        if match.group('fraction') is None:
+            return Fraction(count)
+        fraction = self._fractions[match.group('fraction')]
+        return count + fraction if match.group('and') else count * fraction
+
+    @staticmethod
+    def _count_value(words):
+        """
+        text2num without exceptions: None for a misplaced 'hundred' or a magnitude without a count (i.e. 'thousand').
+        """
+        total = group = 0
+        for word in words:
+            if word == 'and':
+                continue
+            if word in Small:
+                group += Small[word]
+            elif word == 'hundred':
+                if not group:
+                    return None
+                group *= 100
+            else:
+                if not group:
+                    return None
+                total += group * Magnitude[word]
+                group = 0
+        return total + group
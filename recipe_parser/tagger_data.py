@@ -0,0 +1,165 @@
+"""
+The vocabularies of the ingredient taggers and the default POS backend. They do not depend on NLTK, so modules that
+only need the units (i.e. amount_conversions) are imported without loading it.
+"""
+DEFAULT_POS_BACKEND = 'maxent'
+
+MEASUREMENTS = {
+    'gill': [
+        'gill',
+    ],
+    'ounce': [
+        'fluid ounce',
+        'ounce',
+        'oz',
+    ],
+    'tablespoon': [
+        'T',
+        'tbl',
+        'tb',
+        'tbs',
+        'tbsp',
+    ],
+    'teaspoon': [
+        't',
+        'tsp',
+    ],
+    'cup': [
+        'c',
+    ],
+    'pint': [
+        'p',
+        'pt',
+        'fl pt',
+        'fluid pint',
+    ],
+    'quart': [
+        'q',
+        'qt',
+        'fl qt',
+        'fluid quart',
+    ],
+    'gallon': [
+        'g',
+        'gal'
+    ],
+    'millilitre': [
+        'milliliter',
+        'ml',
+        'cc',
+    ],
+    'litre': [
+        'liter',
+        'l'
+    ],
+    'decilitre': [
+        'dl',
+        'deciliter',
+    ],
+    'pound': [
+        'lb',
+        '#',
+    ],
+    'milligram': [
+        'milligramme',
+        'mg',
+    ],
+    'gram': [
+        'g',
+        'gramme',
+    ],
+    'kilogram': [
+        'kilogramme',
+        'kg',
+    ],
+    'pinch': [
+        'pinches',
+    ],
+    'dash': [
+        'dashes',
+        'dash'
+    ],
+    'touch': [
+        'touches',
+        'touche'
+    ],
+    'handful': [
+    ],
+    'taste': [
+    ],
+    'can': [
+    ],
+    'stick': [
+    ],
+    'a': [
+        'an',
+        'single',
+        'couple',
+    ]
+}
+
+MEASUREMENT_LOOKUP = {value: standard for standard in MEASUREMENTS.keys()
+                      for value in MEASUREMENTS[standard]}
+MEASUREMENT_LOOKUP.update({standard: standard for standard in MEASUREMENTS.keys()})
+MEASUREMENT_LOOKUP.update({k+'s': v for k, v in MEASUREMENT_LOOKUP.items()})
+
+NUMERICAL = [
+    '1/2',
+    '1/4',
+    '1/5',
+    '1/6',
+    '1/7',
+    '1/8',
+    '1/9',
+    '1/10',
+    'half',
+    'halfs',
+    'halve',
+    'halves',
+    'quarter',
+    'quarters',
+    'fifth',
+    'fifths',
+    'sixth',
+    'sixths',
+    'eighth',
+    'eigths',
+    'one half',
+    'one quarter',
+    '¼',
+    '½',
+    '¾',
+    '⅓',
+    '⅔',
+    '⅛',
+    '⅜',
+    '⅝',
+    '⅞',
+]
+
+MAIN_INGREDIENTS = [
+    'chicken',
+    'beef',
+    'shrimp',
+    'veal',
+    'quail',
+    'poultry',
+    'scallops',
+    'prawns',
+    'fish',
+    'salmon',
+    'halibut',
+    'tuna',
+    'steak',
+    'potatoes',
+    'potato',
+]
+
+BIGRAM_INGREDIENTS = [
+    'pepper',
+    'onions',
+]
+
+# TODO implement a conversion utility here?
+CONVERSIONS = {
+}
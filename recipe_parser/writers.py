@@ -0,0 +1,179 @@
+import sqlite3
+import time
+from collections import namedtuple
+from recipe_parser.ingestion import IngredientRecord
+
+DEFAULT_WRITE_BATCH_SIZE = 1000
+INGREDIENT_TABLE = 'ingredients'
+# the keys of IngredientRecord.to_dict
+INGREDIENT_COLUMNS = ('recipe', 'text', 'primary', 'modifier', 'value', 'unit', 'percent_amount')
+# placeholder of the nth (1 based) column for each DB-API paramstyle
+PLACEHOLDERS = {
+    'qmark': '?',
+    'numeric': ':{0}',
+    'named': ':{1}',
+    'format': '%s',
+    'pyformat': '%({1})s',
+}
+WriterStats = namedtuple('WriterStats', ['rows', 'batches', 'rows_per_second', 'mean_commit_seconds',
+                                         'max_commit_seconds'])
+
+
+class BatchWriteError(Exception):
+    """
+    Raised when a batch could not be inserted, from the driver's error. The batch was rolled back and dropped from
+    the buffer; its rows are handed back in rows, in column order, so they can be fixed and written again.
+    """
+
+    def __init__(self, msg, rows):
+        Exception.__init__(self, msg)
+        self.rows = rows
+
+
+class BatchWriter:
+    """
+    Inserts rows into a table through any DB-API 2.0 connection. Rows are buffered and written batch_size at a
+    time, each batch with a single executemany in its own transaction. If the insert fails the transaction is
+    rolled back and the batch is dropped from the buffer and handed back in a BatchWriteError, so later writes are
+    not held up by it. Reports the rows per second and the commit latency of the batches in stats().
+
+        with BatchWriter(connection, paramstyle=psycopg2.paramstyle) as writer:
+            for text, parsed_ingredient in zip(lines, parse_many(lines)):
+                writer.write_parsed(recipe_id, text, parsed_ingredient)
+    """
+
+    def __init__(self, connection, table=INGREDIENT_TABLE, columns=INGREDIENT_COLUMNS,
+                 batch_size=DEFAULT_WRITE_BATCH_SIZE, paramstyle='qmark'):
+        """
+        :param connection: a DB-API 2.0 connection
+        :param table: the table the rows are inserted into
+        :param columns: the columns of the rows, in row order
+        :param batch_size: the number of rows inserted per transaction
+        :param paramstyle: the paramstyle of the connection's driver module (i.e. sqlite3.paramstyle)
+        """
+        if paramstyle not in PLACEHOLDERS:
+            raise ValueError('Unknown paramstyle {0}, expected one of {1}'.format(paramstyle, sorted(PLACEHOLDERS)))
+        self._connection = connection
+        self._columns = tuple(columns)
+        self._batch_size = batch_size
+        self._named = paramstyle in ('named', 'pyformat')
+        self._statement = 'INSERT INTO {0} ({1}) VALUES ({2})'.format(
+            quote_identifier(table),
+            ', '.join(quote_identifier(column) for column in self._columns),
+            ', '.join(PLACEHOLDERS[paramstyle].format(i + 1, column) for i, column in enumerate(self._columns)),
+        )
+        self._rows = []
+        self._row_count = 0
+        self._batch_count = 0
+        self._seconds = 0.0
+        self._max_commit_seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+    def write(self, row):
+        """
+        :param row: a sequence of the column values
+        """
+        self._rows.append(tuple(row))
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def write_records(self, records):
+        """
+        :param records: an iterable of IngredientRecord, i.e. with the percent amounts filled in by
+        AmountPercentConverter
+        """
+        for record in records:
+            values = record.to_dict()
+            self.write([values[column] for column in self._columns])
+
+    def write_parsed(self, recipe_id, text, parsed_ingredient, percent_amount=None):
+        """
+        :param recipe_id: the recipe of the ingredient line
+        :param text: the ingredient line
+        :param parsed_ingredient: the ParsedIngredient (or None) returned by the IngredientParser for text
+        :param percent_amount: the percent amount of the ingredient in the recipe, if calculated
+        """
+        record = IngredientRecord(recipe_id, text, parsed_ingredient)
+        record.percent_amount = percent_amount
+        self.write_records([record])
+
+    def flush(self):
+        """
+        Inserts the buffered rows in a single transaction.
+
+        :raise BatchWriteError: with the rows of the batch, if the insert or commit failed
+        """
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        start = time.perf_counter()
+        cursor = self._connection.cursor()
+        try:
+            cursor.executemany(self._statement, [dict(zip(self._columns, row)) for row in rows] if self._named
+                               else rows)
+            self._connection.commit()
+        except Exception as e:
+            self._connection.rollback()
+            raise BatchWriteError('Failed to insert a batch of {0} rows: {1}'.format(len(rows), e), rows) from e
+        finally:
+            cursor.close()
+        seconds = time.perf_counter() - start
+        self._row_count += len(rows)
+        self._batch_count += 1
+        self._seconds += seconds
+        self._max_commit_seconds = max(self._max_commit_seconds, seconds)
+
+    def close(self):
+        self.flush()
+
+    def stats(self):
+        """
+        :return: a WriterStats of the rows and batches written so far, the rows inserted per second of insert and
+        commit time, and the mean and maximum time of a batch transaction
+        """
+        return WriterStats(
+            rows=self._row_count,
+            batches=self._batch_count,
+            rows_per_second=self._row_count / self._seconds if self._seconds else 0.0,
+            mean_commit_seconds=self._seconds / self._batch_count if self._batch_count else 0.0,
+            max_commit_seconds=self._max_commit_seconds,
+        )
+
+
+class SqliteWriter(BatchWriter):
+    """
+    BatchWriter of ingredient rows into a sqlite database, creating the table if needed.
+    """
+
+    def __init__(self, path, table=INGREDIENT_TABLE, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        connection = sqlite3.connect(path)
+        connection.execute('CREATE TABLE IF NOT EXISTS {0} (recipe, text TEXT, "primary" TEXT, modifier TEXT, '
+                           'value REAL, unit TEXT, percent_amount REAL)'.format(quote_identifier(table)))
+        connection.commit()
+        BatchWriter.__init__(self, connection, table, INGREDIENT_COLUMNS, batch_size, sqlite3.paramstyle)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            BatchWriter.__exit__(self, exc_type, exc_val, exc_tb)
+        finally:
+            self._connection.close()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._connection.close()
+
+
+def quote_identifier(name):
+    return '"{0}"'.format(name.replace('"', '""'))
@@ -1,5 +1,10 @@
-from unittest import TestCase, main as run_tests
-from recipe_parser.amount_conversions import AmountPercentConverter, MAXIMUM_UNKNOWN_PERCENT_AMOUNT
+from random import Random
+from unittest import TestCase, main as run_tests, skipIf
+from recipe_parser.amount_conversions import AmountPercentConverter, MAXIMUM_UNKNOWN_PERCENT_AMOUNT, \
+    CONVERSION_LOOKUP, UNIT_CODES, UNITLESS_CODE, DEFAULT_DENSITY, UnitConverter, encode_units, numpy
+
+RANDOM_SEED = 42
+RANDOM_RECIPE_COUNT = 500
 
 
 class IngredientRecipe:
@@ -27,5 +32,63 @@ class TestAmountConverter(TestCase):
         self.assertLessEqual(ingredient_recipes[-1].percent_amount, MAXIMUM_UNKNOWN_PERCENT_AMOUNT)
         self.assertAlmostEquals(sum([i.percent_amount for i in ingredient_recipes]), 1)
 
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_batch_conversion(self):
+        rand = Random(RANDOM_SEED)
+        converter = AmountPercentConverter()
+        units = sorted(CONVERSION_LOOKUP) + [None, '']
+        recipes = []
+        for _ in range(RANDOM_RECIPE_COUNT):
+            recipe = [IngredientRecipe(ingredient_amount=rand.choice([None, 0, 1, 2, 0.5, 1.5, 700, 1 / 3]),
+                                       amount_units=rand.choice(units))
+                      for _ in range(rand.randint(1, 15))]
+            converter.calculate_percent_amounts(recipe)
+            recipes.append(recipe)
+        # rows of the recipes interleaved, recipes do not need to be contiguous
+        rows = sorted(((recipe_id, ingredient) for recipe_id, recipe in enumerate(recipes) for ingredient in recipe),
+                      key=lambda row: rand.random())
+        rows.sort(key=lambda row: recipes[row[0]].index(row[1]))
+        percent_amounts = converter.calculate_percent_amounts_batch(
+            [recipe_id for recipe_id, _ in rows],
+            [ingredient.ingredient_amount for _, ingredient in rows],
+            encode_units(ingredient.amount_units for _, ingredient in rows),
+        )
+        numpy.testing.assert_array_equal(percent_amounts, [ingredient.percent_amount for _, ingredient in rows])
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class TestUnitConverter(TestCase):
+
+    def setUp(self):
+        self.converter = UnitConverter(densities={'flour': 0.53})
+
+    def test_volumes_follow_the_cup_table(self):
+        units = sorted(unit for unit in CONVERSION_LOOKUP if unit not in ['pound', 'milligram', 'gram', 'kilogram'])
+        converted = self.converter.convert([1] * len(units), ['cup'] * len(units), 'cup')
+        self.assertTrue(numpy.allclose(converted, 1))
+        for unit in units:
+            self.assertAlmostEqual(self.converter.convert([1], ['cup'], unit)[0], CONVERSION_LOOKUP[unit])
+            self.assertAlmostEqual(self.converter.convert([CONVERSION_LOOKUP[unit]], [unit], 'cup')[0], 1)
+
+    def test_masses(self):
+        self.assertAlmostEqual(self.converter.convert([2], ['lb'], 'gram')[0], 907.18474)
+        self.assertAlmostEqual(self.converter.convert([1500], ['g'], 'kilogram')[0], 1.5)
+
+    def test_densities(self):
+        self.assertAlmostEqual(self.converter.convert([1], ['ml'], 'gram')[0], DEFAULT_DENSITY)
+        grams = self.converter.convert([1, 1, 1], ['ml', 'ml', 'gram'], 'gram', ingredients=['flour', 'salt', 'flour'])
+        self.assertTrue(numpy.allclose(grams, [0.53, DEFAULT_DENSITY, 1]))
+        millilitres = self.converter.convert([0.53, 1], ['gram', 'tsp'], 'millilitre', ingredients=['flour'] * 2)
+        teaspoon = CONVERSION_LOOKUP['millilitre'] / CONVERSION_LOOKUP['teaspoon']
+        self.assertTrue(numpy.allclose(millilitres, [1, teaspoon]))
+
+    def test_codes_and_unknowns(self):
+        codes = numpy.array([UNIT_CODES['cup'], UNITLESS_CODE, UNIT_CODES['cup']])
+        converted = self.converter.convert([1, 1, None], codes, UNIT_CODES['tablespoon'])
+        self.assertEqual(converted[0], 16)
+        self.assertTrue(numpy.isnan(converted[1:]).all())
+        self.assertEqual(encode_units(['tbsp', 'tablespoons', None]), [UNIT_CODES['tablespoon']] * 2 + [UNITLESS_CODE])
+
+
 if __name__ == '__main__':
     run_tests()
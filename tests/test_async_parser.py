@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, skipUnless, main as run_tests
+from recipe_parser.async_parser import AsyncIngredientParser, PROCESS_EXECUTOR
+from recipe_parser.ingredient_parser import IngredientParser
+from tests.test_ingredient_parser import TEST_INGREDIENTS
+
+
+class SlowExecutor(ThreadPoolExecutor):
+    """
+    Thread pool that delays each job and records how many jobs were started and running at once.
+    """
+
+    def __init__(self, max_workers, delay):
+        ThreadPoolExecutor.__init__(self, max_workers)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.started = self.running = self.max_running = 0
+
+    def submit(self, fn, *args, **kwargs):
+        return ThreadPoolExecutor.submit(self, self._slow, fn, *args, **kwargs)
+
+    def _slow(self, fn, *args, **kwargs):
+        with self.lock:
+            self.started += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            return fn(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class FailingExecutor(SlowExecutor):
+    """
+    SlowExecutor of which the second job fails right away.
+    """
+
+    def _slow(self, fn, *args, **kwargs):
+        with self.lock:
+            if self.started == 1:
+                self.started += 1
+                raise ValueError('failed job')
+        return SlowExecutor._slow(self, fn, *args, **kwargs)
+
+
+class TestAsyncIngredientParser(TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.lines = TEST_INGREDIENTS * 3 + ['']
+
+    def tearDown(self):
+        self.loop.close()
+
+    def assert_parsed(self, lines, parsed):
+        parser = IngredientParser.get_parser()
+        self.assertEqual(parsed, [parser(line) for line in lines])
+
+    def test_parse_async(self):
+        with AsyncIngredientParser() as parser:
+            parsed = self.loop.run_until_complete(parser.parse_async(TEST_INGREDIENTS[0]))
+        self.assert_parsed(TEST_INGREDIENTS[:1], [parsed])
+
+    def test_parse_many_async_in_input_order(self):
+        with AsyncIngredientParser(chunk_size=4) as parser:
+            parsed = self.loop.run_until_complete(parser.parse_many_async(self.lines))
+        self.assertIsNone(parsed[-1])
+        self.assert_parsed(self.lines, parsed)
+
+    def test_max_concurrency(self):
+        executor = SlowExecutor(max_workers=8, delay=0.01)
+        parser = AsyncIngredientParser(executor, max_concurrency=2, chunk_size=2)
+
+        async def parse_concurrently():
+            return await asyncio.gather(parser.parse_many_async(self.lines),
+                                        *[parser.parse_async(line) for line in TEST_INGREDIENTS])
+
+        parsed = self.loop.run_until_complete(parse_concurrently())
+        executor.shutdown()
+        self.assert_parsed(self.lines, parsed[0])
+        self.assertEqual(executor.max_running, 2)
+
+    def test_cancellation(self):
+        executor = SlowExecutor(max_workers=1, delay=0.05)
+        parser = AsyncIngredientParser(executor, max_concurrency=1, chunk_size=1)
+        task = asyncio.ensure_future(parser.parse_many_async(self.lines), loop=self.loop)
+        self.loop.call_later(0.08, task.cancel)
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.assertEqual(asyncio.all_tasks(self.loop), set())
+        executor.shutdown()
+        self.assertLess(executor.started, len(self.lines))
+
+    def test_failed_chunk(self):
+        executor = FailingExecutor(max_workers=2, delay=0.05)
+        parser = AsyncIngredientParser(executor, max_concurrency=2, chunk_size=1)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(parser.parse_many_async(self.lines))
+        self.assertEqual(asyncio.all_tasks(self.loop), set())
+        executor.shutdown()
+        self.assertLess(executor.started, len(self.lines))
+
+    def test_cancelled_jobs_hold_their_slot(self):
+        executor = SlowExecutor(max_workers=2, delay=0.05)
+        parser = AsyncIngredientParser(executor, max_concurrency=1)
+
+        async def cancel_and_parse():
+            task = asyncio.ensure_future(parser.parse_async(TEST_INGREDIENTS[0]))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            return await parser.parse_async(TEST_INGREDIENTS[1])
+
+        parsed = self.loop.run_until_complete(cancel_and_parse())
+        executor.shutdown()
+        self.assert_parsed(TEST_INGREDIENTS[1:2], [parsed])
+        self.assertEqual(executor.started, 2)
+        self.assertEqual(executor.max_running, 1)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            AsyncIngredientParser('fiber')
+
+    @skipUnless('fork' in multiprocessing.get_all_start_methods(), 'requires the fork start method')
+    def test_process_executor(self):
+        with AsyncIngredientParser(PROCESS_EXECUTOR, max_workers=2, chunk_size=4) as parser:
+            parsed = self.loop.run_until_complete(parser.parse_many_async(self.lines))
+        self.assert_parsed(self.lines, parsed)
+
+
+if __name__ == '__main__':
+    run_tests()
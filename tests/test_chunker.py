@@ -0,0 +1,62 @@
+from random import Random
+from unittest import TestCase, main as run_tests
+from nltk import RegexpParser
+from nltk.tree import Tree
+from recipe_parser import GRAMMAR
+from recipe_parser.chunker import CompiledChunker, Chunk
+
+RANDOM_SEED = 42
+RAND = Random()
+RAND.seed(RANDOM_SEED)
+RANDOM_TEST_SIZE = 500
+TAGS = ['CD', 'CD', 'MM', 'NN', 'NNS', 'JJ', 'VBN', 'VBD', 'MOD', 'DT', 'PP$', 'IN', 'CC', ',', '(', ')', 'NNP', 'RB']
+
+
+def as_tuples(tree):
+    if isinstance(tree, (Tree, Chunk)):
+        return (tree.label(),) + tuple(as_tuples(child) for child in tree)
+    return tree
+
+
+class TestCompiledChunker(TestCase):
+
+    def assertSameChunks(self, grammar, sentences):
+        expected_parser = RegexpParser(grammar)
+        chunker = CompiledChunker(grammar)
+        for sentence in sentences:
+            self.assertEqual(as_tuples(chunker.parse(sentence)), as_tuples(expected_parser.parse(sentence)),
+                             sentence)
+
+    def random_sentences(self):
+        sentences = []
+        for _ in range(RANDOM_TEST_SIZE):
+            tags = [RAND.choice(TAGS) for _ in range(RAND.randint(1, 12))]
+            sentences.append([('w{0}'.format(i), tag) for i, tag in enumerate(tags)])
+        return sentences
+
+    def test_grammar_agreement(self):
+        self.assertSameChunks(GRAMMAR, self.random_sentences())
+
+    def test_custom_grammar_agreement(self):
+        grammar = r"""
+            NP: {<DT>?<JJ>*<NN.*>+}
+            PP: {<IN><NP>}
+        """
+        self.assertSameChunks(grammar, self.random_sentences())
+
+    def test_fallback_grammar(self):
+        grammar = r"""
+            NP: {<.*>+}
+                }<VBD|IN>+{
+        """
+        self.assertSameChunks(grammar, self.random_sentences())
+
+    def test_chunk_labels(self):
+        parsed = CompiledChunker(GRAMMAR).parse([('2', 'CD'), ('cups', 'MM'), ('flour', 'NN')])
+        self.assertEqual(parsed.label(), 'S')
+        self.assertEqual([chunk.label() for chunk in parsed], ['Amount', 'NPI'])
+        self.assertEqual(parsed[0], [('2', 'CD'), ('cups', 'MM')])
+
+
+if __name__ == '__main__':
+    run_tests()
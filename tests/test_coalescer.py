@@ -0,0 +1,57 @@
+import threading
+from unittest import TestCase, main as run_tests
+from recipe_parser.coalescer import CoalescingParser
+from recipe_parser.ingredient_parser import IngredientParser
+from tests.test_ingredient_parser import TEST_INGREDIENTS
+
+
+class TestCoalescingParser(TestCase):
+
+    def setUp(self):
+        self.expected = {line: IngredientParser.get_parser()(line) for line in TEST_INGREDIENTS + ['']}
+
+    def test_concurrent_requests(self):
+        results = {}
+        with CoalescingParser(max_batch_lines=1000, max_wait_ms=200) as parser:
+            threads = [threading.Thread(target=lambda l=line: results.__setitem__(l, parser.parse(l)))
+                       for line in self.expected]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, self.expected)
+        stats = parser.stats()
+        self.assertEqual(stats.requests, len(self.expected))
+        self.assertEqual(stats.lines, len(self.expected))
+        self.assertLess(stats.batches, stats.requests)
+        self.assertLessEqual(stats.mean_wait_seconds, stats.max_wait_seconds)
+
+    def test_max_batch_lines(self):
+        with CoalescingParser(max_batch_lines=4, max_wait_ms=1000) as parser:
+            futures = [parser.submit([line]) for line in TEST_INGREDIENTS * 2]
+        parsed = [future.result() for future in futures]
+        self.assertEqual(parsed, [[self.expected[line]] for line in TEST_INGREDIENTS * 2])
+        # full batches of 4 lines, and the remainder when the parser is closed
+        self.assertEqual(parser.stats().batches, -(-len(futures) // 4))
+
+    def test_parse_lines_in_order(self):
+        with CoalescingParser(max_wait_ms=0) as parser:
+            self.assertEqual(parser.parse_lines(TEST_INGREDIENTS), [self.expected[line] for line in TEST_INGREDIENTS])
+
+    def test_cancelled_request_is_not_parsed(self):
+        with CoalescingParser(max_batch_lines=1000, max_wait_ms=100) as parser:
+            cancelled = parser.submit(TEST_INGREDIENTS)
+            self.assertTrue(cancelled.cancel())
+            self.assertEqual(parser.parse(TEST_INGREDIENTS[0]), self.expected[TEST_INGREDIENTS[0]])
+        self.assertEqual(parser.stats().lines, 1)
+
+    def test_closed(self):
+        parser = CoalescingParser()
+        parser.close()
+        parser.close()
+        with self.assertRaises(RuntimeError):
+            parser.parse(TEST_INGREDIENTS[0])
+
+
+if __name__ == '__main__':
+    run_tests()
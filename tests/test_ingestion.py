@@ -0,0 +1,81 @@
+import json
+import os
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main as run_tests
+from recipe_parser.ingestion import iter_json_values, RecipeIngestor, Checkpoint
+
+RECIPES = [
+    dict(id=1, ingredients=['1/2 cup vegetable oil', '3 pounds chicken breast', '1 tablespoon salt']),
+    dict(id=2, ingredients=['4 small red potatoes', '1 1/2 tbl pepper']),
+    dict(id='thrée', ingredients=['1 green pepper', '5 banana peppers', '1 red pepper']),
+    dict(id=4),
+]
+
+
+class TestJsonStreaming(TestCase):
+
+    def test_array_and_jsonl_inputs(self):
+        array_data = json.dumps(RECIPES, indent=2).encode('utf-8')
+        jsonl_data = '\n'.join(json.dumps(r) for r in RECIPES).encode('utf-8')
+        for data in [array_data, jsonl_data]:
+            values = list(iter_json_values(BytesIO(data)))
+            self.assertEqual([v for v, _ in values], RECIPES)
+
+    def test_resume_from_offset(self):
+        data = json.dumps(RECIPES, ensure_ascii=False).encode('utf-8')
+        offsets = [offset for _, offset in iter_json_values(BytesIO(data))]
+        for i, offset in enumerate(offsets):
+            self.assertEqual([v for v, _ in iter_json_values(BytesIO(data), offset)], RECIPES[i + 1:])
+
+
+class TestRecipeIngestor(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, 'recipes.jsonl')
+        self.output_path = os.path.join(self.directory.name, 'ingredients.jsonl')
+        self.checkpoint_path = self.output_path + '.checkpoint'
+        with open(self.input_path, 'w') as f:
+            f.write('\n'.join(json.dumps(r) for r in RECIPES))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read_output(self):
+        with open(self.output_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_ingestion(self):
+        ingestor = RecipeIngestor(recipes_per_batch=2)
+        self.assertEqual(ingestor.run([self.input_path], self.output_path, self.checkpoint_path), len(RECIPES))
+        records = self._read_output()
+        self.assertEqual(len(records), sum(len(r.get('ingredients', [])) for r in RECIPES))
+        for recipe in RECIPES[:-1]:
+            recipe_records = [r for r in records if r['recipe'] == recipe['id']]
+            self.assertEqual([r['text'] for r in recipe_records], recipe['ingredients'])
+            self.assertTrue(all(r['percent_amount'] is not None for r in recipe_records))
+        self.assertAlmostEqual(sum(r['percent_amount'] for r in records if r['recipe'] == 1), 1)
+        self.assertEqual(records[0]['primary'], 'oil')
+        self.assertEqual(records[0]['unit'], 'cup')
+        self.assertEqual(records[0]['value'], 0.5)
+
+    def test_resume(self):
+        RecipeIngestor().run([self.input_path], self.output_path, self.checkpoint_path)
+        expected = self._read_output()
+        with open(self.input_path, 'rb') as f:
+            first_offset = next(iter_json_values(f))[1]
+        with open(self.output_path, 'rb') as f:
+            output_offset = len(b''.join(f.readlines()[:len(RECIPES[0]['ingredients'])]))
+        # simulate a crash after the first recipe was checkpointed and part of the second one was written
+        Checkpoint([self.input_path], 0, first_offset, output_offset).save(self.checkpoint_path)
+        with open(self.output_path, 'r+b') as f:
+            f.truncate(output_offset + 10)
+        RecipeIngestor(recipes_per_batch=1, checkpoint_interval=1).run(
+            [self.input_path], self.output_path, self.checkpoint_path, resume=True)
+        self.assertEqual(self._read_output(), expected)
+        self.assertEqual(Checkpoint.load(self.checkpoint_path).file_index, 1)
+
+
+if __name__ == '__main__':
+    run_tests()
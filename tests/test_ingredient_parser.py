@@ -1,5 +1,11 @@
+import gc
+import pickle
 from unittest import TestCase, main as run_tests
-from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser import GRAMMAR
+from recipe_parser.chunker import Chunk
+from recipe_parser.amount_conversions import AmountPercentConverter
+from recipe_parser.ingestion import IngredientRecord
+from recipe_parser.ingredient_parser import IngredientParser, ParsedIngredient, ParsedRecipe, Ingredient, Amount
 
 DEBUG_PRINT = True
 
@@ -36,6 +42,128 @@ class TestIngredientParser(TestCase):
             self.assertEqual(ingredient_data.amount.value, expected_amount['value'])
             self.assertEqual(ingredient_data.amount.unit, expected_amount['unit'])
 
+    def test_batch_parser(self):
+        batch_parser = IngredientParser.get_batch_parser()
+        lines = TEST_INGREDIENTS + ['']
+        parsed = list(batch_parser(lines, batch_size=4))
+        self.assertEqual(len(parsed), len(lines))
+        self.assertIsNone(parsed[-1])
+        for ingredient_text, ingredient_data in zip(TEST_INGREDIENTS, parsed):
+            expected = self.parser(ingredient_text)
+            self.assertEqual(ingredient_data.ingredient.primary, expected.ingredient.primary)
+            self.assertEqual(ingredient_data.ingredient.modifier, expected.ingredient.modifier)
+            self.assertEqual(ingredient_data.amount.value, expected.amount.value)
+            self.assertEqual(ingredient_data.amount.unit, expected.amount.unit)
+
+    def test_fast_path(self):
+        parser = IngredientParser(GRAMMAR.strip(), fast_path=True)
+        for ingredient_text, expected_ingredient, expected_amount in \
+                zip(TEST_INGREDIENTS, EXPECTED_INGREDIENTS, EXPECTED_AMOUNTS):
+            ingredient_data = parser.parse(ingredient_text)
+            self.assertEqual(ingredient_data.ingredient.primary, expected_ingredient['ingredient'])
+            self.assertEqual(ingredient_data.ingredient.modifier, expected_ingredient['modifiers'])
+            self.assertEqual(ingredient_data.amount.value, expected_amount['value'])
+            self.assertEqual(ingredient_data.amount.unit, expected_amount['unit'])
+        info = parser.fast_path_info()
+        self.assertEqual(info.hits, len(FAST_PATH_INGREDIENTS))
+        self.assertEqual(info.hits + info.fallbacks, len(TEST_INGREDIENTS))
+
+    def test_fast_path_shadowing(self):
+        parser = IngredientParser(GRAMMAR.strip(), fast_path=True, shadow_rate=1.0)
+        list(parser.parse_many(TEST_INGREDIENTS))
+        info = parser.fast_path_info()
+        self.assertEqual(info.shadowed, len(FAST_PATH_INGREDIENTS))
+        self.assertEqual(info.disagreements, 0)
+
+    def test_result_types(self):
+        parsed = self.parser('1 (4 ounce) can chopped green peppers')
+        for value in [parsed, parsed.ingredient, parsed.amount]:
+            self.assertFalse(hasattr(value, '__dict__'))
+            with self.assertRaises(AttributeError):
+                value.unit = 'cup'
+        self.assertIsInstance(parsed.amounts, tuple)
+        self.assertGreater(len(parsed.amounts), 1)
+        unpickled = pickle.loads(pickle.dumps(parsed))
+        self.assertEqual(unpickled, parsed)
+        self.assertIs(unpickled.amount.unit, parsed.amount.unit)
+        self.assertEqual(ParsedIngredient(Ingredient(primary='salt'), [Amount(value=1, unit='cup')]).amount,
+                         Amount(value=1, unit='cup'))
+
+    def test_results_hold_no_trees(self):
+        parsed = self.parser('4 (4 pounds) skinless, boneless chicken breasts')
+        seen, pending = set(), [parsed]
+        while pending:
+            value = pending.pop()
+            self.assertNotIsInstance(value, (Chunk, list))
+            if id(value) not in seen:
+                seen.add(id(value))
+                pending.extend(r for r in gc.get_referents(value) if not isinstance(r, type))
+
+    def test_selected_amount_only(self):
+        parser = IngredientParser.get_parser(keep_amounts=False)
+        parsed = parser('1 (4 ounce) can chopped green peppers')
+        self.assertIsNone(parsed.amounts)
+        self.assertEqual(parsed.amount, self.parser('1 (4 ounce) can chopped green peppers').amount)
+
+    def test_parentheticals_are_tagged_once(self):
+        parsed = self.parser('4 (4 pounds) skinless, boneless chicken breasts')
+        self.assertEqual(len(parsed.amounts), len(set(parsed.amounts)))
+        self.assertEqual(parsed.amounts[0], Amount(value=4, unit='pound'))
+        segments = IngredientParser._split_line('1 (14.5 oz) can diced tomatoes, drained')
+        self.assertEqual(segments.amounts, ['14.5 oz'])
+        self.assertNotIn('14', segments.ingredient)
+        self.assertEqual(segments.note, 'drained')
+
+    def test_trailing_notes(self):
+        self.assertEqual(self.parser('salt to taste').ingredient.primary, 'salt')
+        self.assertIsNone(IngredientParser._split_line('salt to taste').note)
+        parsed = self.parser('1 onion, chopped')
+        self.assertEqual(parsed.ingredient.primary, 'onion')
+        self.assertEqual(parsed.ingredient.modifier, 'chopped')
+        self.assertEqual(parsed.amount.value, 1)
+
+    def test_thousands_separators(self):
+        for text, value, unit in [('1,000 g flour', 1000, 'gram'), ('1,500 ml water', 1500, 'millilitre')]:
+            parsed = self.parser(text)
+            self.assertEqual(parsed.amounts, (Amount(value=value, unit=unit),))
+            self.assertIsNone(IngredientParser._split_line(text).note)
+
+    def test_parenthetical_amounts(self):
+        parsed = self.parser('(1 cup)')
+        self.assertEqual(parsed.amounts, (Amount(value=1, unit='cup'),))
+        parsed = self.parser('2 (14 oz) cans tomatoes')
+        self.assertEqual(parsed.ingredient.primary, 'tomato')
+        self.assertEqual(parsed.amounts, (Amount(value=14, unit='ounce'), Amount(value=2, unit='can')))
+        batch_parser = IngredientParser.get_batch_parser()
+        self.assertEqual(list(batch_parser(['(1 cup)', '2 (14 oz) cans tomatoes'])),
+                         [self.parser('(1 cup)'), parsed])
+
+    def test_note_ingredients_are_not_merged(self):
+        parsed = self.parser('salt, pepper, and garlic powder')
+        self.assertEqual(parsed.ingredient.primary, 'salt')
+        self.assertNotIn('pepper', parsed.ingredient.modifier)
+        parsed = self.parser('4 (4 pounds) skinless, boneless chicken breasts')
+        self.assertEqual(parsed.ingredient.primary, 'chicken breast')
+
+    def test_parse_recipe(self):
+        lines = TEST_INGREDIENTS + ['']
+        recipe = IngredientParser.get_recipe_parser()(lines)
+        self.assertIsInstance(recipe, ParsedRecipe)
+        self.assertEqual(len(recipe), len(lines))
+        self.assertEqual(list(recipe.ingredients), list(IngredientParser.get_batch_parser()(lines)))
+        self.assertIsNone(recipe.percent_amounts[-1])
+        records = [IngredientRecord(0, line, parsed_ingredient)
+                   for line, parsed_ingredient in zip(lines, recipe.ingredients) if parsed_ingredient is not None]
+        AmountPercentConverter().calculate_percent_amounts(records)
+        self.assertEqual(list(recipe.percent_amounts[:-1]), [record.percent_amount for record in records])
+        self.assertAlmostEqual(sum(percent_amount for _, percent_amount in recipe if percent_amount), 1)
+        self.assertEqual(pickle.loads(pickle.dumps(recipe)), recipe)
+        self.assertEqual(len(IngredientParser.get_recipe_parser()([])), 0)
+
+    def test_fast_path_requires_default_grammar(self):
+        with self.assertRaises(ValueError):
+            IngredientParser('NP: {<NN>+}', fast_path=True)
+
 
 TEST_INGREDIENTS = [
     '1/2 cup vegetable oil',
@@ -48,6 +176,12 @@ TEST_INGREDIENTS = [
     '5 banana peppers',
     '1 red pepper',
 ]
+# the TEST_INGREDIENTS of the '<amount> <unit> <ingredient>' shape
+FAST_PATH_INGREDIENTS = [
+    '3 pounds chicken breast',
+    '1 tablespoon salt',
+    '1 1/2 tbl pepper',
+]
 
 EXPECTED_INGREDIENTS = [
     dict(modifiers='vegetable', ingredient='oil'),
@@ -0,0 +1,63 @@
+from unittest import TestCase, main as run_tests
+from nltk import sent_tokenize
+from recipe_parser import TOKENIZER, INGREDIENT_TOKENIZER, INGREDIENT_TOKENIZER_MODE
+from recipe_parser.ingredient_parser import IngredientParser, TEXT_CLEANER
+
+
+class TestIngredientTokenizer(TestCase):
+
+    def test_agreement_with_treebank(self):
+        for text in AGREEMENT_INPUT:
+            expected = TOKENIZER(sent_tokenize(text)[0])
+            self.assertEqual(INGREDIENT_TOKENIZER(text), expected, text)
+
+    def test_agreement_on_cleaned_text(self):
+        for text in AGREEMENT_INPUT:
+            cleaned = text.lower().translate(TEXT_CLEANER)
+            self.assertEqual(INGREDIENT_TOKENIZER(cleaned), TOKENIZER(sent_tokenize(cleaned)[0]), cleaned)
+
+    def test_ingredient_tokens(self):
+        for text, expected in EXPECTED_TOKENS:
+            self.assertEqual(INGREDIENT_TOKENIZER(text), expected)
+
+    def test_parser_agreement(self):
+        treebank_parser = IngredientParser.get_parser()
+        ingredient_parser = IngredientParser.get_parser(tokenizer=INGREDIENT_TOKENIZER_MODE)
+        for text in AGREEMENT_INPUT:
+            parsed, expected = ingredient_parser(text), treebank_parser(text)
+            self.assertEqual(parsed.ingredient.primary, expected.ingredient.primary, text)
+            self.assertEqual(parsed.ingredient.modifier, expected.ingredient.modifier, text)
+            self.assertEqual([(a.value, a.unit) for a in parsed.amounts or ()],
+                             [(a.value, a.unit) for a in expected.amounts or ()], text)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            IngredientParser.get_parser(tokenizer='unknown')
+
+
+AGREEMENT_INPUT = [
+    '1 (4 ounce) can chopped green peppers',
+    '1/2 cup white sugar',
+    '2-3 cloves garlic, minced',
+    '1 1/2 teaspoons baking powder',
+    '0.5 lb. ground beef',
+    '1,000 grams flour',
+    '2 tbsp. olive oil, divided',
+    '3 large eggs, beaten',
+    'salt and pepper to taste',
+    'one (8 oz.) package cream cheese, softened',
+    "1 cup confectioners' sugar",
+    '1 pinch cayenne pepper (optional)',
+    '4 skinless, boneless chicken breast halves - cut into cubes',
+    '1/4 teaspoon salt',
+]
+
+EXPECTED_TOKENS = [
+    # unlike the treebank tokenizer, a unit abbreviation at the end of the line keeps its period
+    ('2 tbsp.', ['2', 'tbsp.']),
+    ('1 (8 oz.) package', ['1', '(', '8', 'oz.', ')', 'package']),
+    ('2-3 1/2 cups', ['2-3', '1/2', 'cups']),
+]
+
+if __name__ == '__main__':
+    run_tests()
@@ -0,0 +1,75 @@
+from unittest import TestCase, main as run_tests
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.instrumentation import InMemoryInstrumentation, PrometheusExporter, NO_INSTRUMENTATION, STAGES, \
+    set_instrumentation, get_instrumentation, LINES_COUNTER, FAILURES_COUNTER, FALLBACK_TOKENS_COUNTER, \
+    QUANTITY_JOINED_COUNTER, QUANTITY_TOKENS_COUNTER, TAG_STAGE, TOKENIZE_STAGE
+
+LINES = ['2 cups of vegetable oil', '1 (14.5 ounce) can diced tomatoes', '1 1/2 cups sugar', '']
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        self.instrumentation = InMemoryInstrumentation()
+        self.previous = set_instrumentation(self.instrumentation)
+        self.parser = IngredientParser(GRAMMAR.strip())
+
+    def tearDown(self):
+        set_instrumentation(self.previous)
+
+    def test_default_is_disabled(self):
+        set_instrumentation(None)
+        self.assertIs(get_instrumentation(), NO_INSTRUMENTATION)
+        self.assertFalse(get_instrumentation().enabled)
+
+    def test_parse(self):
+        for line in LINES:
+            self.parser.parse(line)
+        timings = self.instrumentation.timings()
+        self.assertEqual(set(timings), set(STAGES))
+        # the parenthetical is tagged on its own, the empty line fails to tokenize
+        self.assertEqual(timings[TAG_STAGE].count, len(LINES))
+        for stage_timings in timings.values():
+            self.assertLessEqual(stage_timings.max_seconds, stage_timings.total_seconds)
+        counters = self.instrumentation.counters()
+        self.assertEqual(counters[LINES_COUNTER], len(LINES))
+        self.assertEqual(counters[FAILURES_COUNTER], 1)
+        self.assertGreater(counters[FALLBACK_TOKENS_COUNTER], 0)
+        self.assertGreater(counters[QUANTITY_JOINED_COUNTER], 0)
+        self.assertNotIn(QUANTITY_TOKENS_COUNTER, counters)
+
+    def test_parse_many(self):
+        list(self.parser.parse_many(LINES, batch_size=2))
+        timings = self.instrumentation.timings()
+        self.assertEqual(set(timings), set(STAGES))
+        # each batch is observed once, for the lines it tokenized and the lines it tagged
+        self.assertEqual(timings[TOKENIZE_STAGE].count, len(LINES))
+        self.assertEqual(timings[TAG_STAGE].count, len(LINES) - 1)
+        self.assertLessEqual(timings[TAG_STAGE].max_seconds, timings[TAG_STAGE].total_seconds)
+        counters = self.instrumentation.counters()
+        self.assertEqual(counters[LINES_COUNTER], len(LINES))
+        self.assertEqual(counters[FAILURES_COUNTER], 1)
+
+    def test_reset(self):
+        self.parser.parse(LINES[0])
+        self.instrumentation.reset()
+        self.assertEqual(self.instrumentation.timings(), {})
+        self.assertEqual(self.instrumentation.counters(), {})
+
+    def test_prometheus_exporter(self):
+        self.parser.parse(LINES[0])
+        text = PrometheusExporter(self.instrumentation, namespace='test').render()
+        lines = text.splitlines()
+        self.assertIn('# TYPE test_stage_seconds summary', lines)
+        self.assertIn('test_stage_seconds_count{stage="tag"} 1', lines)
+        self.assertIn('# TYPE test_lines_total counter', lines)
+        self.assertIn('test_lines_total 1', lines)
+        for line in lines:
+            if not line.startswith('#'):
+                float(line.rsplit(' ', 1)[1])
+        self.assertEqual(PrometheusExporter(InMemoryInstrumentation()).render(), '')
+
+
+if __name__ == '__main__':
+    run_tests()
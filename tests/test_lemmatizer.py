@@ -0,0 +1,65 @@
+from unittest import TestCase, main as run_tests
+from recipe_parser import LEMMATIZER
+from recipe_parser.lemma_table import LEMMA_TABLE
+from recipe_parser.lemmatizer import CachedLemmatizer, lemma_vocabulary
+
+
+class CountingLemmatizer:
+    """
+    Strips a plural 's' and counts the calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, word, pos='n'):
+        self.calls += 1
+        return word[:-1] if word.endswith('s') else word
+
+
+class TestCachedLemmatizer(TestCase):
+
+    def setUp(self):
+        self.backend = CountingLemmatizer()
+        self.lemmatizer = CachedLemmatizer(self.backend, cache_size=2, vocabulary=['cups', 'onions'])
+        self.backend.calls = 0
+
+    def test_table(self):
+        self.assertEqual(self.lemmatizer.lemmatize('cups'), 'cup')
+        self.assertEqual(self.lemmatizer.lemmatize('onions'), 'onion')
+        self.assertEqual(self.backend.calls, 0)
+        self.assertEqual(self.lemmatizer.info().table_hits, 2)
+
+    def test_bounded_cache(self):
+        for word in ['apples', 'apples', 'pears', 'plums', 'apples']:
+            self.assertEqual(self.lemmatizer.lemmatize(word), word[:-1])
+        info = self.lemmatizer.info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (1, 4, 2, 2))
+        self.assertEqual(self.backend.calls, 4)
+
+    def test_other_parts_of_speech_skip_the_table(self):
+        self.lemmatizer.lemmatize('cups', pos='v')
+        self.assertEqual(self.backend.calls, 1)
+
+    def test_clear(self):
+        self.lemmatizer.lemmatize('apples')
+        self.lemmatizer.clear()
+        self.assertEqual(self.lemmatizer.info(), (0, 0, 0, 2, 0))
+
+    def test_default_table_skips_wordnet(self):
+        lemmatizer = CachedLemmatizer()
+        for word in lemma_vocabulary():
+            self.assertEqual(lemmatizer.lemmatize(word), LEMMA_TABLE[word])
+        info = lemmatizer.info()
+        self.assertEqual((info.table_hits, info.misses), (len(LEMMA_TABLE), 0))
+
+    def test_table_covers_vocabulary(self):
+        self.assertEqual(sorted(LEMMA_TABLE), lemma_vocabulary())
+
+    def test_vocabulary_matches_wordnet(self):
+        for word in lemma_vocabulary():
+            self.assertEqual(LEMMATIZER.lemmatize(word), LEMMATIZER._lemmatizer.lemmatize(word), word)
+
+
+if __name__ == '__main__':
+    run_tests()
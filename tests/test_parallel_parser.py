@@ -0,0 +1,42 @@
+import multiprocessing
+from unittest import TestCase, skipUnless, main as run_tests
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.parallel_parser import ParallelIngredientParser
+from tests.test_ingredient_parser import TEST_INGREDIENTS
+
+
+@skipUnless('fork' in multiprocessing.get_all_start_methods(), 'requires the fork start method')
+class TestParallelIngredientParser(TestCase):
+
+    def test_results_in_input_order(self):
+        parser = IngredientParser.get_parser()
+        lines = TEST_INGREDIENTS * 3 + ['']
+        with ParallelIngredientParser(processes=2, chunk_size=4) as parallel_parser:
+            parsed = list(parallel_parser.parse_many(lines))
+        self.assertEqual(len(parsed), len(lines))
+        self.assertIsNone(parsed[-1])
+        for ingredient_text, ingredient_data in zip(lines[:-1], parsed):
+            expected = parser(ingredient_text)
+            self.assertEqual(ingredient_data.ingredient.primary, expected.ingredient.primary)
+            self.assertEqual(ingredient_data.ingredient.modifier, expected.ingredient.modifier)
+            self.assertEqual(ingredient_data.amount.value, expected.amount.value)
+            self.assertEqual(ingredient_data.amount.unit, expected.amount.unit)
+
+    def test_lines_are_read_as_results_are_consumed(self):
+        read = []
+
+        def lines():
+            for i in range(1000):
+                read.append(i)
+                yield TEST_INGREDIENTS[i % len(TEST_INGREDIENTS)]
+
+        with ParallelIngredientParser(processes=2, chunk_size=4) as parallel_parser:
+            parsed = parallel_parser.parse_many(lines())
+            next(parsed)
+            # at most twice the number of processes chunks, and the chunk being read
+            self.assertLessEqual(len(read), (2 * 2 + 1) * 4)
+            self.assertEqual(len(list(parsed)), 999)
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -0,0 +1,102 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main as run_tests
+from unittest.mock import patch
+from recipe_parser import GRAMMAR
+from recipe_parser.ingredient_tagger import IngredientRegexpTagger
+from recipe_parser.quantity import QuantityRecognizer
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.parse_cache import LRUParseCache, SqliteParseCache, MISSING, parse_cache_fingerprint
+
+
+class TestLRUParseCache(TestCase):
+
+    def test_eviction_order(self):
+        cache = LRUParseCache(2)
+        cache.put('a', 1)
+        cache.put('b', None)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), (2, 1, 1, 2, 2))
+
+
+class TestCachedIngredientParser(TestCase):
+
+    def setUp(self):
+        self.parser = IngredientParser.get_instance(cache_size=2)
+        self.parser._cache.clear()
+
+    def test_normalized_key(self):
+        parsed = self.parser.parse('1 Tablespoon salt')
+        self.assertIs(self.parser.parse('1 TableSpoon salt!'), parsed)
+        self.assertEqual(self.parser.cache_info().hits, 1)
+        expected = IngredientParser.get_parser()('1 tablespoon salt')
+        self.assertEqual(parsed.ingredient.primary, expected.ingredient.primary)
+
+    def test_results_are_frozen(self):
+        parsed = self.parser.parse('1/2 cup vegetable oil')
+        with self.assertRaises(AttributeError):
+            parsed.amount = None
+        with self.assertRaises(AttributeError):
+            parsed.ingredient.primary = 'water'
+        self.assertIsInstance(parsed.amounts, tuple)
+
+    def test_batch_parser(self):
+        lines = ['1 tablespoon salt', '', '1 Tablespoon salt', '1 red pepper', '1 green pepper']
+        parsed = list(self.parser.parse_many(lines))
+        self.assertIsNone(parsed[1])
+        self.assertIs(parsed[0], parsed[2])
+        self.assertEqual([p.ingredient.primary for p in parsed[3:]], ['red pepper', 'green pepper'])
+        self.assertEqual(self.parser.cache_info().evictions, 2)
+
+
+class TestSqliteParseCache(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'parse_cache.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persisted_across_instances(self):
+        cache = SqliteParseCache(self.path)
+        cache.put_many([('a', (1, 'cup')), ('b', None)])
+        cache.close()
+        cache = SqliteParseCache(self.path)
+        self.assertEqual(cache.get('a'), (1, 'cup'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIs(cache.get('c'), MISSING)
+        self.assertEqual(cache.info(), (2, 1, 0, None, 2))
+
+    def test_fingerprint_invalidates(self):
+        self.assertNotEqual(parse_cache_fingerprint(GRAMMAR), parse_cache_fingerprint(GRAMMAR + ' '))
+        SqliteParseCache(self.path).put('a', 1)
+        cache = SqliteParseCache(self.path, parse_cache_fingerprint(GRAMMAR + ' '))
+        self.assertIs(cache.get('a'), MISSING)
+        cache.purge_stale()
+        self.assertIs(SqliteParseCache(self.path).get('a'), MISSING)
+
+    def test_fingerprint_covers_parsing_rules(self):
+        fingerprint = parse_cache_fingerprint()
+        with patch.object(IngredientRegexpTagger, 'patterns', IngredientRegexpTagger.patterns + [(r'.*ly$', 'RB')]):
+            self.assertNotEqual(parse_cache_fingerprint(), fingerprint)
+        with patch.object(QuantityRecognizer, 'RANGE_SEPARATOR', r'\s*-\s*'):
+            self.assertNotEqual(parse_cache_fingerprint(), fingerprint)
+        self.assertEqual(parse_cache_fingerprint(), fingerprint)
+
+    def test_parser_results_are_persisted(self):
+        parsed = IngredientParser.get_parser(cache_path=self.path)('1 tablespoon salt')
+        cache = SqliteParseCache(self.path, parse_cache_fingerprint(GRAMMAR.strip()))
+        cached = cache.get('1 tablespoon salt')
+        self.assertEqual(cached.ingredient.primary, parsed.ingredient.primary)
+        self.assertEqual(cached.amount.value, parsed.amount.value)
+        self.assertEqual(cached.amount.unit, parsed.amount.unit)
+        with self.assertRaises(AttributeError):
+            cached.amount = None
+
+
+if __name__ == '__main__':
+    run_tests()
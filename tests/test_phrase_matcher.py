@@ -0,0 +1,48 @@
+from unittest import TestCase, main as run_tests
+from recipe_parser import PHRASE_MATCHER, GRAMMAR, TAGGER
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.ingredient_tagger import MEASUREMENT_TAG, FRACTION_TAG
+from recipe_parser.phrase_matcher import PhraseMatcher
+
+
+class TestPhraseMatcher(TestCase):
+
+    def test_longest_match(self):
+        matcher = PhraseMatcher(['fluid ounce', 'fluid ounce can', 'one half', 'cup'])
+        self.assertEqual(matcher.merge('2 fluid ounce can of milk'.split()), ['2', 'fluid ounce can', 'of', 'milk'])
+        self.assertEqual(matcher.merge('2 fluid ounce milk'.split()), ['2', 'fluid ounce', 'milk'])
+        self.assertEqual(matcher.merge('one one half fluid'.split()), ['one', 'one half', 'fluid'])
+        self.assertEqual(matcher.phrases, ['fluid ounce', 'fluid ounce can', 'one half'])
+
+    def test_tokens_without_phrases(self):
+        tokens = '1 cup flour'.split()
+        self.assertIs(PHRASE_MATCHER.merge(tokens), tokens)
+
+    def test_merged_phrases_are_tagged(self):
+        for text, expected in MERGED_TAGS:
+            self.assertEqual([tag for _, tag in TAGGER.tag(PHRASE_MATCHER.merge(text.split()))], expected, text)
+
+    def test_multi_token_units(self):
+        parser = IngredientParser.get_parser()
+        fast_path_parser = IngredientParser(GRAMMAR.strip(), fast_path=True)
+        for text, unit in MULTI_TOKEN_UNITS:
+            self.assertEqual(parser(text).amount.unit, unit, text)
+            self.assertEqual(fast_path_parser.parse(text), parser(text), text)
+
+
+MERGED_TAGS = [
+    ('2 fluid ounces', [FRACTION_TAG, MEASUREMENT_TAG]),
+    ('1 fl pt', [FRACTION_TAG, MEASUREMENT_TAG]),
+    ('one half cup', [FRACTION_TAG, MEASUREMENT_TAG]),
+]
+
+MULTI_TOKEN_UNITS = [
+    ('2 fluid ounces vegetable oil', 'ounce'),
+    ('1 fl pt milk', 'pint'),
+    ('1 fl. qt milk', 'quart'),
+    ('3 fluid quarts chicken stock', 'quart'),
+    ('1 (4 fluid ounce) can tomato paste', 'ounce'),
+]
+
+if __name__ == '__main__':
+    run_tests()
@@ -0,0 +1,69 @@
+from fractions import Fraction
+from unittest import TestCase, main as run_tests
+from recipe_parser import QUANTITY_RECOGNIZER
+from recipe_parser.ingredient_parser import IngredientParser
+
+
+class TestQuantityRecognizer(TestCase):
+
+    def test_quantities(self):
+        for text, expected in QUANTITIES:
+            quantity = QUANTITY_RECOGNIZER(text)
+            self.assertEqual(quantity, (Fraction(expected), Fraction(expected)), text)
+
+    def test_ranges(self):
+        for text, low, high in RANGES:
+            self.assertEqual(QUANTITY_RECOGNIZER(text), (Fraction(low), Fraction(high)), text)
+
+    def test_not_quantities(self):
+        for text in ['', 'cup', 'hundred', 'thousand', 'million and one', '1/0', '1 2', 'halfway', 'to']:
+            self.assertIsNone(QUANTITY_RECOGNIZER(text), text)
+
+    def test_parsed_amounts(self):
+        parser = IngredientParser.get_parser()
+        for text, value in PARSED_AMOUNTS:
+            self.assertEqual(parser(text).amount.value, Fraction(value), text)
+
+
+QUANTITIES = [
+    ('2', 2),
+    ('0.5', '1/2'),
+    ('1/2', '1/2'),
+    ('1 1/2', '3/2'),
+    ('1-1/2', '3/2'),
+    ('1 and 1/2', '3/2'),
+    ('1½', '3/2'),
+    ('½', '1/2'),
+    ('⅓', '1/3'),
+    ('twenty five', 25),
+    ('twenty-five', 25),
+    ('one hundred', 100),
+    ('half', '1/2'),
+    ('one half', '1/2'),
+    ('three quarters', '3/4'),
+    ('one and a half', '3/2'),
+    ('a', 1),
+    ('an', 1),
+    ('single', 1),
+]
+
+RANGES = [
+    ('2-3', 2, 3),
+    ('2 to 3', 2, 3),
+    ('2 or 3', 2, 3),
+    ('1/2-1', '1/2', 1),
+    ('1 1/2-2', '3/2', 2),
+    ('twenty-five to thirty', 25, 30),
+]
+
+# lines of tokens tagged by the vocabularies and regexps, so the amounts do not depend on the POS backend
+PARSED_AMOUNTS = [
+    ('2-3 pounds chicken', 2),
+    ('1-1/2 pounds beef', '3/2'),
+    ('0.5 pound shrimp', '1/2'),
+    ('½ cup potatoes', '1/2'),
+    ('1½ pounds salmon', '3/2'),
+]
+
+if __name__ == '__main__':
+    run_tests()
@@ -1,11 +1,15 @@
+import subprocess
+import sys
 from unittest import TestCase, main as run_tests
-from recipe_parser import TAGGER
+from recipe_parser import TAGGER, get_tagger, get_cascade_tagger
 from recipe_parser.ingredient_tagger import MEASUREMENT_TAG as MEASUREMENT, FRACTION_TAG as FRACTION,\
     MAIN_INGREDIENT_TAG as MAIN_INGREDIENT
 from recipe_parser import TOKENIZER
 from nltk import sent_tokenize
-from recipe_parser.ingredient_tagger import MEASUREMENTS, NUMERICAL
+from nltk.tag import SequentialBackoffTagger
+from recipe_parser.ingredient_tagger import register_pos_backend
 from random import Random
+from benchmarks.vocabulary import RANDOM_AMOUNTS, RANDOM_UNITS, RANDOM_MODIFIERS, RANDOM_INGREDIENTS
 
 RANDOM_SEED = 42
 RAND = Random()
@@ -43,6 +47,74 @@ class TestIngredientTagger(TestCase):
             self.assertTrue(tagged[2][1] not in ['CD', 'MM'])
             self.assertTrue(tagged[-1][1] in ['NN', 'NNS'])
 
+    def test_fused_tagger_matches_cascade(self):
+        # the backend does not depend on the tag history, so the fused tagger tags every token as the cascade does
+        register_pos_backend('suffix', SuffixTagger)
+        for text in TAGGING_INPUT + FUSED_TAGGING_INPUT:
+            tokens = TOKENIZER(text)
+            self.assertEqual(get_tagger('suffix').tag(tokens), get_cascade_tagger('suffix').tag(tokens))
+
+    def test_single_fallback_call(self):
+        register_pos_backend('suffix', SuffixTagger)
+        fallback = get_tagger('suffix')._fallback
+        fallback.calls = 0
+        tagged = get_tagger('suffix').tag(TOKENIZER('2 cups of flour and zucchinis'))
+        self.assertEqual(fallback.calls, 1)
+        self.assertEqual(tagged[-1], ('zucchinis', 'NNS'))
+        get_tagger('suffix').tag(TOKENIZER('1/2 cup'))
+        self.assertEqual(fallback.calls, 1)
+
+
+class ForeignWordTagger:
+
+    @staticmethod
+    def tag(tokens):
+        return [(token, 'FW') for token in tokens]
+
+
+class SuffixTagger(SequentialBackoffTagger):
+    """
+    Backend that tags a token by its suffix alone and counts its tag calls.
+    """
+
+    def __init__(self):
+        SequentialBackoffTagger.__init__(self, None)
+        self.calls = 0
+
+    def tag(self, tokens):
+        self.calls += 1
+        return SequentialBackoffTagger.tag(self, tokens)
+
+    def choose_tag(self, tokens, index, history):
+        return 'NNS' if tokens[index].endswith('s') else 'NN'
+
+
+class TestPosBackends(TestCase):
+
+    def test_registered_backend(self):
+        register_pos_backend('foreign', ForeignWordTagger)
+        tokens = TOKENIZER('1 cup sifted flour')
+        self.assertEqual([tag for _, tag in get_tagger('foreign').tag(tokens)], [FRACTION, MEASUREMENT, 'MOD', 'FW'])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_tagger('unknown')
+
+
+class TestLazyInitialization(TestCase):
+
+    def test_import_does_not_build_tagger(self):
+        statement = 'import recipe_parser.ingredient_parser as p; print(p.TAGGER._instance, p.LEMMATIZER._instance)'
+        output = subprocess.check_output([sys.executable, '-c', statement])
+        self.assertEqual(output.decode().split(), ['None', 'None'])
+
+    def test_import_does_not_load_nltk(self):
+        # unless the interpreter imported nltk before (i.e. from sitecustomize)
+        statement = "import sys; loaded = 'nltk' in sys.modules; import recipe_parser.amount_conversions; " \
+                    "print(loaded or 'nltk' not in sys.modules)"
+        output = subprocess.check_output([sys.executable, '-c', statement])
+        self.assertEqual(output.decode().strip(), 'True')
+
 
 TAGGING_INPUT = [
     '1/2 cup vegetable oil',                # 1
@@ -70,37 +142,13 @@ EXPECTED_TAGS = [
     (FRACTION, 'JJ', 'JJ', MAIN_INGREDIENT, 'NNS')  # 10
 ]
 
-RANDOM_AMOUNTS = []
-for item in NUMERICAL:
-    if len(item.split()) < 2:
-        RANDOM_AMOUNTS.append(item)
-
-RANDOM_UNITS = []
-for key, items in MEASUREMENTS.items():
-    RANDOM_UNITS.append(key)
-    for item in items:
-        if len(item.split()) < 2:
-            RANDOM_UNITS.append(item)
-
-RANDOM_MODIFIERS = [
-    'chopped',
-    'finely',
-    'chopped',
-    'boneless',
-    'skinless',
-    'large',
-]
-
-RANDOM_INGREDIENTS = [
-    'chicken',
-    'beef',
-    'fish',
-    'stock',
-    'steak',
-    'flank steak',
-    'bullion cubes',
-    'onions',
-    'red peppers'
+FUSED_TAGGING_INPUT = [
+    '1 pound boneless chicken',
+    'sliced red onions and green pepper',
+    'half quarter 1/2 3/4 halves',
+    'tbsp. t T c tsps',
+    'pepper onions pepper',
+    'frying chicken breasts, thawed',
 ]
 
 if __name__ == '__main__':
@@ -0,0 +1,146 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, main as run_tests
+from recipe_parser import GRAMMAR, LazyInstance
+from recipe_parser.ingredient_parser import IngredientParser
+from recipe_parser.ingredient_tagger import DefaultTagger
+from recipe_parser.parallel_parser import ThreadPoolIngredientParser
+from recipe_parser.parse_cache import LRUParseCache, SqliteParseCache, MISSING
+from tests.test_ingredient_parser import TEST_INGREDIENTS
+
+THREADS = 8
+ROUNDS = 20
+
+
+class SlowSentenceTagger:
+
+    def tag(self, tokens):
+        time.sleep(0.001)
+        return [(token, token.upper()) for token in tokens]
+
+
+class TestThreadSafety(TestCase):
+    """
+    Stress tests of the state shared between threads. All threads start at a barrier and the interpreter switches
+    threads as often as it can, to make races likely.
+    """
+
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    @staticmethod
+    def run_concurrently(function, threads=THREADS):
+        barrier = threading.Barrier(threads)
+
+        def run(index):
+            barrier.wait()
+            return function(index)
+
+        with ThreadPoolExecutor(threads) as executor:
+            return list(executor.map(run, range(threads)))
+
+    def test_shared_instances(self):
+        # options no other test uses, so the instance is created by the threads
+        instances = self.run_concurrently(lambda _: IngredientParser.get_instance(cache_size=7919))
+        self.assertEqual(len(set(map(id, instances))), 1)
+
+    def test_lazy_instance(self):
+        created = []
+
+        def factory():
+            time.sleep(0.01)
+            created.append(object())
+            return created[-1]
+
+        lazy_instance = LazyInstance(factory)
+        instances = self.run_concurrently(lambda _: lazy_instance.get_instance())
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(instance is created[0] for instance in instances))
+
+    def test_sentence_tagger(self):
+        tagger = DefaultTagger.SentenceTagger(SlowSentenceTagger())
+
+        def tag(index):
+            sentences = [['thread{0}'.format(index), 'round{0}'.format(i), 'x'] for i in range(ROUNDS)]
+            return all(tagger.tag(tokens) == SlowSentenceTagger().tag(tokens) for tokens in sentences)
+
+        self.assertTrue(all(self.run_concurrently(tag)))
+
+    def test_parse(self):
+        expected = [IngredientParser.get_parser()(line) for line in TEST_INGREDIENTS]
+        # smaller than the number of lines, so the threads evict each other's entries
+        parser = IngredientParser.get_parser(cache_size=5)
+
+        def parse(index):
+            order = [(index + i) % len(TEST_INGREDIENTS) for i in range(len(TEST_INGREDIENTS))]
+            return all(parser(TEST_INGREDIENTS[i]) == expected[i] for _ in range(ROUNDS) for i in order)
+
+        self.assertTrue(all(self.run_concurrently(parse)))
+
+    def test_parse_many(self):
+        lines = TEST_INGREDIENTS * 3 + ['']
+        parse_many = IngredientParser.get_batch_parser()
+        expected = list(parse_many(lines))
+        results = self.run_concurrently(lambda _: [list(parse_many(lines, batch_size=7)) for _ in range(ROUNDS // 4)])
+        self.assertTrue(all(parsed == expected for thread_results in results for parsed in thread_results))
+
+    def test_fast_path_counters(self):
+        parser = IngredientParser(GRAMMAR.strip(), fast_path=True)
+        self.run_concurrently(lambda _: [parser.parse(line) for line in TEST_INGREDIENTS * ROUNDS])
+        info = parser.fast_path_info()
+        self.assertEqual(info.hits + info.fallbacks, THREADS * ROUNDS * len(TEST_INGREDIENTS))
+
+    def test_lru_cache(self):
+        cache = LRUParseCache(16)
+        operations = 1000
+
+        def use(index):
+            consistent = True
+            for i in range(operations):
+                key = str((index * 7 + i) % 64)
+                value = cache.get(key)
+                if value is MISSING:
+                    cache.put(key, key)
+                else:
+                    consistent = consistent and value == key
+            return consistent
+
+        self.assertTrue(all(self.run_concurrently(use)))
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, THREADS * operations)
+        self.assertLessEqual(info.currsize, 16)
+
+    def test_sqlite_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SqliteParseCache(os.path.join(directory, 'cache.sqlite'))
+
+            def use(index):
+                keys = ['{0}-{1}'.format(index, i) for i in range(50)]
+                for i, key in enumerate(keys):
+                    cache.put(key, i)
+                return [cache.get(key) for key in keys]
+
+            self.assertTrue(all(values == list(range(50)) for values in self.run_concurrently(use)))
+            self.assertEqual(cache.info().currsize, THREADS * 50)
+            cache.close()
+
+    def test_thread_pool_parser(self):
+        lines = TEST_INGREDIENTS * 5 + ['']
+        expected = list(IngredientParser.get_batch_parser()(lines))
+        with ThreadPoolIngredientParser(threads=4, chunk_size=3) as parser:
+            self.assertEqual(list(parser.parse_many(lines)), expected)
+            # callers share the pool
+            results = self.run_concurrently(lambda _: list(parser.parse_many(lines)), threads=4)
+        self.assertTrue(all(parsed == expected for parsed in results))
+
+
+if __name__ == '__main__':
+    run_tests()
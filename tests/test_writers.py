@@ -0,0 +1,96 @@
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main as run_tests
+from recipe_parser.ingestion import IngredientRecord
+from recipe_parser.ingredient_parser import Ingredient, Amount, ParsedIngredient
+from recipe_parser.writers import BatchWriter, BatchWriteError, SqliteWriter, INGREDIENT_COLUMNS, quote_identifier
+
+PARSED_INGREDIENTS = [
+    ('2 cups of flour', ParsedIngredient(Ingredient('flour'), [Amount(2, 'cup')])),
+    ('1 pound of ground beef', ParsedIngredient(Ingredient('beef', 'ground'), [Amount(1, 'pound')])),
+    ('3 lemons', ParsedIngredient(Ingredient('lemon'), [Amount(3)])),
+    ('salt', ParsedIngredient(Ingredient('salt'), None)),
+    ('???', None),
+]
+
+
+class TestWriters(TestCase):
+
+    def setUp(self):
+        self._directory = TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, 'ingredients.db')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def rows(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute('SELECT * FROM ingredients ORDER BY rowid').fetchall()
+        finally:
+            connection.close()
+
+    def test_write_parsed(self):
+        with SqliteWriter(self.path, batch_size=2) as writer:
+            for text, parsed_ingredient in PARSED_INGREDIENTS:
+                writer.write_parsed(7, text, parsed_ingredient, percent_amount=0.25)
+        rows = self.rows()
+        self.assertEqual(rows[0], (7, '2 cups of flour', 'flour', None, 2.0, 'cup', 0.25))
+        self.assertEqual(rows[1], (7, '1 pound of ground beef', 'beef', 'ground', 1.0, 'pound', 0.25))
+        self.assertEqual(rows[2][4:6], (3.0, None))
+        self.assertEqual(rows[-1], (7, '???', None, None, None, None, 0.25))
+        stats = writer.stats()
+        self.assertEqual(stats.rows, len(PARSED_INGREDIENTS))
+        self.assertEqual(stats.batches, 3)
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertLessEqual(stats.mean_commit_seconds, stats.max_commit_seconds)
+
+    def test_write_records(self):
+        records = [IngredientRecord(1, text, parsed_ingredient) for text, parsed_ingredient in PARSED_INGREDIENTS]
+        with SqliteWriter(self.path) as writer:
+            writer.write_records(records)
+            self.assertEqual(writer.stats().batches, 0)
+        self.assertEqual(writer.stats().batches, 1)
+        self.assertEqual(len(self.rows()), len(records))
+
+    def test_named_paramstyle(self):
+        SqliteWriter(self.path).close()
+        connection = sqlite3.connect(self.path)
+        with BatchWriter(connection, paramstyle='named') as writer:
+            writer.write_many([(1, 'a', 'b', None, 1, 'cup', None), (2, 'c', 'd', None, None, None, None)])
+        connection.close()
+        self.assertEqual([row[:3] for row in self.rows()], [(1, 'a', 'b'), (2, 'c', 'd')])
+
+    def test_failed_batch_is_rolled_back(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('CREATE TABLE ingredients ({0})'.format(
+            ', '.join(quote_identifier(column) for column in INGREDIENT_COLUMNS)))
+        connection.execute('CREATE UNIQUE INDEX unique_text ON ingredients (text)')
+        writer = BatchWriter(connection, batch_size=10)
+        rows = [(1, 'a', None, None, None, None, None), (1, 'a', None, None, None, None, None)]
+        writer.write_many(rows)
+        with self.assertRaises(BatchWriteError) as context:
+            writer.flush()
+        self.assertIsInstance(context.exception.__cause__, sqlite3.IntegrityError)
+        self.assertEqual(context.exception.rows, rows)
+        self.assertEqual(self.rows(), [])
+        self.assertEqual(writer.stats().rows, 0)
+        # the failed batch is dropped from the buffer, later writes go through
+        writer.write((2, 'b', None, None, None, None, None))
+        writer.flush()
+        self.assertEqual(self.rows(), [(2, 'b', None, None, None, None, None)])
+        # and the failed batch can be fixed and written again
+        connection.execute('DROP INDEX unique_text')
+        writer.write_many(context.exception.rows)
+        writer.flush()
+        self.assertEqual(len(self.rows()), 3)
+        connection.close()
+
+    def test_unknown_paramstyle(self):
+        with self.assertRaises(ValueError):
+            BatchWriter(None, paramstyle='dollar')
+
+
+if __name__ == '__main__':
+    run_tests()